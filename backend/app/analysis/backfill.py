@@ -0,0 +1,350 @@
+"""Historical backfill and what-if rescoring.
+
+Replays ``AnalysisEngine`` over past data as if the scheduler had run every
+``--step`` minutes between ``--start`` and ``--end``. Results are written as
+NDJSON to ``--output`` (never to ``analysis_results``), so a signal or weight
+change can be compared against what was actually stored.
+
+    python -m app.analysis.backfill --start 2026-09-01 --end 2026-10-01 \\
+        --output data/rescore.ndjson --workers 8
+
+Each channel is replayed in a worker process from a single load of its
+history. Progress is checkpointed per channel to ``<output>.checkpoint``;
+rerunning the same command resumes where an interrupted run stopped.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from app.analysis.engine import AnalysisEngine
+from app.analysis.raids import build_raid_index
+from app.analysis.weights import SIGNAL_WEIGHTS
+from app.config import settings
+from app.database import SessionLocal
+from app.models.channel import Channel
+from app.models.chat_metric import ChatMetric
+from app.models.snapshot import ViewerSnapshot
+from app.storage import archive
+
+logger = logging.getLogger(__name__)
+
+_engine: AnalysisEngine | None = None
+
+
+def _init_worker(raid_index, weights: dict | None):
+    global _engine
+    # The forked pool holds the parent's SQLite connections; open fresh ones
+    # here without closing the parent's
+    SessionLocal.kw["bind"].dispose(close=False)
+    _engine = AnalysisEngine()
+    _engine.set_raid_index(raid_index)
+    if weights:
+        SIGNAL_WEIGHTS.update(weights)
+
+
+def _load_history(db, channel_id: int, start: datetime, end: datetime) -> tuple[list, list]:
+    """Load the rows needed to replay ``[start, end]``, oldest first."""
+    plan = _engine.plan
+    lead_in = (
+        db.query(ViewerSnapshot)
+        .filter(ViewerSnapshot.channel_id == channel_id, ViewerSnapshot.collected_at < start)
+        .order_by(ViewerSnapshot.collected_at.desc())
+        .limit(plan.snapshot_limit)
+        .all()
+    )
+    if plan.snapshot_lookback is not None:
+        wide = (
+            db.query(ViewerSnapshot)
+            .filter(
+                ViewerSnapshot.channel_id == channel_id,
+                ViewerSnapshot.collected_at >= start - plan.snapshot_lookback,
+                ViewerSnapshot.collected_at < start,
+            )
+            .order_by(ViewerSnapshot.collected_at.desc())
+            .all()
+        )
+        if len(wide) > len(lead_in):
+            lead_in = wide
+    in_range = (
+        db.query(ViewerSnapshot)
+        .filter(
+            ViewerSnapshot.channel_id == channel_id,
+            ViewerSnapshot.collected_at >= start,
+            ViewerSnapshot.collected_at <= end,
+        )
+        .order_by(ViewerSnapshot.collected_at.asc())
+        .all()
+    )
+    snapshots = lead_in[::-1] + in_range
+
+    # Older history lives in the columnar archive, disjoint from the raw rows
+    archived = archive.read_snapshots(
+        channel_id,
+        start - plan.snapshot_lookback if plan.snapshot_lookback else start,
+        end,
+        lead_in=plan.snapshot_limit,
+    )
+    if archived:
+        first_raw = snapshots[0].collected_at if snapshots else None
+        snapshots = [s for s in archived if first_raw is None or s.collected_at < first_raw] + snapshots
+
+    chat_lead_in = (
+        db.query(ChatMetric)
+        .filter(ChatMetric.channel_id == channel_id, ChatMetric.window_end < start)
+        .order_by(ChatMetric.window_end.desc())
+        .limit(plan.chat_limit)
+        .all()
+    )
+    chat_in_range = (
+        db.query(ChatMetric)
+        .filter(
+            ChatMetric.channel_id == channel_id,
+            ChatMetric.window_end >= start,
+            ChatMetric.window_end <= end,
+        )
+        .order_by(ChatMetric.window_end.asc())
+        .all()
+    )
+    return snapshots, chat_lead_in[::-1] + chat_in_range
+
+
+async def _replay(channel, snapshots: list, chat_metrics: list, times: list[datetime], details: bool) -> list[dict]:
+    snap_times = [s.collected_at for s in snapshots]
+    chat_times = [m.window_end for m in chat_metrics]
+    records = []
+    last_seen = None
+    for t in times:
+        hi = bisect.bisect_right(snap_times, t)
+        if hi < 3:
+            continue
+        chat_hi = bisect.bisect_right(chat_times, t)
+        # Nothing new since the previous step: the scheduler would score the same window
+        if (hi, chat_hi) == last_seen:
+            continue
+        last_seen = (hi, chat_hi)
+
+        # Cover the engine's merged plan as of t, newest-first like load_batch
+        plan = _engine.plan
+        lo = hi - plan.snapshot_limit
+        if plan.snapshot_lookback is not None:
+            lo = min(lo, bisect.bisect_left(snap_times, t - plan.snapshot_lookback))
+        window = snapshots[max(0, lo):hi][::-1]
+        chat_window = chat_metrics[max(0, chat_hi - plan.chat_limit):chat_hi][::-1]
+        result = await _engine.score(channel, window, chat_window, now=t)
+        record = {
+            "channel_id": channel.id,
+            "platform": channel.platform,
+            "username": channel.username,
+            "evaluated_at": t.isoformat(),
+            "overall_score": result["overall_score"],
+            "confidence": result["confidence"],
+            "signal_scores": result["signal_scores"],
+            "data_points": result["data_points"],
+        }
+        if details:
+            record["signal_details"] = result["signal_details"]
+        records.append(record)
+    return records
+
+
+def _replay_channel(channel_id: int, start: datetime, end: datetime, step: timedelta, details: bool) -> list[dict]:
+    db = SessionLocal()
+    try:
+        channel = db.get(Channel, channel_id)
+        if channel is None:
+            return []
+        snapshots, chat_metrics = _load_history(db, channel_id, start, end)
+        times = []
+        t = start
+        while t <= end:
+            times.append(t)
+            t += step
+        return asyncio.run(_replay(channel, snapshots, chat_metrics, times, details))
+    finally:
+        db.close()
+
+
+class Checkpoint:
+    """Per-channel progress plus the output offset it corresponds to."""
+
+    def __init__(self, path: str, params: dict):
+        self.path = path
+        self.params = params
+        self.done: set[int] = set()
+        self.offset = 0
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("params") != self.params:
+            raise SystemExit(
+                f"Checkpoint {self.path} was written for different arguments; "
+                "pass --fresh to discard it"
+            )
+        self.done = set(state["done"])
+        self.offset = state["offset"]
+        return True
+
+    @staticmethod
+    def stored_end(path: str) -> datetime | None:
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return datetime.fromisoformat(json.load(f)["params"]["end"])
+
+    def reset(self):
+        self.done = set()
+        self.offset = 0
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"params": self.params, "done": sorted(self.done), "offset": self.offset}, f)
+        os.replace(tmp, self.path)
+
+
+def _select_channels(db, channels: list[str] | None, platform: str | None) -> list[int]:
+    query = db.query(Channel.id, Channel.platform, Channel.username)
+    if platform:
+        query = query.filter(Channel.platform == platform.lower())
+    rows = query.order_by(Channel.id).all()
+    if not channels:
+        return [r.id for r in rows]
+    wanted = {c.lower() for c in channels}
+    return [
+        r.id for r in rows
+        if str(r.id) in wanted or f"{r.platform}/{r.username}" in wanted
+    ]
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def run(args: argparse.Namespace) -> int:
+    checkpoint_path = f"{args.output}.checkpoint"
+    if args.fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    # An open-ended run resumes against the end time it started with
+    end = args.end or Checkpoint.stored_end(checkpoint_path) or datetime.utcnow()
+    start = args.start
+    if start >= end:
+        raise SystemExit("--start must be before --end")
+    step = timedelta(minutes=args.step)
+
+    weights = None
+    if args.weights:
+        with open(args.weights) as f:
+            weights = json.load(f)
+
+    db = SessionLocal()
+    try:
+        channel_ids = _select_channels(db, args.channels, args.platform)
+        # Raids can only be matched across channels, so the index is built once here
+        lead_in = timedelta(minutes=settings.COLLECT_INTERVAL_MINUTES * AnalysisEngine().plan.snapshot_limit)
+        raid_index = build_raid_index(db, start - lead_in, end)
+    finally:
+        db.close()
+
+    params = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "step": args.step,
+        "channels": args.channels,
+        "platform": args.platform,
+        "weights": weights,
+        "details": args.details,
+    }
+    checkpoint = Checkpoint(checkpoint_path, params)
+    resumed = checkpoint.load()
+    if resumed:
+        size = os.path.getsize(args.output) if os.path.exists(args.output) else None
+        if size is None or size < checkpoint.offset:
+            # Seeking past the end would pad the gap with NULs
+            logger.warning(
+                "Output %s is %s but its checkpoint is at byte %d; starting over",
+                args.output, "missing" if size is None else f"{size} bytes", checkpoint.offset,
+            )
+            checkpoint.reset()
+            resumed = False
+
+    # Drop anything written after the last checkpoint (an interrupted channel)
+    mode = "r+" if resumed else "w"
+    out = open(args.output, mode)
+    out.truncate(checkpoint.offset)
+    out.seek(checkpoint.offset)
+
+    pending = [cid for cid in channel_ids if cid not in checkpoint.done]
+    logger.info(
+        "Backfill %s -> %s every %d min: %d channels (%d already done), %d workers",
+        start, end, args.step, len(pending), len(checkpoint.done), args.workers,
+    )
+
+    written = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(raid_index, weights),
+        ) as pool:
+            futures = {
+                pool.submit(_replay_channel, cid, start, end, step, args.details): cid
+                for cid in pending
+            }
+            for future in as_completed(futures):
+                cid = futures[future]
+                records = future.result()
+                for record in records:
+                    out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+                written += len(records)
+                checkpoint.done.add(cid)
+                checkpoint.offset = out.tell()
+                checkpoint.save()
+                logger.info(
+                    "Channel %d replayed: %d results (%d/%d channels)",
+                    cid, len(records), len(checkpoint.done), len(channel_ids),
+                )
+    finally:
+        out.close()
+
+    logger.info("Backfill complete: %d results written to %s", written, args.output)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay analysis over historical data")
+    parser.add_argument("--start", type=_parse_time, required=True, help="ISO start time (UTC)")
+    parser.add_argument("--end", type=_parse_time, default=None, help="ISO end time (UTC), default now")
+    parser.add_argument(
+        "--step", type=int, default=settings.ANALYZE_INTERVAL_MINUTES,
+        help="minutes between replayed analysis runs",
+    )
+    parser.add_argument(
+        "--channels", nargs="*", default=None,
+        help="channel ids or platform/username pairs (default: all)",
+    )
+    parser.add_argument("--platform", default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", required=True, help="NDJSON results file")
+    parser.add_argument("--weights", default=None, help="JSON file overriding signal weights")
+    parser.add_argument("--details", action="store_true", help="include per-signal details")
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
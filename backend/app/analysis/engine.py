@@ -1,9 +1,11 @@
 import logging
 from datetime import datetime
 
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
-from app.analysis.signals.base import AbstractSignal
+from app.analysis.memo import SignalMemo
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 from app.analysis.signals.cvr import CVRSignal
 from app.analysis.signals.step_function import StepFunctionSignal
 from app.analysis.signals.chat_entropy import ChatEntropySignal
@@ -12,7 +14,17 @@ from app.analysis.signals.growth import GrowthSignal
 from app.analysis.signals.benford import BenfordSignal
 from app.analysis.signals.temporal import TemporalSignal
 from app.analysis.weights import SIGNAL_WEIGHTS
-from app.models.analysis_result import AnalysisResult
+from app.config import settings
+from app.models.channel import Channel
+from app.models.chat_metric import ChatMetric
+from app.models.snapshot import ViewerSnapshot
+from app.storage import archive
+from app.storage.latest import record_latest
+from app.storage.stats import record_score
+from app.storage.timeline import store_analysis
+from app.schemas.analysis import get_score_label
+from app.utils.live_hub import LEADERBOARD, channel_topic, live_hub
+from app.utils.response_cache import channel_tag, response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +32,8 @@ logger = logging.getLogger(__name__)
 class AnalysisEngine:
     """Runs all signals and computes a weighted suspicion score."""
 
-    def __init__(self):
+    def __init__(self, memo: SignalMemo | None = None):
+        self.memo = memo
         self.signals: list[AbstractSignal] = [
             CVRSignal(),
             StepFunctionSignal(),
@@ -31,15 +44,170 @@ class AnalysisEngine:
             TemporalSignal(),
         ]
 
-    async def analyze(self, channel, snapshots: list, chat_metrics: list, db: Session) -> dict:
+        self.plan = self._merge_requirements([s.requirements for s in self.signals])
+
+    @staticmethod
+    def _merge_requirements(reqs: list[DataRequirements]) -> DataRequirements:
+        """One load that covers every signal: union of columns, widest windows."""
+        snapshot_reqs = [r for r in reqs if r.needs_snapshots]
+        chat_reqs = [r for r in reqs if r.needs_chat]
+        lookbacks = [r.snapshot_lookback for r in snapshot_reqs if r.snapshot_lookback]
+        return DataRequirements(
+            snapshot_columns=tuple(sorted({c for r in snapshot_reqs for c in r.snapshot_columns})),
+            snapshot_limit=max((r.snapshot_limit for r in snapshot_reqs), default=0),
+            snapshot_lookback=max(lookbacks, default=None),
+            chat_columns=tuple(sorted({c for r in chat_reqs for c in r.chat_columns})),
+            chat_limit=max((r.chat_limit for r in chat_reqs), default=0),
+            min_snapshots=min((r.min_snapshots for r in snapshot_reqs), default=0),
+            min_chat_metrics=min((r.min_chat_metrics for r in chat_reqs), default=0),
+        )
+
+    def set_raid_index(self, raid_index):
+        """Share a cross-channel RaidIndex with signals that discount raids."""
+        for signal in self.signals:
+            if hasattr(signal, "raid_index"):
+                signal.raid_index = raid_index
+
+    @staticmethod
+    def _slice_snapshots(snapshots: list, req: DataRequirements, now: datetime) -> list:
+        """Select a signal's window from newest-first snapshots."""
+        if not req.needs_snapshots:
+            return []
+        if not req.snapshot_limit and req.snapshot_lookback is None:
+            return snapshots
+        end = req.snapshot_limit
+        if req.snapshot_lookback is not None:
+            since = now - req.snapshot_lookback
+            # Newest-first, so rows inside the lookback form a prefix
+            in_window = next(
+                (i for i, s in enumerate(snapshots) if s.collected_at < since),
+                len(snapshots),
+            )
+            end = max(end, in_window)
+        return snapshots[:end]
+
+    def load_batch(self, db: Session, channel_ids: list[int], now: datetime | None = None) -> dict[int, tuple[list, list]]:
+        """Load the merged plan for a batch of channels in two queries.
+
+        Returns ``{channel_id: (snapshots, chat_metrics)}``, both newest-first.
+        Channels whose windows cannot satisfy any signal's own minimum get
+        empty lists.
+        """
+        now = now or datetime.utcnow()
+        plan = self.plan
+        data: dict[int, tuple[list, list]] = {cid: ([], []) for cid in channel_ids}
+        if not channel_ids:
+            return data
+
+        if plan.needs_snapshots:
+            columns = {"id", "channel_id", "collected_at", *plan.snapshot_columns}
+            rows = self._load_window(
+                db, ViewerSnapshot, ViewerSnapshot.collected_at, channel_ids, columns,
+                plan.snapshot_limit,
+                now - plan.snapshot_lookback if plan.snapshot_lookback else None,
+            )
+            for row in rows:
+                data[row.channel_id][0].append(row)
+            if settings.ARCHIVE_AFTER_DAYS > 0:
+                self._add_archived(data, channel_ids, now)
+
+        if plan.needs_chat:
+            columns = {"id", "channel_id", "window_end", *plan.chat_columns}
+            rows = self._load_window(db, ChatMetric, ChatMetric.window_end, channel_ids, columns, plan.chat_limit, None)
+            for row in rows:
+                data[row.channel_id][1].append(row)
+
+        for channel_id, (snapshots, chat_metrics) in data.items():
+            if not self._satisfies_any(snapshots, chat_metrics, now):
+                data[channel_id] = ([], [])
+        return data
+
+    def _satisfies_any(self, snapshots: list, chat_metrics: list, now: datetime) -> bool:
+        """Whether at least one signal has the rows it needs in its own window."""
+        for signal in self.signals:
+            req = signal.requirements
+            if req.needs_snapshots and len(self._slice_snapshots(snapshots, req, now)) < max(req.min_snapshots, 1):
+                continue
+            if req.needs_chat and len(chat_metrics[:req.chat_limit]) < max(req.min_chat_metrics, 1):
+                continue
+            return True
+        return False
+
+    def _add_archived(self, data: dict[int, tuple[list, list]], channel_ids: list[int], now: datetime):
+        """Extend snapshot windows that reach past the raw table into the archive."""
+        plan = self.plan
+        since = now - plan.snapshot_lookback if plan.snapshot_lookback else None
+        for channel_id in channel_ids:
+            rows = data[channel_id][0]
+            oldest = rows[-1].collected_at if rows else None
+            missing = max(plan.snapshot_limit - len(rows), 0)
+            if not missing and (since is None or (oldest is not None and oldest <= since)):
+                continue
+            # Archived rows are all older than the table's, oldest first
+            rows.extend(reversed(archive.read_before(channel_id, oldest, since, missing)))
+
+    @staticmethod
+    def _load_window(db: Session, model, time_col, channel_ids: list[int], columns: set[str], limit: int, since: datetime | None) -> list:
+        """Rows per channel that are among the latest ``limit`` or newer than ``since``."""
+        if not channel_ids or (not limit and since is None):
+            return []
+        conditions = []
+        query = db.query(*(getattr(model, c) for c in sorted(columns)))
+        if limit:
+            # Collection time of each channel's limit-th newest row, found by index seek
+            cutoff = (
+                select(time_col)
+                .where(model.channel_id == Channel.id)
+                .order_by(time_col.desc())
+                .offset(limit - 1)
+                .limit(1)
+                .correlate(Channel)
+                .scalar_subquery()
+            )
+            bounds = (
+                select(Channel.id.label("channel_id"), cutoff.label("cutoff"))
+                .where(Channel.id.in_(channel_ids))
+                .subquery()
+            )
+            query = query.join(bounds, model.channel_id == bounds.c.channel_id)
+            conditions += [bounds.c.cutoff.is_(None), time_col >= bounds.c.cutoff]
+        else:
+            query = query.filter(model.channel_id.in_(channel_ids))
+        if since is not None:
+            conditions.append(time_col >= since)
+        return query.filter(or_(*conditions)).order_by(model.channel_id, time_col.desc()).all()
+
+    async def _calculate(self, signal: AbstractSignal, snapshots: list, chat_metrics: list, channel) -> SignalResult:
+        if self.memo is None:
+            return await signal.calculate(snapshots, chat_metrics, channel)
+        key = self.memo.key(channel, signal, snapshots, chat_metrics)
+        result = self.memo.get(key)
+        if result is None:
+            result = await signal.calculate(snapshots, chat_metrics, channel)
+            self.memo.put(key, result)
+        return result
+
+    async def score(self, channel, snapshots: list, chat_metrics: list, now: datetime | None = None) -> dict:
+        """Run every signal and aggregate, without touching the database.
+
+        ``snapshots`` and ``chat_metrics`` are newest-first and must cover the
+        merged plan; each signal receives only its own declared window.
+        """
+        now = now or datetime.utcnow()
         signal_scores = []
         signal_details = {}
         weighted_sum = 0.0
         weight_confidence_sum = 0.0
 
         for signal in self.signals:
+            req = signal.requirements
             try:
-                result = await signal.calculate(snapshots, chat_metrics, channel)
+                signal_snapshots = self._slice_snapshots(snapshots, req, now)
+                signal_chat = chat_metrics[:req.chat_limit] if req.needs_chat else []
+                if len(signal_snapshots) < req.min_snapshots or len(signal_chat) < req.min_chat_metrics:
+                    # Known to be unmet: empty input yields the signal's own insufficient-data result
+                    signal_snapshots, signal_chat = [], []
+                result = await self._calculate(signal, signal_snapshots, signal_chat, channel)
                 weight = SIGNAL_WEIGHTS.get(signal.name, signal.weight)
 
                 signal_scores.append({
@@ -79,27 +247,40 @@ class AnalysisEngine:
             else 0.0
         )
 
-        data_points = len(snapshots) + len(chat_metrics)
-
-        # Store result in DB
-        analysis = AnalysisResult(
-            channel_id=channel.id,
-            overall_score=round(overall_score, 2),
-            confidence=round(overall_confidence, 2),
-            signal_scores=signal_scores,
-            signal_details=signal_details,
-            data_points=data_points,
-            analyzed_at=datetime.utcnow(),
-        )
-        db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
-
         return {
             "overall_score": round(overall_score, 2),
             "confidence": round(overall_confidence, 2),
             "signal_scores": signal_scores,
             "signal_details": signal_details,
-            "data_points": data_points,
-            "analyzed_at": analysis.analyzed_at,
+            "data_points": len(snapshots) + len(chat_metrics),
+        }
+
+    async def analyze(self, channel, snapshots: list, chat_metrics: list, db: Session) -> dict:
+        result = await self.score(channel, snapshots, chat_metrics)
+
+        # Store result in DB, extending the current row when nothing moved
+        analyzed_at = datetime.utcnow()
+        analysis = store_analysis(db, channel.id, result, analyzed_at)
+        extended = analysis.analyzed_at != analyzed_at
+        record_latest(db, channel, analysis)
+        record_score(db, channel.id, analysis.overall_score, analyzed_at, extended=extended)
+        # The stored row's values, which differ from this run's when it was extended
+        result["overall_score"] = analysis.overall_score
+        result["confidence"] = analysis.confidence
+        db.commit()
+        response_cache.invalidate("leaderboard", channel_tag(channel.platform, channel.username))
+
+        score = {
+            "channel_id": channel.id,
+            "platform": channel.platform,
+            "username": channel.username,
+            "overall_score": result["overall_score"],
+            "confidence": result["confidence"],
+            "label": get_score_label(result["overall_score"]),
+            "analyzed_at": analyzed_at.isoformat(),
         }
+        live_hub.publish(channel_topic(channel.platform, channel.username), "score", score)
+        live_hub.publish(LEADERBOARD, "score", score, key=channel.id)
+
+        result["analyzed_at"] = analyzed_at
+        return result
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from app.analysis.signals.base import AbstractSignal, SignalResult
+
+logger = logging.getLogger(__name__)
+
+
+def _row_mark(row):
+    """Stable identity of a snapshot/chat row: its id, or its timestamp if it has none."""
+    mark = getattr(row, "id", None)
+    if mark is None:
+        mark = getattr(row, "collected_at", None) or getattr(row, "window_end", None)
+    return str(mark)
+
+
+def _fingerprint(rows: list) -> list:
+    if not rows:
+        return [0]
+    return [len(rows), _row_mark(rows[0]), _row_mark(rows[-1])]
+
+
+class SignalMemo:
+    """Bounded LRU of SignalResults keyed on each signal's input fingerprint.
+
+    The key is (channel, signal, signal version, input watermark), where the
+    watermark is the row count plus the newest and oldest row of the slice
+    the signal actually receives, plus anything else the signal declares via
+    ``memo_key``. Results are optionally persisted as JSON between restarts.
+    """
+
+    def __init__(self, maxsize: int = 10000, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, SignalResult] = OrderedDict()
+        if path:
+            self.load()
+
+    def key(self, channel, signal: AbstractSignal, snapshots: list, chat_metrics: list) -> str:
+        return json.dumps(
+            [
+                channel.id,
+                signal.name,
+                signal.version,
+                _fingerprint(snapshots),
+                _fingerprint(chat_metrics),
+                signal.memo_key(channel),
+            ],
+            default=str,
+        )
+
+    def get(self, key: str) -> SignalResult | None:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: SignalResult):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable signal memo %s: %s", self.path, e)
+            return
+        for key, (score, confidence, details) in entries[-self.maxsize:]:
+            self._entries[key] = SignalResult(score=score, confidence=confidence, details=details)
+        logger.info("Loaded %d memoized signal results from %s", len(self._entries), self.path)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                [[k, [r.score, r.confidence, r.details]] for k, r in self._entries.items()],
+                f,
+                default=str,
+            )
+        os.replace(tmp, self.path)
@@ -0,0 +1,164 @@
+"""Cross-channel raid matching.
+
+A Twitch raid moves an audience from one channel to another in a single
+collection tick: the raiding channel drops (usually to zero as the stream
+ends) while the target jumps by a similar amount. Each channel's change
+between consecutive snapshots is filed under the tick of the later one, and
+drops and jumps are joined on magnitude through a sorted index per tick, so
+the cost is O(n log n) per tick in the number of live channels instead of a
+scan over every channel pair.
+
+A collection pass takes time, so one that straddles a tick boundary files
+its channels under two neighbouring ticks; jumps are therefore matched
+against drops in the same tick or either neighbour.
+"""
+
+import bisect
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.snapshot import ViewerSnapshot
+from app.storage import archive
+
+logger = logging.getLogger(__name__)
+
+
+class RaidIndex:
+    """Per-channel set of ticks in which a matched raid departed or arrived."""
+
+    MIN_RAID_VIEWERS = 50  # ignore small fluctuations
+    MIN_DROP_RATIO = 0.5  # raider must lose at least half its audience
+    MIN_JUMP_RATIO = 0.15  # target must gain at least 15%
+    # Fraction of the dropped audience that shows up on the target channel
+    MIN_RETENTION = 0.25
+    MAX_RETENTION = 1.2
+
+    def __init__(self, tick_seconds: int | None = None):
+        self.tick_seconds = tick_seconds or settings.COLLECT_INTERVAL_MINUTES * 60
+        self._ticks: dict[int, set[int]] = defaultdict(set)
+        self.matches: list[dict] = []
+
+    def tick_of(self, ts: datetime) -> int:
+        # Stored timestamps are naive UTC
+        return int(ts.replace(tzinfo=timezone.utc).timestamp()) // self.tick_seconds
+
+    def is_raid_step(self, channel_id: int, ts: datetime | None) -> bool:
+        """True if ``ts`` falls in, or next to, a tick with a matched raid.
+
+        The neighbouring ticks are included because a rolling-window step
+        can be attributed to the snapshot on either side of the jump.
+        """
+        if ts is None or channel_id not in self._ticks:
+            return False
+        tick = self.tick_of(ts)
+        ticks = self._ticks[channel_id]
+        return tick in ticks or tick - 1 in ticks or tick + 1 in ticks
+
+    def ticks_for(self, channel_id: int) -> list[int]:
+        return sorted(self._ticks.get(channel_id, ()))
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def add_deltas(self, deltas: list[tuple[int, int, int, int]]):
+        """Match drops to jumps.
+
+        ``deltas`` holds ``(tick, channel_id, previous_viewers, current_viewers)``
+        for consecutive snapshots of a channel, ``tick`` being the later one's.
+        """
+        drops: dict[int, list[tuple[int, int]]] = defaultdict(list)
+        jumps: dict[int, list[tuple[int, int]]] = defaultdict(list)
+        for tick, channel_id, prev, cur in deltas:
+            delta = cur - prev
+            if abs(delta) < self.MIN_RAID_VIEWERS or prev <= 0:
+                continue
+            if delta < 0 and -delta / prev >= self.MIN_DROP_RATIO:
+                drops[tick].append((-delta, channel_id))
+            elif delta > 0 and delta / prev >= self.MIN_JUMP_RATIO:
+                jumps[tick].append((delta, channel_id))
+
+        for tick_drops in drops.values():
+            tick_drops.sort()
+        for tick in sorted(jumps):
+            # Largest jumps first so big raids claim their drop before small noise
+            for size, target_id in sorted(jumps[tick], reverse=True):
+                # Nearest in size across the neighbouring ticks, same tick on a tie
+                candidates = []
+                for drop_tick in (tick, tick - 1, tick + 1):
+                    i = self._closest_drop(drops.get(drop_tick), size, target_id)
+                    if i is not None:
+                        candidates.append((abs(drops[drop_tick][i][0] - size), drop_tick != tick, drop_tick, i))
+                if not candidates:
+                    continue
+                _, _, drop_tick, i = min(candidates)
+                drop_size, raider_id = drops[drop_tick].pop(i)
+                self._ticks[raider_id].add(drop_tick)
+                self._ticks[target_id].add(tick)
+                self.matches.append({
+                    "tick": tick,
+                    "raider_id": raider_id,
+                    "target_id": target_id,
+                    "dropped": drop_size,
+                    "gained": size,
+                })
+
+    def _closest_drop(self, drops: list[tuple[int, int]] | None, size: int, target_id: int) -> int | None:
+        """Index of the sorted drop nearest ``size`` within the retention bounds."""
+        if not drops:
+            return None
+        lo = bisect.bisect_left(drops, (size / self.MAX_RETENTION, -1))
+        hi = bisect.bisect_right(drops, (size / self.MIN_RETENTION, float("inf")))
+        best = None
+        for i in range(lo, hi):
+            if drops[i][1] == target_id:
+                continue
+            if best is None or abs(drops[i][0] - size) < abs(drops[best][0] - size):
+                best = i
+            if drops[i][0] >= size:
+                break  # candidates only get further away from here
+        return best
+
+
+def build_raid_index(
+    db: Session,
+    since: datetime,
+    until: datetime | None = None,
+    tick_seconds: int | None = None,
+) -> RaidIndex:
+    """Build a RaidIndex from all snapshots collected in ``[since, until]``."""
+    index = RaidIndex(tick_seconds)
+    query = db.query(
+        ViewerSnapshot.collected_at,
+        ViewerSnapshot.channel_id,
+        ViewerSnapshot.viewer_count,
+    ).filter(ViewerSnapshot.collected_at >= since)
+    if until is not None:
+        query = query.filter(ViewerSnapshot.collected_at <= until)
+
+    # Each channel's readings by time. Archived rows come first so raw rows
+    # win the (rare) overlapping timestamps.
+    readings: dict[int, dict[datetime, int]] = defaultdict(dict)
+    for channel_id, collected_at, viewer_count in archive.iter_archived(since, until):
+        readings[channel_id][collected_at] = viewer_count
+    for collected_at, channel_id, viewer_count in query:
+        if collected_at is None:
+            continue
+        readings[channel_id][collected_at] = viewer_count or 0
+
+    # Consecutive readings at most two ticks apart; longer gaps are offline time
+    max_gap = 2 * index.tick_seconds
+    deltas = []
+    for channel_id, series in readings.items():
+        previous = None
+        for collected_at in sorted(series):
+            if previous is not None and (collected_at - previous).total_seconds() < max_gap:
+                deltas.append((index.tick_of(collected_at), channel_id, series[previous], series[collected_at]))
+            previous = collected_at
+    index.add_deltas(deltas)
+
+    logger.info("Raid index built: %d matched raids since %s", len(index), since)
+    return index
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from datetime import timedelta
 
 
 @dataclass
@@ -9,8 +10,49 @@ class SignalResult:
     details: dict = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class DataRequirements:
+    """The rows a signal reads, so the engine loads only what is needed.
+
+    Snapshots are the most recent ``snapshot_limit`` rows, widened to every
+    row within ``snapshot_lookback`` when one is set. A signal with no
+    snapshot (or chat) columns receives an empty list for that input.
+    """
+
+    snapshot_columns: tuple[str, ...] = ()
+    snapshot_limit: int = 0
+    snapshot_lookback: timedelta | None = None
+    chat_columns: tuple[str, ...] = ()
+    chat_limit: int = 0
+    # Below these row counts the signal can only report insufficient data
+    min_snapshots: int = 0
+    min_chat_metrics: int = 0
+
+    @property
+    def needs_snapshots(self) -> bool:
+        return bool(self.snapshot_columns)
+
+    @property
+    def needs_chat(self) -> bool:
+        return bool(self.chat_columns)
+
+
 class AbstractSignal(ABC):
 
+    # Bump whenever calculate() changes, so memoized results are not reused
+    version = 1
+
+    # Everything the scheduler used to load for every signal
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count", "chatter_count", "category", "collected_at"),
+        snapshot_limit=500,
+        chat_columns=(
+            "window_start", "window_end", "message_count", "unique_chatters",
+            "message_entropy", "unique_message_ratio", "avg_time_between_msgs",
+        ),
+        chat_limit=100,
+    )
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -24,3 +66,7 @@ class AbstractSignal(ABC):
     @abstractmethod
     async def calculate(self, snapshots: list, chat_metrics: list, channel) -> SignalResult:
         ...
+
+    def memo_key(self, channel) -> list:
+        """Inputs besides the snapshot/chat rows that the result depends on."""
+        return []
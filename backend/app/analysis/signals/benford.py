@@ -1,6 +1,6 @@
 import math
 
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 # Expected Benford's Law first-digit distribution
@@ -17,6 +17,12 @@ class BenfordSignal(AbstractSignal):
     Chi-squared test and MAD > 0.015 indicate suspicious deviation.
     """
 
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count",),
+        snapshot_limit=500,
+        min_snapshots=20,
+    )
+
     @property
     def name(self) -> str:
         return "benford"
@@ -1,10 +1,16 @@
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class ChatEntropySignal(AbstractSignal):
     """Analyze chat diversity using Shannon entropy, unique message ratio,
     and timing regularity. Low entropy and low diversity suggest automated chat."""
 
+    requirements = DataRequirements(
+        chat_columns=("message_count", "message_entropy", "unique_message_ratio", "avg_time_between_msgs"),
+        chat_limit=100,
+        min_chat_metrics=1,
+    )
+
     @property
     def name(self) -> str:
         return "chat_entropy"
@@ -1,4 +1,4 @@
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class CVRSignal(AbstractSignal):
@@ -10,6 +10,12 @@ class CVRSignal(AbstractSignal):
 
     CATEGORY_BASELINE = 0.12  # 12% default baseline
 
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count", "chatter_count"),
+        snapshot_limit=500,
+        min_snapshots=1,
+    )
+
     @property
     def name(self) -> str:
         return "cvr"
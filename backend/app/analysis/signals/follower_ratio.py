@@ -1,4 +1,4 @@
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class FollowerRatioSignal(AbstractSignal):
@@ -7,6 +7,12 @@ class FollowerRatioSignal(AbstractSignal):
     If viewers consistently exceed followers, that is a major red flag.
     """
 
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count",),
+        snapshot_limit=500,
+        min_snapshots=1,
+    )
+
     @property
     def name(self) -> str:
         return "follower_ratio"
@@ -15,6 +21,9 @@ class FollowerRatioSignal(AbstractSignal):
     def weight(self) -> float:
         return 0.10
 
+    def memo_key(self, channel) -> list:
+        return [getattr(channel, "follower_count", 0)]
+
     async def calculate(self, snapshots: list, chat_metrics: list, channel) -> SignalResult:
         follower_count = getattr(channel, "follower_count", 0)
         if not follower_count or follower_count == 0:
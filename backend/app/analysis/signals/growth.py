@@ -1,4 +1,4 @@
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class GrowthSignal(AbstractSignal):
@@ -7,6 +7,12 @@ class GrowthSignal(AbstractSignal):
     Organic channels show correlated growth (r > 0.7).
     """
 
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count", "chatter_count"),
+        snapshot_limit=500,
+        min_snapshots=5,
+    )
+
     @property
     def name(self) -> str:
         return "growth"
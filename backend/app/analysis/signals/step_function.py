@@ -1,18 +1,29 @@
 import statistics
 
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class StepFunctionSignal(AbstractSignal):
     """Detect sharp, unnatural jumps in viewer counts.
 
     Rolling window analysis flags jumps >15% AND >3 standard deviations
-    from the rolling mean.
+    from the rolling mean. Steps that line up with a matched cross-channel
+    raid (see ``app.analysis.raids``) only count at ``RAID_DISCOUNT`` weight.
     """
 
     JUMP_THRESHOLD = 0.15  # 15% change
     SIGMA_THRESHOLD = 3.0
     WINDOW_SIZE = 6
+    RAID_DISCOUNT = 0.2
+
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count", "collected_at"),
+        snapshot_limit=500,
+        min_snapshots=WINDOW_SIZE + 1,
+    )
+
+    def __init__(self):
+        self.raid_index = None
 
     @property
     def name(self) -> str:
@@ -22,8 +33,14 @@ class StepFunctionSignal(AbstractSignal):
     def weight(self) -> float:
         return 0.20
 
+    def memo_key(self, channel) -> list:
+        if self.raid_index is None:
+            return []
+        return self.raid_index.ticks_for(channel.id)
+
     async def calculate(self, snapshots: list, chat_metrics: list, channel) -> SignalResult:
-        counts = [s.viewer_count for s in snapshots if s.viewer_count > 0]
+        valid = [s for s in snapshots if s.viewer_count > 0]
+        counts = [s.viewer_count for s in valid]
         if len(counts) < self.WINDOW_SIZE + 1:
             return SignalResult(score=0, confidence=0.1, details={"reason": "insufficient data"})
 
@@ -41,22 +58,31 @@ class StepFunctionSignal(AbstractSignal):
             z = abs(current - mean) / std if std > 0 else 0
 
             if pct_change > self.JUMP_THRESHOLD and z > self.SIGMA_THRESHOLD:
+                raid = self.raid_index is not None and self.raid_index.is_raid_step(
+                    channel.id, getattr(valid[i], "collected_at", None)
+                )
                 steps_detected.append({
                     "index": i,
                     "pct_change": round(pct_change, 4),
                     "z_score": round(z, 2),
                     "from_mean": round(mean, 0),
                     "to_value": current,
+                    "raid": raid,
                 })
 
         total_windows = len(counts) - self.WINDOW_SIZE
-        step_frequency = len(steps_detected) / total_windows if total_windows > 0 else 0
+        raid_steps = sum(1 for s in steps_detected if s["raid"])
+        step_weights = [self.RAID_DISCOUNT if s["raid"] else 1.0 for s in steps_detected]
+        weighted_steps = sum(step_weights)
+        step_frequency = weighted_steps / total_windows if total_windows > 0 else 0
 
         # Score based on frequency and magnitude
         if not steps_detected:
             score = 0.0
         else:
-            avg_magnitude = sum(s["pct_change"] for s in steps_detected) / len(steps_detected)
+            avg_magnitude = sum(
+                s["pct_change"] * w for s, w in zip(steps_detected, step_weights)
+            ) / len(steps_detected)
             score = min(100, step_frequency * 200 + avg_magnitude * 100)
 
         confidence = min(1.0, len(counts) / 20)
@@ -66,6 +92,7 @@ class StepFunctionSignal(AbstractSignal):
             confidence=round(confidence, 2),
             details={
                 "steps_detected": len(steps_detected),
+                "raid_steps": raid_steps,
                 "step_frequency": round(step_frequency, 4),
                 "total_windows": total_windows,
                 "examples": steps_detected[:5],
@@ -1,7 +1,8 @@
 import statistics
 from collections import defaultdict
+from datetime import timedelta
 
-from app.analysis.signals.base import AbstractSignal, SignalResult
+from app.analysis.signals.base import AbstractSignal, DataRequirements, SignalResult
 
 
 class TemporalSignal(AbstractSignal):
@@ -11,6 +12,13 @@ class TemporalSignal(AbstractSignal):
     CV < 0.2 suggests unnaturally flat/constant viewer numbers.
     """
 
+    # Hour-of-day variation needs wide time coverage, not just the latest rows
+    requirements = DataRequirements(
+        snapshot_columns=("viewer_count", "collected_at"),
+        snapshot_lookback=timedelta(days=7),
+        min_snapshots=10,
+    )
+
     @property
     def name(self) -> str:
         return "temporal"
@@ -1,22 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.channel import Channel
 from app.models.analysis_result import AnalysisResult
-from app.schemas.analysis import AnalysisResponse, SignalScore, get_score_label
+from app.schemas.analysis import AnalysisResponse, ScoreTimelinePoint, get_score_label
+from app.storage.timeline import score_timeline
+from app.utils.downsample import lttb
+from app.utils.response_cache import channel_tag, response_cache
 
 router = APIRouter(prefix="/api/v1/analysis", tags=["analysis"])
 
+# Upper bound on ?points= for score timelines
+MAX_TIMELINE_POINTS = 2000
+
 
 @router.get("/{platform}/{username}/latest", response_model=AnalysisResponse)
-async def get_latest_analysis(
+def get_latest_analysis(
     platform: str,
     username: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _latest_analysis(db, platform, username),
+    )
+
+
+def _latest_analysis(db: Session, platform: str, username: str) -> dict:
+    """Latest analysis as a plain dict in ``AnalysisResponse`` shape."""
     channel = (
-        db.query(Channel)
+        db.query(Channel.id)
         .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
         .first()
     )
@@ -24,7 +42,15 @@ async def get_latest_analysis(
         raise HTTPException(status_code=404, detail="Channel not found")
 
     analysis = (
-        db.query(AnalysisResult)
+        db.query(
+            AnalysisResult.overall_score,
+            AnalysisResult.confidence,
+            AnalysisResult.signal_scores,
+            AnalysisResult.signal_details,
+            AnalysisResult.data_points,
+            AnalysisResult.analyzed_at,
+            AnalysisResult.valid_until,
+        )
         .filter(AnalysisResult.channel_id == channel.id)
         .order_by(AnalysisResult.analyzed_at.desc())
         .first()
@@ -32,23 +58,62 @@ async def get_latest_analysis(
     if not analysis:
         raise HTTPException(status_code=404, detail="No analysis available for this channel")
 
-    signal_scores = []
-    for s in analysis.signal_scores or []:
-        signal_scores.append(
-            SignalScore(
-                name=s["name"],
-                score=s["score"],
-                weight=s["weight"],
-                confidence=s["confidence"],
-                details=(analysis.signal_details or {}).get(s["name"], {}),
-            )
-        )
+    details = analysis.signal_details or {}
+    return {
+        "overall_score": analysis.overall_score,
+        "confidence": analysis.confidence,
+        "label": get_score_label(analysis.overall_score),
+        "signal_scores": [
+            {
+                "name": s["name"],
+                "score": s["score"],
+                "weight": s["weight"],
+                "confidence": s["confidence"],
+                "details": details.get(s["name"], {}),
+            }
+            for s in analysis.signal_scores or []
+        ],
+        "data_points": analysis.data_points,
+        # The most recent run this result covers
+        "analyzed_at": analysis.valid_until or analysis.analyzed_at,
+    }
+
 
-    return AnalysisResponse(
-        overall_score=analysis.overall_score,
-        confidence=analysis.confidence,
-        label=get_score_label(analysis.overall_score),
-        signal_scores=signal_scores,
-        data_points=analysis.data_points,
-        analyzed_at=analysis.analyzed_at,
+@router.get("/{platform}/{username}/timeline", response_model=list[ScoreTimelinePoint])
+def get_score_timeline(
+    platform: str,
+    username: str,
+    request: Request,
+    days: int = Query(30, ge=1, le=3650),
+    points: int | None = Query(None, ge=3, le=MAX_TIMELINE_POINTS),
+    db: Session = Depends(get_db),
+):
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _score_timeline(db, platform, username, days, points),
+    )
+
+
+def _score_timeline(db: Session, platform: str, username: str, days: int, points: int | None) -> list[dict]:
+    """Score intervals as plain dicts in ``ScoreTimelinePoint`` shape."""
+    channel = (
+        db.query(Channel.id)
+        .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
+        .first()
     )
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+
+    rows = score_timeline(db, channel.id, datetime.utcnow() - timedelta(days=days))
+    if points and len(rows) > points:
+        rows = [rows[i] for i in lttb([r[0].timestamp() for r in rows], [r[2] for r in rows], points)]
+    return [
+        {
+            "analyzed_at": analyzed_at,
+            "valid_until": valid_until,
+            "overall_score": score,
+            "confidence": confidence,
+        }
+        for analyzed_at, valid_until, score, confidence in rows
+    ]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.anomaly import Anomaly
+from app.models.channel import Channel
+from app.schemas.anomaly import AnomalyResponse
+from app.storage.anomalies import KINDS, RETENTION_HOURS, SEVERITIES, anomaly_dict
+from app.utils.response_cache import channel_tag, response_cache
+
+router = APIRouter(prefix="/api/v1/anomalies", tags=["anomalies"])
+
+
+@router.get("", response_model=list[AnomalyResponse])
+def get_anomalies(
+    request: Request,
+    hours: int = Query(24, ge=1, le=RETENTION_HOURS),
+    platform: str | None = Query(None),
+    kind: str | None = Query(None, description="spike, zscore or flatline"),
+    severity: str | None = Query(None, description="Minimum severity: low, medium or high"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Recent anomalies across all channels, newest first."""
+    _validate(kind, severity)
+    return response_cache.respond(
+        request,
+        ["anomalies"],
+        lambda: _anomalies(db, hours, limit, platform=platform, kind=kind, severity=severity),
+    )
+
+
+@router.get("/{platform}/{username}", response_model=list[AnomalyResponse])
+def get_channel_anomalies(
+    platform: str,
+    username: str,
+    request: Request,
+    hours: int = Query(168, ge=1, le=RETENTION_HOURS),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """A channel's recent anomalies, newest first."""
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _channel_anomalies(db, platform, username, hours, limit),
+    )
+
+
+def _validate(kind: str | None, severity: str | None):
+    if kind is not None and kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(KINDS)}")
+    if severity is not None and severity not in SEVERITIES:
+        raise HTTPException(status_code=400, detail=f"severity must be one of: {', '.join(SEVERITIES)}")
+
+
+def _channel_anomalies(db: Session, platform: str, username: str, hours: int, limit: int) -> list[dict]:
+    channel = (
+        db.query(Channel.id)
+        .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
+        .first()
+    )
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return _anomalies(db, hours, limit, channel_id=channel.id)
+
+
+def _anomalies(
+    db: Session,
+    hours: int,
+    limit: int,
+    channel_id: int | None = None,
+    platform: str | None = None,
+    kind: str | None = None,
+    severity: str | None = None,
+) -> list[dict]:
+    """Anomalies as plain dicts in ``AnomalyResponse`` shape."""
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    query = (
+        db.query(Anomaly, Channel)
+        .join(Channel, Channel.id == Anomaly.channel_id)
+        .filter(Anomaly.detected_at >= cutoff)
+    )
+    if channel_id is not None:
+        query = query.filter(Anomaly.channel_id == channel_id)
+    if platform:
+        query = query.filter(Channel.platform == platform.lower())
+    if kind:
+        query = query.filter(Anomaly.kind == kind)
+    if severity:
+        query = query.filter(Anomaly.severity.in_(SEVERITIES[SEVERITIES.index(severity):]))
+    query = query.order_by(Anomaly.detected_at.desc()).limit(limit)
+    return [anomaly_dict(anomaly, channel) for anomaly, channel in query]
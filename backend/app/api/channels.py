@@ -1,76 +1,92 @@
 import logging
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import String, tuple_, type_coerce
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models.channel import Channel
 from app.models.snapshot import ViewerSnapshot
-from app.models.analysis_result import AnalysisResult
-from app.schemas.channel import ChannelDetail, ChannelResponse, SnapshotResponse
+from app.models.channel_stats import ChannelStats
+from app.models.latest_analysis import ChannelLatestAnalysis
+from app.schemas.channel import (
+    BulkChannelsRequest,
+    BulkChannelsResponse,
+    BulkTrackResponse,
+    ChannelDetail,
+    ChannelRef,
+    ChannelResponse,
+    SnapshotColumns,
+    SnapshotResponse,
+)
 from app.schemas.analysis import get_score_label
+from app.collectors.registry import PLATFORMS
+from app.config import settings
+from app.scheduler.tracking import PENDING, QUEUED, REJECTED, ensure_channels, track_queue
+from app.storage import rollups
+from app.utils.downsample import lttb
+from app.utils.fastjson import FastJSONResponse
+from app.utils.response_cache import channel_tag, response_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/channels", tags=["channels"])
 
+# Upper bound on points returned by automatic resolution selection
+MAX_SNAPSHOT_POINTS = 1000
+# Upper bound on ?points=, and how many source points per output point
+# automatic resolution selection allows when downsampling
+MAX_DOWNSAMPLED_POINTS = 5000
+DOWNSAMPLE_SOURCE_FACTOR = 20
 
-def _get_collector(platform: str):
-    if platform == "twitch":
-        from app.collectors.twitch import TwitchCollector
-        return TwitchCollector()
-    elif platform == "youtube":
-        from app.collectors.youtube import YouTubeCollector
-        return YouTubeCollector()
-    elif platform == "kick":
-        from app.collectors.kick import KickCollector
-        return KickCollector()
-    else:
-        return None
 
+@router.post("/bulk", response_model=BulkChannelsResponse)
+def get_channels_bulk(body: BulkChannelsRequest, db: Session = Depends(get_db)):
+    """Channel details for many channels in three queries, in request order."""
+    keys = list(dict.fromkeys((c.platform.lower(), c.username.lower()) for c in body.channels))
+    channels, latest, stats = _bulk_lookup(db, keys)
 
-async def _collect_channel(platform: str, username: str, db: Session):
-    collector = _get_collector(platform)
-    if not collector:
-        return
-    try:
-        info = await collector.collect_channel_info(username)
-        if not info:
-            return
-        channel = (
-            db.query(Channel)
-            .filter(Channel.platform == platform, Channel.username == username)
-            .first()
-        )
-        if channel:
-            for key, value in info.items():
-                if hasattr(channel, key) and value is not None:
-                    setattr(channel, key, value)
-            channel.last_collected = datetime.utcnow()
-        else:
-            channel = Channel(**info, last_collected=datetime.utcnow())
-            db.add(channel)
-        db.commit()
-
-        # Collect viewer snapshot
-        viewers = await collector.collect_viewers(username)
-        if viewers and channel.id:
-            channel.is_live = viewers.get("is_live", False)
-            snapshot = ViewerSnapshot(
-                channel_id=channel.id,
-                viewer_count=viewers.get("viewer_count", 0),
-                chatter_count=viewers.get("chatter_count", 0),
-                category=viewers.get("category"),
-            )
-            db.add(snapshot)
-            db.commit()
-    except Exception as e:
-        logger.error("Collection failed for %s/%s: %s", platform, username, e)
+    results = []
+    missing = []
+    for platform, username in keys:
+        channel = channels.get((platform, username))
+        if channel is None:
+            missing.append({"platform": platform, "username": username})
+            continue
+        results.append(_build_detail(channel, latest.get(channel.id), stats.get(channel.id)))
+    return FastJSONResponse({"results": results, "missing": missing})
+
+
+def _bulk_lookup(db: Session, keys: list[tuple[str, str]]) -> tuple[dict, dict, dict]:
+    """Channels by ``(platform, username)``, and their latest analysis and
+    stats rows by channel id."""
+    channels = {
+        (c.platform, c.username): c
+        for c in db.query(Channel).filter(tuple_(Channel.platform, Channel.username).in_(keys))
+    } if keys else {}
+    ids = [c.id for c in channels.values()]
+    latest = {
+        r.channel_id: r
+        for r in db.query(ChannelLatestAnalysis).filter(ChannelLatestAnalysis.channel_id.in_(ids))
+    } if ids else {}
+    stats = {
+        r.channel_id: r
+        for r in db.query(ChannelStats).filter(ChannelStats.channel_id.in_(ids))
+    } if ids else {}
+    return channels, latest, stats
 
 
 @router.get("/{platform}/{username}", response_model=ChannelDetail)
-async def get_channel(platform: str, username: str, db: Session = Depends(get_db)):
+def get_channel(platform: str, username: str, request: Request, db: Session = Depends(get_db)):
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _channel_detail(db, platform, username),
+    )
+
+
+def _channel_detail(db: Session, platform: str, username: str) -> dict:
     channel = (
         db.query(Channel)
         .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
@@ -79,33 +95,125 @@ async def get_channel(platform: str, username: str, db: Session = Depends(get_db
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    latest = (
-        db.query(AnalysisResult)
-        .filter(AnalysisResult.channel_id == channel.id)
-        .order_by(AnalysisResult.analyzed_at.desc())
-        .first()
-    )
+    latest = db.get(ChannelLatestAnalysis, channel.id)
+    stats = db.get(ChannelStats, channel.id)
+    return _build_detail(channel, latest, stats)
+
 
-    result = ChannelDetail.model_validate(channel)
-    if latest:
-        result.latest_analysis = {
+def _build_detail(channel: Channel, latest: ChannelLatestAnalysis | None, stats: ChannelStats | None) -> dict:
+    """Channel detail as a plain dict in ``ChannelDetail`` shape."""
+    return {
+        "id": channel.id,
+        "platform": channel.platform,
+        "username": channel.username,
+        "display_name": channel.display_name,
+        "avatar_url": channel.avatar_url,
+        "category": channel.category,
+        "follower_count": channel.follower_count or 0,
+        "is_live": bool(channel.is_live),
+        "latest_analysis": {
             "overall_score": latest.overall_score,
             "confidence": latest.confidence,
             "label": get_score_label(latest.overall_score),
             "analyzed_at": latest.analyzed_at,
-        }
-    return result
+        } if latest else None,
+        "stats": {
+            "snapshot_count": stats.snapshot_count,
+            "avg_viewers": stats.avg_viewers,
+            "peak_viewers": stats.peak_viewers,
+            "last_viewers": stats.last_viewers,
+            "previous_viewers": stats.previous_viewers,
+            "last_collected_at": stats.last_collected_at,
+            "last_live_at": stats.last_live_at,
+            "last_score": stats.last_score,
+            "previous_score": stats.previous_score,
+        } if stats else None,
+    }
 
 
-@router.get("/{platform}/{username}/snapshots", response_model=list[SnapshotResponse])
-async def get_snapshots(
+def _raw_hours() -> int | None:
+    """How far back raw snapshots stay in the table, or None if forever.
+
+    Pruned rows are gone and archived rows live in the columnar archive,
+    so either setting bounds raw series.
+    """
+    limits = [d * 24 for d in (settings.SNAPSHOT_RETENTION_DAYS, settings.ARCHIVE_AFTER_DAYS) if d > 0]
+    return min(limits) if limits else None
+
+
+def _pick_resolution(hours: int, budget: int = MAX_SNAPSHOT_POINTS) -> int | None:
+    """Finest resolution (None = raw) whose point count fits the budget."""
+    raw_hours = _raw_hours()
+    raw_available = raw_hours is None or hours <= raw_hours
+    if raw_available and hours * 60 / settings.COLLECT_INTERVAL_MINUTES <= budget:
+        return None
+    if hours <= budget:
+        return rollups.HOUR
+    return rollups.DAY
+
+
+def _downsample(points: list[tuple], target: int) -> list[tuple]:
+    if len(points) <= target:
+        return points
+    xs = [p[1].timestamp() for p in points]
+    ys = [p[2] for p in points]
+    return [points[i] for i in lttb(xs, ys, target)]
+
+
+def _snapshot_columns(points: list[tuple], rolled_up: bool) -> FastJSONResponse:
+    """Parallel arrays instead of one object per point."""
+    columns = {
+        "id": [p[0] for p in points],
+        "collected_at": [p[1] for p in points],
+        "viewer_count": [p[2] for p in points],
+        "chatter_count": [p[3] for p in points],
+        "category": [p[4] for p in points],
+    }
+    if rolled_up:
+        columns["viewer_min"] = [p[5] for p in points]
+        columns["viewer_max"] = [p[6] for p in points]
+        columns["sample_count"] = [p[7] for p in points]
+    return FastJSONResponse(columns)
+
+
+@router.get(
+    "/{platform}/{username}/snapshots",
+    response_model=list[SnapshotResponse] | SnapshotColumns,
+)
+def get_snapshots(
     platform: str,
     username: str,
     hours: int = 24,
+    resolution: str | None = Query(None, pattern="^(raw|1h|1d)$"),
+    points: int | None = Query(None, ge=3, le=MAX_DOWNSAMPLED_POINTS),
+    format: str = Query("rows", pattern="^(rows|columns)$"),
     db: Session = Depends(get_db),
 ):
+    series, rolled_up = _snapshot_series(db, platform, username, hours, resolution, points)
+    if format == "columns":
+        return _snapshot_columns(series, rolled_up)
+    return FastJSONResponse([
+        {
+            "id": p[0],
+            "viewer_count": p[2],
+            "chatter_count": p[3],
+            "category": p[4],
+            "collected_at": p[1],
+            "viewer_min": p[5],
+            "viewer_max": p[6],
+            "sample_count": p[7],
+        }
+        for p in series
+    ])
+
+
+def _snapshot_series(
+    db: Session, platform: str, username: str, hours: int, resolution: str | None, points: int | None,
+) -> tuple[list[tuple], bool]:
+    """``(id, collected_at, viewers, chatters, category, viewer_min, viewer_max,
+    sample_count)`` points, oldest first, and whether they are rollups."""
     channel = (
-        db.query(Channel)
+        db.query(Channel.id)
         .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
         .first()
     )
@@ -113,49 +221,85 @@ async def get_snapshots(
         raise HTTPException(status_code=404, detail="Channel not found")
 
     since = datetime.utcnow() - timedelta(hours=hours)
-    snapshots = (
-        db.query(ViewerSnapshot)
-        .filter(
-            ViewerSnapshot.channel_id == channel.id,
-            ViewerSnapshot.collected_at >= since,
-        )
-        .order_by(ViewerSnapshot.collected_at.asc())
-        .all()
+    if resolution is None:
+        # Downsampling works best from finer data, so allow more source points
+        budget = max(MAX_SNAPSHOT_POINTS, points * DOWNSAMPLE_SOURCE_FACTOR) if points else MAX_SNAPSHOT_POINTS
+        bucket = _pick_resolution(hours, budget)
+    else:
+        bucket = rollups.RESOLUTIONS.get(resolution)
+        raw_hours = _raw_hours()
+        if bucket is None and raw_hours is not None and hours > raw_hours:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Raw snapshots are kept for {raw_hours} hours; use resolution=1h or 1d for longer windows",
+            )
+
+    if bucket is not None:
+        series = [
+            (
+                r.id, r.bucket_start, round(r.viewer_mean), round(r.chatter_mean), None,
+                r.viewer_min, r.viewer_max, r.sample_count,
+            )
+            for r in rollups.query_rollups(db, channel.id, bucket, since)
+        ]
+    else:
+        # SQLite stores timestamps as ISO text: fetching that text and using
+        # fromisoformat is far cheaper than the dialect's per-row DateTime
+        # processing on long windows. Other dialects return datetimes.
+        as_text = db.get_bind().dialect.name == "sqlite"
+        collected_at = type_coerce(ViewerSnapshot.collected_at, String) if as_text else ViewerSnapshot.collected_at
+        series = [
+            (id_, datetime.fromisoformat(ts) if as_text else ts, viewers, chatters or 0, category, None, None, None)
+            for id_, ts, viewers, chatters, category in db.query(
+                ViewerSnapshot.id,
+                collected_at,
+                ViewerSnapshot.viewer_count,
+                ViewerSnapshot.chatter_count,
+                ViewerSnapshot.category,
+            )
+            .filter(
+                ViewerSnapshot.channel_id == channel.id,
+                ViewerSnapshot.collected_at >= since,
+            )
+            .order_by(ViewerSnapshot.collected_at.asc())
+        ]
+
+    if points:
+        series = _downsample(series, points)
+    return series, bucket is not None
+
+
+@router.post("/track", response_model=BulkTrackResponse)
+async def track_channels(body: BulkChannelsRequest):
+    """Track up to 500 channels; their platform lookups are batched."""
+    keys = list(dict.fromkeys((c.platform.lower(), c.username.lower()) for c in body.channels))
+    unsupported = [key for key in keys if key[0] not in PLATFORMS]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported platform: {unsupported[0][0]}")
+
+    channels = await run_db(ensure_channels, keys)
+    outcomes = [track_queue.submit(platform, username) for platform, username in keys]
+    return BulkTrackResponse(
+        results=channels,
+        queued=outcomes.count(QUEUED),
+        pending=outcomes.count(PENDING),
+        rejected=[
+            ChannelRef(platform=platform, username=username)
+            for (platform, username), outcome in zip(keys, outcomes)
+            if outcome == REJECTED
+        ],
     )
-    return [SnapshotResponse.model_validate(s) for s in snapshots]
 
 
 @router.post("/{platform}/{username}/track", response_model=ChannelResponse)
-async def track_channel(
-    platform: str,
-    username: str,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
+async def track_channel(platform: str, username: str):
     platform = platform.lower()
     username = username.lower()
+    if platform not in PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"Unsupported platform: {platform}")
 
-    channel = (
-        db.query(Channel)
-        .filter(Channel.platform == platform, Channel.username == username)
-        .first()
-    )
-    if not channel:
-        # Create placeholder, collection will fill in details
-        channel = Channel(
-            platform=platform,
-            platform_id="",
-            username=username,
-            display_name=username,
-        )
-        db.add(channel)
-        db.commit()
-        db.refresh(channel)
-
-    # Trigger immediate collection in background
-    background_tasks.add_task(_collect_channel, platform, username, SessionLocal())
-    return ChannelResponse.model_validate(channel)
-
-
-# Import SessionLocal here to avoid circular imports at module level
-from app.database import SessionLocal
+    # Create placeholder, collection will fill in details
+    [channel] = await run_db(ensure_channels, [(platform, username)])
+    if track_queue.submit(platform, username) == REJECTED:
+        raise HTTPException(status_code=503, detail="Tracking queue is full, try again shortly")
+    return channel
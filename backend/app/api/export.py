@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.storage.export import DATASETS, FORMATS, parse_channel_refs, stream_export
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+# Upper bound on ?channels= entries
+MAX_EXPORT_CHANNELS = 500
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: datetime | None = Query(None),
+    end: datetime | None = Query(None),
+    platform: str | None = Query(None),
+    channels: str | None = Query(None, description="Comma-separated platform/username pairs"),
+):
+    """Stream every row of ``dataset`` in range, channel by channel, oldest first."""
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    refs = None
+    if channels:
+        try:
+            refs = parse_channel_refs(channels.split(","))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if len(refs) > MAX_EXPORT_CHANNELS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_EXPORT_CHANNELS} channels per export")
+
+    # A sync iterator: Starlette advances it in the threadpool, off the event loop
+    return StreamingResponse(
+        stream_export(dataset, format, start, end, platform.lower() if platform else None, refs),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'},
+    )
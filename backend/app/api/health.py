@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from app.utils.metrics import CONTENT_TYPE, registry
 
 router = APIRouter(prefix="/api/v1", tags=["health"])
 
@@ -10,3 +12,9 @@ async def health_check():
         "version": "0.1.0",
         "platform": "StreamOracle",
     }
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """Pipeline metrics in the Prometheus text exposition format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
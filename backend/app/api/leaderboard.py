@@ -1,64 +1,70 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.channel import Channel
-from app.models.analysis_result import AnalysisResult
+from app.models.latest_analysis import ChannelLatestAnalysis
 from app.schemas.analysis import LeaderboardEntry, get_score_label
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/api/v1", tags=["leaderboard"])
 
 
 @router.get("/leaderboard", response_model=list[LeaderboardEntry])
-async def get_leaderboard(
+def get_leaderboard(
+    request: Request,
     platform: str | None = Query(None),
     category: str | None = Query(None),
     limit: int = Query(50, le=200),
     db: Session = Depends(get_db),
 ):
-    # Subquery for latest analysis per channel
-    latest_subq = (
-        db.query(
-            AnalysisResult.channel_id,
-            func.max(AnalysisResult.analyzed_at).label("max_at"),
-        )
-        .group_by(AnalysisResult.channel_id)
-        .subquery()
+    return response_cache.respond(
+        request,
+        ["leaderboard"],
+        lambda: _leaderboard(db, platform, category, limit),
     )
 
+
+def _leaderboard(db: Session, platform: str | None, category: str | None, limit: int) -> list[dict]:
+    """Leaderboard entries as plain dicts in ``LeaderboardEntry`` shape."""
     query = (
-        db.query(AnalysisResult, Channel)
-        .join(Channel, Channel.id == AnalysisResult.channel_id)
-        .join(
-            latest_subq,
-            (AnalysisResult.channel_id == latest_subq.c.channel_id)
-            & (AnalysisResult.analyzed_at == latest_subq.c.max_at),
+        db.query(
+            Channel.id,
+            Channel.platform,
+            Channel.username,
+            Channel.display_name,
+            Channel.avatar_url,
+            ChannelLatestAnalysis.overall_score,
+            ChannelLatestAnalysis.analyzed_at,
         )
+        .join(Channel, Channel.id == ChannelLatestAnalysis.channel_id)
     )
 
     if platform:
-        query = query.filter(Channel.platform == platform.lower())
+        query = query.filter(ChannelLatestAnalysis.platform == platform.lower())
     if category:
-        query = query.filter(Channel.category.ilike(f"%{category}%"))
-
-    query = query.order_by(AnalysisResult.overall_score.desc()).limit(limit)
-    results = query.all()
-
-    entries = []
-    for rank, (analysis, channel) in enumerate(results, 1):
-        entries.append(
-            LeaderboardEntry(
-                rank=rank,
-                channel_id=channel.id,
-                platform=channel.platform,
-                username=channel.username,
-                display_name=channel.display_name,
-                avatar_url=channel.avatar_url,
-                overall_score=analysis.overall_score,
-                label=get_score_label(analysis.overall_score),
-                analyzed_at=analysis.analyzed_at,
-            )
+        # Resolve the substring against the few distinct categories, so the
+        # main query can seek the category index instead of testing each row
+        categories = (
+            db.query(ChannelLatestAnalysis.category)
+            .filter(ChannelLatestAnalysis.category.ilike(f"%{category}%"))
+            .distinct()
         )
+        query = query.filter(ChannelLatestAnalysis.category.in_([c for (c,) in categories]))
 
-    return entries
+    query = query.order_by(ChannelLatestAnalysis.overall_score.desc()).limit(limit)
+    return [
+        {
+            "rank": rank,
+            "channel_id": channel_id,
+            "platform": channel_platform,
+            "username": username,
+            "display_name": display_name,
+            "avatar_url": avatar_url,
+            "overall_score": score,
+            "label": get_score_label(score),
+            "analyzed_at": analyzed_at,
+        }
+        for rank, (channel_id, channel_platform, username, display_name, avatar_url, score, analyzed_at)
+        in enumerate(query, 1)
+    ]
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.utils.live_hub import ANOMALIES, LEADERBOARD, live_hub
+from app.utils.metrics import LIVE_CONNECTIONS
+
+router = APIRouter(prefix="/api/v1/live", tags=["live"])
+
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = 15
+
+TOPICS_DESCRIPTION = "Comma-separated topics: leaderboard, anomalies, channel:<platform>/<username>"
+
+
+def _parse_topics(topics: str) -> set[str]:
+    parsed = {t.strip().lower() for t in topics.split(",") if t.strip()}
+    for topic in parsed:
+        if topic not in (LEADERBOARD, ANOMALIES) and not (topic.startswith("channel:") and "/" in topic):
+            raise ValueError(f"Unknown topic: {topic}")
+    return parsed
+
+
+@router.websocket("/ws")
+async def live_websocket(websocket: WebSocket, topics: str = Query(..., description=TOPICS_DESCRIPTION)):
+    try:
+        sub = live_hub.subscribe(_parse_topics(topics))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    await websocket.accept()
+    LIVE_CONNECTIONS.inc(transport="websocket")
+
+    async def drain_client():
+        # Nothing is expected from the client; this only notices the disconnect
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    closed = asyncio.create_task(drain_client())
+    try:
+        while True:
+            message = asyncio.create_task(sub.get())
+            done, _ = await asyncio.wait({message, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed in done:
+                message.cancel()
+                break
+            await websocket.send_text(json.dumps(message.result(), default=str))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        live_hub.unsubscribe(sub)
+        LIVE_CONNECTIONS.dec(transport="websocket")
+
+
+@router.get("/sse")
+async def live_events(topics: str = Query(..., description=TOPICS_DESCRIPTION)):
+    try:
+        parsed = _parse_topics(topics)
+        live_hub.check_topics(parsed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        # Subscribed only once the body is iterated: a client that leaves
+        # before then never reaches the finally below
+        sub = live_hub.subscribe(parsed)
+        LIVE_CONNECTIONS.inc(transport="sse")
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(sub.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+        finally:
+            live_hub.unsubscribe(sub)
+            LIVE_CONNECTIONS.dec(transport="sse")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
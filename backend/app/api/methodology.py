@@ -1,10 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/api/v1", tags=["methodology"])
 
 SIGNALS = [
     {"name": "Concurrent Viewer Ratio (CVR)", "weight": 0.25, "description": "Ratio of chatters to viewers; abnormally low chat participation suggests inflated viewers."},
-    {"name": "Step Function Detection", "weight": 0.20, "description": "Detects sudden jumps or drops in viewer count that don't follow organic growth patterns."},
+    {"name": "Step Function Detection", "weight": 0.20, "description": "Detects sudden jumps or drops in viewer count that don't follow organic growth patterns. Jumps matched to a raid from another tracked channel are discounted."},
     {"name": "Chat Entropy", "weight": 0.15, "description": "Shannon entropy of chat messages; bot-driven chats tend to have lower diversity and entropy."},
     {"name": "Follower Ratio", "weight": 0.10, "description": "Ratio of followers to peak viewers; organic channels maintain stable follower-to-viewer ratios."},
     {"name": "Growth Trajectory", "weight": 0.10, "description": "Analyzes channel growth patterns for signs of artificial inflation or unnatural spikes."},
@@ -24,9 +26,13 @@ LABELS = {
 
 
 @router.get("/methodology")
-async def get_methodology():
-    return {
-        "signals": SIGNALS,
-        "formula": FORMULA,
-        "labels": LABELS,
-    }
+async def get_methodology(request: Request):
+    return response_cache.respond(
+        request,
+        [],
+        lambda: {
+            "signals": SIGNALS,
+            "formula": FORMULA,
+            "labels": LABELS,
+        },
+    )
@@ -3,23 +3,39 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.channel import Channel
-from app.schemas.channel import ChannelResponse, SearchResponse
+from app.schemas.channel import AutocompleteEntry, ChannelResponse, SearchResponse
+from app.storage.search import prefix_index, search_channel_ids
 
 router = APIRouter(prefix="/api/v1", tags=["search"])
 
 
 @router.get("/search", response_model=SearchResponse)
-async def search_channels(
+def search_channels(
     q: str = Query(..., min_length=1),
     platform: str | None = Query(None),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Channel).filter(Channel.username.ilike(f"%{q}%"))
-    if platform:
-        query = query.filter(Channel.platform == platform.lower())
-
-    channels = query.limit(50).all()
+    ids = search_channel_ids(db, q, platform.lower() if platform else None, limit=50)
+    by_id = {c.id: c for c in db.query(Channel).filter(Channel.id.in_(ids))} if ids else {}
+    channels = [by_id[i] for i in ids if i in by_id]
     return SearchResponse(
         results=[ChannelResponse.model_validate(c) for c in channels],
         total=len(channels),
     )
+
+
+@router.get("/search/autocomplete", response_model=list[AutocompleteEntry])
+def autocomplete_channels(
+    q: str = Query(..., min_length=1),
+    platform: str | None = Query(None),
+    limit: int = Query(10, le=50),
+):
+    # Served entirely from the in-memory prefix index
+    entries = []
+    for channel_id in prefix_index.lookup(q.strip(), platform.lower() if platform else None, limit):
+        entry = prefix_index.entry(channel_id)
+        if entry:
+            entries.append(AutocompleteEntry(
+                id=channel_id, platform=entry[0], username=entry[1], display_name=entry[2],
+            ))
+    return entries
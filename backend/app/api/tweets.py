@@ -1,18 +1,16 @@
-import asyncio
-from datetime import datetime, timedelta
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.tweet_log import TweetLog
+from app.models.tweet_outbox import TweetOutbox
 from app.twitter.poster import post_interesting_tweet
 
 router = APIRouter(prefix="/api/v1", tags=["tweets"])
 
 
 @router.get("/tweets")
-async def get_tweet_history(limit: int = 20, db: Session = Depends(get_db)):
+def get_tweet_history(limit: int = 20, db: Session = Depends(get_db)):
     """Get recent tweet history."""
     tweets = (
         db.query(TweetLog)
@@ -33,8 +31,33 @@ async def get_tweet_history(limit: int = 20, db: Session = Depends(get_db)):
     ]
 
 
-@router.post("/tweets/trigger")
-async def trigger_tweet():
-    """Manually trigger the bot to find and post an interesting tweet."""
-    await post_interesting_tweet()
-    return {"status": "ok", "message": "Tweet cycle executed. Check /api/v1/tweets for result."}
+@router.get("/tweets/outbox")
+def get_tweet_outbox(status: str | None = None, limit: int = 20, db: Session = Depends(get_db)):
+    """Get recently queued tweets and their delivery state."""
+    query = db.query(TweetOutbox)
+    if status:
+        query = query.filter(TweetOutbox.status == status)
+    rows = query.order_by(TweetOutbox.id.desc()).limit(min(limit, 100)).all()
+    return [
+        {
+            "id": t.id,
+            "channel_id": t.channel_id,
+            "tweet_type": t.tweet_type,
+            "tweet_text": t.tweet_text,
+            "status": t.status,
+            "attempts": t.attempts,
+            "next_attempt_at": t.next_attempt_at.isoformat() if t.next_attempt_at else None,
+            "last_error": t.last_error,
+            "twitter_tweet_id": t.twitter_tweet_id,
+            "created_at": t.created_at.isoformat() if t.created_at else None,
+            "sent_at": t.sent_at.isoformat() if t.sent_at else None,
+        }
+        for t in rows
+    ]
+
+
+@router.post("/tweets/trigger", status_code=202)
+async def trigger_tweet(background_tasks: BackgroundTasks):
+    """Manually trigger the bot to find and queue an interesting tweet."""
+    background_tasks.add_task(post_interesting_tweet)
+    return {"status": "accepted", "message": "Tweet cycle started. Check /api/v1/tweets/outbox for result."}
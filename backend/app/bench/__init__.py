@@ -0,0 +1 @@
+"""Benchmarks run against scratch databases seeded with synthetic data."""
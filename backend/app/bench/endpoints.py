@@ -0,0 +1,128 @@
+"""Requests per second for the hot API endpoints, against the previous path.
+
+Seeds a scratch SQLite database (see ``app.bench.synthetic``) and
+drives each endpoint in-process through ``TestClient``, first on the app
+and then on ``app.bench.legacy``'s per-row Pydantic handlers at the same
+paths, and reports the speedup. The response cache is invalidated before
+every request so each one builds and serializes its body; ``--cached``
+measures cache hits instead:
+
+    python -m app.bench.endpoints --channels 200 --snapshots 2000 --seconds 2
+
+Prints a table, or one JSON object per endpoint with ``--json``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from fastapi.testclient import TestClient
+
+from app.bench.legacy import legacy_app
+from app.bench.synthetic import prepare
+from app.main import app
+from app.utils.response_cache import channel_tag, response_cache
+
+
+@dataclass
+class Case:
+    name: str
+    path: str
+    tags: list[str] = field(default_factory=list)
+    body: dict | None = None
+
+
+def _cases() -> list[Case]:
+    tag = channel_tag("twitch", "user3")
+    bulk = {"channels": [{"platform": ("twitch", "youtube", "kick")[i % 3], "username": f"user{i}"} for i in range(1, 101)]}
+    return [
+        Case("leaderboard", "/api/v1/leaderboard?limit=200", ["leaderboard"]),
+        Case("channel", "/api/v1/channels/twitch/user3", [tag]),
+        Case("analysis", "/api/v1/analysis/twitch/user3/latest", [tag]),
+        Case("snapshots_24h", "/api/v1/channels/twitch/user3/snapshots?hours=24"),
+        Case("snapshots_raw_7d", "/api/v1/channels/twitch/user3/snapshots?hours=168&resolution=raw"),
+        Case("snapshots_raw_7d_columns", "/api/v1/channels/twitch/user3/snapshots?hours=168&resolution=raw&format=columns"),
+        Case("snapshots_30d_500pts", "/api/v1/channels/twitch/user3/snapshots?hours=720&points=500"),
+        Case("search", "/api/v1/search?q=user1"),
+        Case("bulk_100", "/api/v1/channels/bulk", body=bulk),
+    ]
+
+
+def run_case(client: TestClient, case: Case, seconds: float, cached: bool) -> dict:
+    def request():
+        if not cached and case.tags:
+            response_cache.invalidate(*case.tags)
+        if case.body is not None:
+            return client.post(case.path, json=case.body)
+        return client.get(case.path)
+
+    if case.tags:
+        # The apps share cache keys, so start each run from a cold entry
+        response_cache.invalidate(*case.tags)
+    first = request()
+    first.raise_for_status()
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        request()
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "endpoint": case.name,
+        "path": case.path,
+        "requests": count,
+        "seconds": round(elapsed, 4),
+        "rps": round(count / elapsed, 1),
+        "ms_per_request": round(elapsed * 1000 / count, 3),
+        "bytes": len(first.content),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Requests per second for hot API endpoints")
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--snapshots", type=int, default=2000, help="snapshots per channel")
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per endpoint")
+    parser.add_argument("--db", default=None, help="reuse or create this SQLite file instead of a temp one")
+    parser.add_argument("--only", nargs="*", help="endpoint names to run")
+    parser.add_argument("--cached", action="store_true", help="leave the response cache warm")
+    parser.add_argument("--skip-previous", action="store_true", help="do not measure the previous path")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per endpoint")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="streamoracle-bench-"), "bench.db")
+    prepare(db_path, args.channels, args.snapshots)
+
+    client = TestClient(app)
+    previous = None if args.skip_previous else TestClient(legacy_app)
+    if not args.json:
+        print(f"{'endpoint':<28} {'req/s':>9} {'previous':>9} {'speedup':>8} {'ms/req':>9} {'bytes':>9}")
+    for case in _cases():
+        if args.only and case.name not in args.only:
+            continue
+        result = run_case(client, case, args.seconds, args.cached)
+        if previous is not None:
+            before = run_case(previous, case, args.seconds, args.cached)
+            result["previous_rps"] = before["rps"]
+            result["speedup"] = round(result["rps"] / before["rps"], 2) if before["rps"] else None
+        if args.json:
+            print(json.dumps(result))
+        else:
+            speedup = result.get("speedup")
+            print(
+                f"{result['endpoint']:<28} {result['rps']:>9.1f} {result.get('previous_rps', '-'):>9} "
+                f"{'-' if speedup is None else f'{speedup:.2f}x':>8} "
+                f"{result['ms_per_request']:>9.3f} {result['bytes']:>9}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
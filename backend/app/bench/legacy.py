@@ -0,0 +1,232 @@
+"""The hot JSON endpoints as they were served before the fast path.
+
+``app.bench.endpoints`` mounts these at the same paths in ``legacy_app``
+to measure the gain of the fast path. Each handler builds one Pydantic
+model per row and returns it through its ``response_model`` (or the
+response cache's ``TypeAdapter``), with the standard library encoder for
+columnar snapshots. Where only the response building changed, the
+database work is shared with the current routes.
+"""
+
+import json
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
+
+from app.api.channels import MAX_DOWNSAMPLED_POINTS, _bulk_lookup, _snapshot_series
+from app.api.search import router as search_router
+from app.config import settings
+from app.database import get_db
+from app.models.analysis_result import AnalysisResult
+from app.models.channel import Channel
+from app.models.channel_stats import ChannelStats
+from app.models.latest_analysis import ChannelLatestAnalysis
+from app.schemas.analysis import AnalysisResponse, LeaderboardEntry, SignalScore, get_score_label
+from app.schemas.channel import (
+    AnalysisSummary,
+    BulkChannelsRequest,
+    BulkChannelsResponse,
+    ChannelDetail,
+    ChannelRef,
+    ChannelStatsSummary,
+    SnapshotColumns,
+    SnapshotResponse,
+)
+from app.utils.metrics import MetricsMiddleware
+from app.utils.response_cache import channel_tag, response_cache
+
+router = APIRouter(prefix="/api/v1")
+
+
+@router.get("/leaderboard", response_model=list[LeaderboardEntry])
+def get_leaderboard(
+    request: Request,
+    platform: str | None = Query(None),
+    category: str | None = Query(None),
+    limit: int = Query(50, le=200),
+    db: Session = Depends(get_db),
+):
+    return response_cache.respond(
+        request,
+        ["leaderboard"],
+        lambda: _leaderboard(db, platform, category, limit),
+        list[LeaderboardEntry],
+    )
+
+
+def _leaderboard(db: Session, platform: str | None, category: str | None, limit: int) -> list[LeaderboardEntry]:
+    query = (
+        db.query(ChannelLatestAnalysis, Channel)
+        .join(Channel, Channel.id == ChannelLatestAnalysis.channel_id)
+    )
+    if platform:
+        query = query.filter(ChannelLatestAnalysis.platform == platform.lower())
+    if category:
+        query = query.filter(Channel.category.ilike(f"%{category}%"))
+    query = query.order_by(ChannelLatestAnalysis.overall_score.desc()).limit(limit)
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            channel_id=channel.id,
+            platform=channel.platform,
+            username=channel.username,
+            display_name=channel.display_name,
+            avatar_url=channel.avatar_url,
+            overall_score=analysis.overall_score,
+            label=get_score_label(analysis.overall_score),
+            analyzed_at=analysis.analyzed_at,
+        )
+        for rank, (analysis, channel) in enumerate(query.all(), 1)
+    ]
+
+
+@router.post("/channels/bulk", response_model=BulkChannelsResponse)
+def get_channels_bulk(body: BulkChannelsRequest, db: Session = Depends(get_db)):
+    keys = list(dict.fromkeys((c.platform.lower(), c.username.lower()) for c in body.channels))
+    channels, latest, stats = _bulk_lookup(db, keys)
+    results = []
+    missing = []
+    for platform, username in keys:
+        channel = channels.get((platform, username))
+        if channel is None:
+            missing.append(ChannelRef(platform=platform, username=username))
+            continue
+        results.append(_build_detail(channel, latest.get(channel.id), stats.get(channel.id)))
+    return BulkChannelsResponse(results=results, missing=missing)
+
+
+@router.get("/channels/{platform}/{username}", response_model=ChannelDetail)
+def get_channel(platform: str, username: str, request: Request, db: Session = Depends(get_db)):
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _channel_detail(db, platform, username),
+        ChannelDetail,
+    )
+
+
+def _channel_detail(db: Session, platform: str, username: str) -> ChannelDetail:
+    channel = (
+        db.query(Channel)
+        .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
+        .first()
+    )
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return _build_detail(channel, db.get(ChannelLatestAnalysis, channel.id), db.get(ChannelStats, channel.id))
+
+
+def _build_detail(channel: Channel, latest: ChannelLatestAnalysis | None, stats: ChannelStats | None) -> ChannelDetail:
+    result = ChannelDetail.model_validate(channel)
+    if latest:
+        result.latest_analysis = AnalysisSummary(
+            overall_score=latest.overall_score,
+            confidence=latest.confidence,
+            label=get_score_label(latest.overall_score),
+            analyzed_at=latest.analyzed_at,
+        )
+    if stats:
+        result.stats = ChannelStatsSummary.model_validate(stats)
+    return result
+
+
+@router.get(
+    "/channels/{platform}/{username}/snapshots",
+    response_model=list[SnapshotResponse] | SnapshotColumns,
+)
+def get_snapshots(
+    platform: str,
+    username: str,
+    hours: int = 24,
+    resolution: str | None = Query(None, pattern="^(raw|1h|1d)$"),
+    points: int | None = Query(None, ge=3, le=MAX_DOWNSAMPLED_POINTS),
+    format: str = Query("rows", pattern="^(rows|columns)$"),
+    db: Session = Depends(get_db),
+):
+    series, rolled_up = _snapshot_series(db, platform, username, hours, resolution, points)
+    if format == "columns":
+        columns = {
+            "id": [p[0] for p in series],
+            "collected_at": [p[1].isoformat() for p in series],
+            "viewer_count": [p[2] for p in series],
+            "chatter_count": [p[3] for p in series],
+            "category": [p[4] for p in series],
+        }
+        if rolled_up:
+            columns["viewer_min"] = [p[5] for p in series]
+            columns["viewer_max"] = [p[6] for p in series]
+            columns["sample_count"] = [p[7] for p in series]
+        return Response(json.dumps(columns, separators=(",", ":")), media_type="application/json")
+    return [
+        SnapshotResponse(
+            id=p[0],
+            collected_at=p[1],
+            viewer_count=p[2],
+            chatter_count=p[3],
+            category=p[4],
+            viewer_min=p[5],
+            viewer_max=p[6],
+            sample_count=p[7],
+        )
+        for p in series
+    ]
+
+
+@router.get("/analysis/{platform}/{username}/latest", response_model=AnalysisResponse)
+def get_latest_analysis(platform: str, username: str, request: Request, db: Session = Depends(get_db)):
+    return response_cache.respond(
+        request,
+        [channel_tag(platform, username)],
+        lambda: _latest_analysis(db, platform, username),
+        AnalysisResponse,
+    )
+
+
+def _latest_analysis(db: Session, platform: str, username: str) -> AnalysisResponse:
+    channel = (
+        db.query(Channel)
+        .filter(Channel.platform == platform.lower(), Channel.username == username.lower())
+        .first()
+    )
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    analysis = (
+        db.query(AnalysisResult)
+        .filter(AnalysisResult.channel_id == channel.id)
+        .order_by(AnalysisResult.analyzed_at.desc())
+        .first()
+    )
+    if not analysis:
+        raise HTTPException(status_code=404, detail="No analysis available for this channel")
+    return AnalysisResponse(
+        overall_score=analysis.overall_score,
+        confidence=analysis.confidence,
+        label=get_score_label(analysis.overall_score),
+        signal_scores=[
+            SignalScore(
+                name=s["name"],
+                score=s["score"],
+                weight=s["weight"],
+                confidence=s["confidence"],
+                details=(analysis.signal_details or {}).get(s["name"], {}),
+            )
+            for s in analysis.signal_scores or []
+        ],
+        data_points=analysis.data_points,
+        analyzed_at=analysis.analyzed_at,
+    )
+
+
+# Same middleware as app.main, so only the handlers differ
+legacy_app = FastAPI()
+legacy_app.add_middleware(MetricsMiddleware)
+legacy_app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.get_cors_origins(),
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+legacy_app.include_router(search_router)
+legacy_app.include_router(router)
@@ -0,0 +1,313 @@
+"""Timed ingest, analysis, API and tweet scenarios over synthetic history.
+
+Generates (or reuses, with ``--db``) a database from ``app.bench.synthetic``
+and times the pipeline end to end:
+
+- ``generate``: writing the synthetic history, rollups and stats
+- ``collect``: one ``collect_all_channels`` run through the real collectors
+  and ingest writer. Platform APIs are answered by ``StandInTransport``,
+  which continues each channel's synthetic curve, so only the network is
+  missing; ``--latency-ms`` adds a fixed delay per request. Chat is read
+  over websockets or long polls rather than HTTP, so each collector's
+  ``collect_chat_metrics`` returns synthetic metrics instead. Rate limiters
+  are lifted unless ``--paced`` is given.
+- ``analyze``: one ``analyze_all_channels`` run
+- ``api.<name>``: the ``app.bench.endpoints`` cases
+- ``poster``: repeated tweet cycles. Twitter credentials are cleared, so
+  every strategy selects its candidates and none queues a tweet.
+
+Results are printed as a table, or as one JSON document with ``--json`` or
+``--output``. Comparing against an earlier document fails the run when a
+scenario's rate dropped by more than the tolerance:
+
+    python -m app.bench.suite --channels 1000 --snapshots 2000 --output base.json
+    python -m app.bench.suite --channels 1000 --snapshots 2000 --baseline base.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.bench.endpoints import _cases, run_case
+from app.bench.synthetic import ChannelProfile, ViewerCurve, prepare, profiles
+from app.collectors.base import collector_client
+from app.collectors.registry import PLATFORMS, close_collectors, get_collector
+from app.config import settings
+from app.main import app
+from app.scheduler.jobs import analyze_all_channels, collect_all_channels
+from app.storage.writer import ingest_writer
+from app.twitter import poster
+from app.utils.live_hub import live_hub
+from app.utils.rate_limiter import RateLimiter
+
+SCENARIOS = ("generate", "collect", "analyze", "api", "poster")
+
+
+class StandInTransport(httpx.AsyncBaseTransport):
+    """Answers the platform API calls the collectors make from synthetic curves.
+
+    A channel's curve advances on its first request of a collection (Twitch
+    ``/streams``, the Kick channel, YouTube ``search``); follow-up requests
+    read the same sample. Every tenth channel is offline.
+    """
+
+    def __init__(self, channel_profiles: list[ChannelProfile], start: int, seed: int, latency: float = 0.0):
+        self.profiles = {p.username: p for p in channel_profiles}
+        self._usernames = {str(p.id): p.username for p in channel_profiles}
+        self.start = start
+        self.seed = seed
+        self.latency = latency
+        self.requests = 0
+        self._curves: dict[str, ViewerCurve] = {}
+        self._samples: dict[str, tuple[int, int]] = {}
+
+    def curve(self, username: str) -> ViewerCurve:
+        curve = self._curves.get(username)
+        if curve is None:
+            curve = self._curves[username] = ViewerCurve(self.profiles[username], self.seed, self.start)
+        return curve
+
+    def sample(self, username: str, advance: bool = False) -> tuple[int, int] | None:
+        profile = self.profiles.get(username)
+        if profile is None or profile.id % 10 == 0:
+            return None
+        if advance or username not in self._samples:
+            self._samples[username] = self.curve(username).next()
+        return self._samples[username]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        host, path, params = request.url.host, request.url.path, request.url.params
+        if host == "id.twitch.tv":
+            return httpx.Response(200, json={"access_token": "bench", "expires_in": 86400})
+        if host == "api.twitch.tv":
+            return httpx.Response(200, json=self._twitch(path, params))
+        if host == "kick.com":
+            body = self._kick(path.rsplit("/", 1)[-1])
+            return httpx.Response(200, json=body) if body else httpx.Response(404)
+        if host == "www.googleapis.com":
+            return httpx.Response(200, json=self._youtube(path.rsplit("/", 1)[-1], params))
+        return httpx.Response(404)
+
+    def _twitch(self, path: str, params) -> dict:
+        if path.endswith("/streams"):
+            username = params.get("user_login")
+            sample = self.sample(username, advance=True)
+            if sample is None:
+                return {"data": []}
+            return {"data": [{"viewer_count": sample[0], "game_name": self.profiles[username].category}]}
+        if path.endswith("/users"):
+            profile = self.profiles.get(params.get("login"))
+            if profile is None:
+                return {"data": []}
+            return {"data": [{"id": str(profile.id), "login": profile.username, "display_name": f"User {profile.id}"}]}
+        if path.endswith("/chat/chatters"):
+            username = self._usernames.get(params.get("broadcaster_id"))
+            sample = self.sample(username) if username else None
+            return {"data": [], "total": sample[1] if sample else 0}
+        return {"data": []}
+
+    def _kick(self, username: str) -> dict:
+        profile = self.profiles.get(username)
+        if profile is None:
+            return {}
+        sample = self.sample(username, advance=True)
+        livestream = None
+        if sample is not None:
+            livestream = {"viewer_count": sample[0], "categories": [{"name": profile.category}]}
+        return {"id": profile.id, "slug": username, "livestream": livestream, "chatroom": {"id": profile.id}}
+
+    def _youtube(self, endpoint: str, params) -> dict:
+        if endpoint == "search":
+            username = params.get("channelId")
+            if self.sample(username, advance=True) is None:
+                return {"items": []}
+            return {"items": [{"id": {"videoId": username}}]}
+        if endpoint == "videos":
+            sample = self.sample(params.get("id"))
+            if sample is None:
+                return {"items": []}
+            return {"items": [{"liveStreamingDetails": {"concurrentViewers": str(sample[0])}, "snippet": {"categoryId": "20"}}]}
+        return {"items": []}
+
+
+def _stand_in_chat(transport: StandInTransport):
+    async def collect_chat_metrics(username: str, duration_seconds: int = 60) -> dict:
+        now = datetime.utcnow()
+        sample = transport.sample(username)
+        metrics = transport.curve(username).chat_metrics(sample[1] if sample else 0)
+        metrics.update(window_start=now - timedelta(seconds=duration_seconds), window_end=now)
+        return metrics
+    return collect_chat_metrics
+
+
+async def _collect(transport: StandInTransport, paced: bool) -> None:
+    settings.TWITCH_CLIENT_ID = settings.TWITCH_CLIENT_ID or "bench"
+    settings.TWITCH_CLIENT_SECRET = settings.TWITCH_CLIENT_SECRET or "bench"
+    settings.YOUTUBE_API_KEY = settings.YOUTUBE_API_KEY or "bench"
+    for name in PLATFORMS:
+        collector = get_collector(name)
+        collector._client = collector_client(name, transport=transport, timeout=15.0)
+        collector.collect_chat_metrics = _stand_in_chat(transport)
+        if not paced:
+            collector._rate_limiter = RateLimiter(name, rate=1e9, capacity=10**9)
+        if hasattr(collector, "DAILY_QUOTA_LIMIT"):
+            collector.DAILY_QUOTA_LIMIT = sys.maxsize
+
+    live_hub.bind(asyncio.get_running_loop())
+    await ingest_writer.start()
+    try:
+        await collect_all_channels()
+    finally:
+        # Stopping flushes what is still queued, which is part of the run
+        await ingest_writer.stop()
+        await close_collectors()
+
+
+def _timed(scenario: str, unit: str, count: int, fn, *args) -> dict:
+    start = time.perf_counter()
+    fn(*args)
+    return _result(scenario, unit, count, time.perf_counter() - start)
+
+
+def _result(scenario: str, unit: str, count: int, elapsed: float) -> dict:
+    return {
+        "scenario": scenario,
+        "unit": unit,
+        "count": count,
+        "seconds": round(elapsed, 4),
+        "rate": round(count / elapsed, 2) if elapsed > 0 else None,
+        "ms_per_unit": round(elapsed * 1000 / count, 4) if count else None,
+    }
+
+
+def _repeat(seconds: float, fn) -> tuple[int, float]:
+    fn()
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, cwd=os.path.dirname(__file__),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(args: argparse.Namespace) -> dict:
+    wanted = set(args.only or SCENARIOS)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="streamoracle-bench-"), "bench.db")
+    results = []
+
+    start = time.perf_counter()
+    counts = prepare(db_path, args.channels, args.snapshots, args.seed)
+    if counts is not None and "generate" in wanted:
+        results.append(_result("generate", "snapshots", counts["viewer_snapshots"], time.perf_counter() - start))
+
+    if "collect" in wanted:
+        transport = StandInTransport(profiles(args.channels, args.seed), args.snapshots, args.seed, args.latency_ms / 1000)
+        results.append(_timed("collect", "channels", args.channels, asyncio.run, _collect(transport, args.paced)))
+
+    if "analyze" in wanted:
+        results.append(_timed("analyze", "channels", args.channels, asyncio.run, analyze_all_channels()))
+
+    if "api" in wanted:
+        client = TestClient(app)
+        for case in _cases():
+            measured = run_case(client, case, args.seconds, cached=False)
+            results.append(_result(f"api.{case.name}", "requests", measured["requests"], measured["seconds"]))
+
+    if "poster" in wanted:
+        settings.TWITTER_API_KEY = ""
+        count, elapsed = _repeat(args.seconds, poster._run_tweet_cycle)
+        results.append(_result("poster", "cycles", count, elapsed))
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "channels": args.channels,
+            "snapshots": args.snapshots,
+            "seed": args.seed,
+            "latency_ms": args.latency_ms,
+            "paced": args.paced,
+            "generated": counts is not None,
+            "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Scenarios whose rate fell more than ``tolerance`` below the baseline's."""
+    before = {r["scenario"]: r["rate"] for r in baseline.get("results", [])}
+    found = []
+    for result in report["results"]:
+        old, new = before.get(result["scenario"]), result["rate"]
+        if old and new is not None and new < old * (1 - tolerance):
+            found.append(f"{result['scenario']}: {new} {result['unit']}/s, baseline {old} ({new / old - 1:+.0%})")
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ingest, analysis, API and tweet scenarios")
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--snapshots", type=int, default=2000, help="snapshots per channel")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per API endpoint and on tweet cycles")
+    parser.add_argument("--db", default=None, help="reuse or create this SQLite file instead of a temp one")
+    parser.add_argument("--only", nargs="*", choices=SCENARIOS, help="scenarios to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to each stand-in API request")
+    parser.add_argument("--paced", action="store_true", help="keep the collectors' rate limits")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed rate drop against the baseline")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for r in report["results"]:
+            rate = "-" if r["rate"] is None else f"{r['rate']:.1f}"
+            print(f"{r['scenario']:<32} {rate:>12} {r['unit']}/s {r['seconds']:>9.3f} s")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Deterministic synthetic history for benchmarks.
+
+This is the one seeder for scratch databases: the benchmarks and the
+query-plan test (``tests/test_query_plans.py``) both use it. Channels are
+numbered from 1, named ``user<i>`` and spread over the platforms in turn,
+so paths such as ``/api/v1/channels/twitch/user3`` exist at any scale. An
+``artificial_ratio`` share of them shows artificial viewership
+indicators. The same ``seed`` always produces the same database.
+
+- Organic viewers follow a daily cycle with a mean-reverting random walk,
+  occasional raids that decay, and chatters at 8-20% of viewers.
+- Artificial channels add a flat, rounded plateau of non-chatting viewers
+  to a smaller organic audience. The plateau moves in abrupt steps every
+  few hundred snapshots, so chatter ratios are low.
+- Chat metrics are written every other snapshot. Chat on artificial
+  channels has lower entropy and more repeated messages.
+- Analysis history is written every sixth snapshot and compacted the way
+  ``app.storage.timeline.store_analysis`` stores it. Organic channels
+  score low and artificial channels high.
+
+Snapshots are 5 minutes apart and end at the current time.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert, text
+
+from app.database import SessionLocal, ensure_schema, set_sqlite_pragma
+from app.models import AnalysisResult, Channel, ChatMetric, ViewerSnapshot
+from app.storage import rollups, stats
+from app.storage.latest import rebuild_latest
+from app.storage.search import ensure_search_index, prefix_index
+from app.storage.stats import ensure_stats
+from app.storage.timeline import within_tolerance
+
+PLATFORMS = ("twitch", "youtube", "kick")
+CATEGORIES = ("Just Chatting", "Fortnite", "League of Legends", "Music", None)
+SIGNALS = ("cvr", "step_function", "chat_entropy", "follower_ratio", "growth", "benford", "temporal")
+
+SNAPSHOT_INTERVAL = timedelta(minutes=5)
+# Snapshots per day, the period of the organic daily cycle
+DAY_TICKS = 288
+# Channels inserted per transaction
+CHANNEL_BATCH = 50
+
+
+@dataclass(frozen=True)
+class ChannelProfile:
+    id: int
+    platform: str
+    username: str
+    category: str | None
+    base: int
+    artificial: bool
+    phase: float
+
+
+def profiles(channels: int, seed: int = 1, artificial_ratio: float = 0.2) -> list[ChannelProfile]:
+    rng = random.Random(seed)
+    result = []
+    for i in range(1, channels + 1):
+        # Audience sizes are heavy-tailed: most channels are small
+        base = int(min(50000, 20 * math.exp(rng.expovariate(0.6))))
+        result.append(ChannelProfile(
+            id=i,
+            platform=PLATFORMS[i % len(PLATFORMS)],
+            username=f"user{i}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            base=base,
+            artificial=rng.random() < artificial_ratio,
+            phase=rng.uniform(0, 2 * math.pi),
+        ))
+    return result
+
+
+class ViewerCurve:
+    """Successive ``(viewers, chatters)`` samples for one channel."""
+
+    def __init__(self, profile: ChannelProfile, seed: int = 1, start: int = 0):
+        self.profile = profile
+        self.rng = random.Random(seed * 1_000_003 + profile.id)
+        self.tick = start
+        self.walk = 1.0
+        self.raid = 0.0
+        organic = profile.base * (0.3 if profile.artificial else 1.0)
+        self.organic = max(organic, 5)
+        self.plateau = profile.base * 0.7 if profile.artificial else 0.0
+        self.next_step = self.rng.randint(100, 600)
+
+    def next(self) -> tuple[int, int]:
+        rng = self.rng
+        daily = 1 + 0.35 * math.sin(2 * math.pi * self.tick / DAY_TICKS + self.profile.phase)
+        self.walk = min(1.5, max(0.5, self.walk * math.exp(rng.gauss(0, 0.02)) + 0.05 * (1 - self.walk)))
+        if rng.random() < 0.002:
+            self.raid += self.organic * rng.uniform(0.3, 1.5)
+        self.raid *= 0.85
+        level = self.organic * daily * self.walk + self.raid
+        real = max(0, int(level + rng.gauss(0, math.sqrt(level))))
+
+        plateau = 0
+        if self.profile.artificial:
+            self.next_step -= 1
+            if self.next_step <= 0:
+                self.plateau = max(0.0, self.plateau * rng.uniform(0.5, 1.6))
+                self.next_step = rng.randint(100, 600)
+            plateau = int(round(self.plateau, -1))
+        self.tick += 1
+        return real + plateau, int(real * rng.uniform(0.08, 0.2))
+
+    def chat_metrics(self, chatters: int) -> dict:
+        rng = self.rng
+        artificial = self.profile.artificial
+        messages = max(1, int(chatters * rng.uniform(0.5, 2.0)))
+        return {
+            "message_count": messages,
+            "unique_chatters": max(1, min(messages, int(chatters * rng.uniform(0.4, 0.8)))),
+            "message_entropy": rng.uniform(2, 5) if artificial else rng.uniform(5, 8),
+            "unique_message_ratio": rng.uniform(0.2, 0.6) if artificial else rng.uniform(0.6, 0.95),
+            "avg_time_between_msgs": rng.uniform(0.1, 2.0),
+        }
+
+
+def _analysis_rows(profile: ChannelProfile, rng: random.Random, times: list[datetime]) -> list[dict]:
+    target = rng.uniform(55, 95) if profile.artificial else rng.uniform(5, 30)
+    score, confidence = target, rng.uniform(0.5, 0.95)
+    rows: list[dict] = []
+    for n, at in enumerate(times):
+        score = min(100.0, max(0.0, score + rng.gauss(0, 1.0) + 0.05 * (target - score)))
+        confidence = min(1.0, max(0.1, confidence + rng.gauss(0, 0.01)))
+        current = rows[-1] if rows else None
+        if current is not None and within_tolerance(score, confidence, current["overall_score"], current["confidence"]):
+            current["valid_until"] = at
+            current["data_points"] = n + 1
+            continue
+        rows.append({
+            "channel_id": profile.id,
+            "overall_score": score,
+            "confidence": confidence,
+            "signal_scores": [
+                {"name": name, "score": min(100.0, max(0.0, score + rng.gauss(0, 10))), "confidence": confidence, "weight": 1 / len(SIGNALS)}
+                for name in SIGNALS
+            ],
+            "signal_details": {},
+            "data_points": n + 1,
+            "analyzed_at": at,
+            "valid_until": at,
+        })
+    return rows
+
+
+def _channel_history(profile: ChannelProfile, snapshots: int, start: datetime, seed: int) -> tuple[list, list, list]:
+    curve = ViewerCurve(profile, seed)
+    snaps, chats, analysis_times = [], [], []
+    for n in range(snapshots):
+        ts = start + SNAPSHOT_INTERVAL * n
+        viewers, chatters = curve.next()
+        snaps.append({
+            "channel_id": profile.id,
+            "viewer_count": viewers,
+            "chatter_count": chatters,
+            "category": profile.category,
+            "collected_at": ts,
+        })
+        if n % 2 == 0:
+            metrics = curve.chat_metrics(chatters)
+            metrics.update(channel_id=profile.id, window_start=ts - timedelta(seconds=30), window_end=ts)
+            chats.append(metrics)
+        if n % 6 == 5:
+            analysis_times.append(ts)
+    return snaps, chats, _analysis_rows(profile, curve.rng, analysis_times)
+
+
+def generate(bind, channels: int, snapshots: int, seed: int = 1, artificial_ratio: float = 0.2) -> dict:
+    """Fill an empty database; returns row counts by table."""
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    start = now - SNAPSHOT_INTERVAL * snapshots
+    rng = random.Random(seed)
+    counts = {"channels": channels, "viewer_snapshots": 0, "chat_metrics": 0, "analysis_results": 0}
+    all_profiles = profiles(channels, seed, artificial_ratio)
+
+    for i in range(0, len(all_profiles), CHANNEL_BATCH):
+        batch = all_profiles[i:i + CHANNEL_BATCH]
+        with bind.begin() as conn:
+            conn.execute(insert(Channel), [
+                {
+                    "id": p.id,
+                    "platform": p.platform,
+                    "platform_id": str(p.id),
+                    "username": p.username,
+                    "display_name": f"User {p.id}",
+                    "category": p.category,
+                    "follower_count": int(p.base * rng.uniform(5, 50)),
+                    "is_live": True,
+                    "created_at": start,
+                    "last_collected": now,
+                }
+                for p in batch
+            ])
+            for profile in batch:
+                snaps, chats, analyses = _channel_history(profile, snapshots, start, seed)
+                if snaps:
+                    conn.execute(insert(ViewerSnapshot), snaps)
+                if chats:
+                    conn.execute(insert(ChatMetric), chats)
+                if analyses:
+                    conn.execute(insert(AnalysisResult), analyses)
+                counts["viewer_snapshots"] += len(snaps)
+                counts["chat_metrics"] += len(chats)
+                counts["analysis_results"] += len(analyses)
+
+    db = SessionLocal(bind=bind)
+    try:
+        rollups.rebuild(db)
+        rebuild_latest(db)
+        stats.rebuild(db)
+    finally:
+        db.close()
+    return counts
+
+
+def prepare(db_path: str, channels: int, snapshots: int, seed: int = 1) -> dict | None:
+    """Bind ``SessionLocal`` to a scratch SQLite file, generating history if it is empty.
+
+    Returns the generated row counts, or None when the file already had channels.
+    """
+    bind = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(bind, "connect", set_sqlite_pragma)
+    SessionLocal.configure(bind=bind)
+    ensure_schema(bind)
+    with bind.connect() as conn:
+        populated = conn.execute(text("SELECT count(*) FROM channels")).scalar()
+    counts = None if populated else generate(bind, channels, snapshots, seed)
+    db = SessionLocal()
+    try:
+        ensure_stats(db)
+        ensure_search_index(db)
+        prefix_index.load(db)
+    finally:
+        db.close()
+    return counts
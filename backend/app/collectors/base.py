@@ -1,5 +1,46 @@
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
 
+import httpx
+
+from app.utils.metrics import HTTP_LATENCY, HTTP_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class _MetricsTransport(httpx.AsyncBaseTransport):
+    """Counts and times every request a collector's client sends."""
+
+    def __init__(self, platform: str, transport: httpx.AsyncBaseTransport):
+        self.platform = platform
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            HTTP_REQUESTS.inc(platform=self.platform, outcome="error")
+            raise
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start, platform=self.platform)
+        HTTP_REQUESTS.inc(platform=self.platform, outcome=f"{response.status_code // 100}xx")
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def collector_client(platform: str, transport: httpx.AsyncBaseTransport | None = None, **kwargs) -> httpx.AsyncClient:
+    """An ``httpx.AsyncClient`` whose requests are recorded in the metrics.
+
+    ``transport`` replaces the network (benchmarks use a stand-in).
+    """
+    transport = _MetricsTransport(platform, transport or httpx.AsyncHTTPTransport())
+    return httpx.AsyncClient(transport=transport, **kwargs)
+
 
 class AbstractCollector(ABC):
     """Base class for platform-specific data collectors."""
@@ -9,6 +50,24 @@ class AbstractCollector(ABC):
         """Collect channel metadata (display name, avatar, followers, etc.)."""
         ...
 
+    async def collect_channel_infos(self, usernames: list[str]) -> dict[str, dict]:
+        """Collect metadata for many channels, keyed by requested username.
+
+        Channels that are not found or fail are left out. Platforms with
+        batch lookup endpoints override this; the default looks channels up
+        concurrently, paced by the collector's rate limiter.
+        """
+        results = await asyncio.gather(
+            *(self.collect_channel_info(u) for u in usernames), return_exceptions=True
+        )
+        infos = {}
+        for username, result in zip(usernames, results):
+            if isinstance(result, Exception):
+                logger.warning("Channel lookup failed for %s: %s", username, result)
+            elif result:
+                infos[username] = result
+        return infos
+
     @abstractmethod
     async def collect_viewers(self, username: str) -> dict:
         """Collect current viewer and chatter counts."""
@@ -18,3 +77,9 @@ class AbstractCollector(ABC):
     async def collect_chat_metrics(self, username: str, duration_seconds: int = 60) -> dict:
         """Collect chat messages and compute metrics over a time window."""
         ...
+
+    async def close(self):
+        """Close the collector's HTTP client, if it opened one."""
+        client = getattr(self, "_client", None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
@@ -9,7 +9,7 @@ from datetime import datetime
 import httpx
 import websockets
 
-from app.collectors.base import AbstractCollector
+from app.collectors.base import AbstractCollector, collector_client
 from app.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
@@ -22,12 +22,13 @@ class KickCollector(AbstractCollector):
     PUSHER_URL = "wss://ws-us2.pusher.com/app/32cbd69e4b950bf97679?protocol=7&client=js&version=7.4.0&flash=false"
 
     def __init__(self):
-        self._rate_limiter = RateLimiter(rate=2, capacity=5)
+        self._rate_limiter = RateLimiter("kick", rate=2, capacity=5)
         self._client: httpx.AsyncClient | None = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = collector_client(
+                "kick",
                 timeout=15.0,
                 headers={
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
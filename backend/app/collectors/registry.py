@@ -0,0 +1,32 @@
+"""One shared collector per platform.
+
+Collectors hold an HTTP client, an API token and a rate limiter, so every
+caller must share the same instance for the limits to mean anything.
+"""
+
+from importlib import import_module
+
+from app.collectors.base import AbstractCollector
+
+_COLLECTORS = {
+    "twitch": ("app.collectors.twitch", "TwitchCollector"),
+    "youtube": ("app.collectors.youtube", "YouTubeCollector"),
+    "kick": ("app.collectors.kick", "KickCollector"),
+}
+PLATFORMS = tuple(_COLLECTORS)
+
+_instances: dict[str, AbstractCollector] = {}
+
+
+def get_collector(platform: str) -> AbstractCollector | None:
+    collector = _instances.get(platform)
+    if collector is None and platform in _COLLECTORS:
+        module, name = _COLLECTORS[platform]
+        collector = _instances[platform] = getattr(import_module(module), name)()
+    return collector
+
+
+async def close_collectors():
+    for collector in list(_instances.values()):
+        await collector.close()
+    _instances.clear()
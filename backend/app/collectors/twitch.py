@@ -8,7 +8,7 @@ from datetime import datetime
 import httpx
 import websockets
 
-from app.collectors.base import AbstractCollector
+from app.collectors.base import AbstractCollector, collector_client
 from app.config import settings
 from app.utils.rate_limiter import RateLimiter
 
@@ -21,16 +21,18 @@ class TwitchCollector(AbstractCollector):
     HELIX_BASE = "https://api.twitch.tv/helix"
     TOKEN_URL = "https://id.twitch.tv/oauth2/token"
     IRC_URL = "wss://irc-ws.chat.twitch.tv:443"
+    # Most ids or logins Helix accepts in one /users or /channels request
+    HELIX_BATCH_SIZE = 100
 
     def __init__(self):
         self._access_token: str | None = None
         self._token_expires_at: float = 0
-        self._rate_limiter = RateLimiter(rate=800 / 60, capacity=800)
+        self._rate_limiter = RateLimiter("twitch", rate=800 / 60, capacity=800)
         self._client: httpx.AsyncClient | None = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=15.0)
+            self._client = collector_client("twitch", timeout=15.0)
         return self._client
 
     async def _ensure_token(self):
@@ -60,7 +62,7 @@ class TwitchCollector(AbstractCollector):
             "Authorization": f"Bearer {self._access_token}",
         }
 
-    async def _helix_get(self, endpoint: str, params: dict | None = None) -> dict:
+    async def _helix_get(self, endpoint: str, params: dict | list[tuple] | None = None) -> dict:
         await self._ensure_token()
         await self._rate_limiter.acquire()
         client = await self._get_client()
@@ -83,11 +85,38 @@ class TwitchCollector(AbstractCollector):
         )
         channel = channel_data["data"][0] if channel_data.get("data") else {}
 
+        return self._channel_info(user, channel, await self._follower_count(user["id"]))
+
+    async def collect_channel_infos(self, usernames: list[str]) -> dict[str, dict]:
+        """Look channels up 100 at a time; follower totals are per broadcaster."""
+        infos = {}
+        for i in range(0, len(usernames), self.HELIX_BATCH_SIZE):
+            chunk = usernames[i:i + self.HELIX_BATCH_SIZE]
+            users = (await self._helix_get("/users", [("login", u) for u in chunk])).get("data", [])
+            if not users:
+                continue
+            channel_data = await self._helix_get("/channels", [("broadcaster_id", u["id"]) for u in users])
+            channels = {c["broadcaster_id"]: c for c in channel_data.get("data", [])}
+            followers = await asyncio.gather(
+                *(self._follower_count(u["id"]) for u in users), return_exceptions=True
+            )
+            for user, follower_count in zip(users, followers):
+                if isinstance(follower_count, Exception):
+                    logger.warning("Failed to get follower count for %s: %s", user["login"], follower_count)
+                    follower_count = 0
+                infos[user["login"].lower()] = self._channel_info(
+                    user, channels.get(user["id"], {}), follower_count
+                )
+        return infos
+
+    async def _follower_count(self, broadcaster_id: str) -> int:
         follower_data = await self._helix_get(
-            "/channels/followers", {"broadcaster_id": user["id"], "first": 1}
+            "/channels/followers", {"broadcaster_id": broadcaster_id, "first": 1}
         )
-        follower_count = follower_data.get("total", 0)
+        return follower_data.get("total", 0)
 
+    @staticmethod
+    def _channel_info(user: dict, channel: dict, follower_count: int) -> dict:
         return {
             "platform": "twitch",
             "platform_id": user["id"],
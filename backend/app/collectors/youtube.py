@@ -7,8 +7,9 @@ from datetime import datetime
 
 import httpx
 
-from app.collectors.base import AbstractCollector
+from app.collectors.base import AbstractCollector, collector_client
 from app.config import settings
+from app.utils.metrics import YOUTUBE_QUOTA
 from app.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
@@ -19,16 +20,18 @@ class YouTubeCollector(AbstractCollector):
 
     API_BASE = "https://www.googleapis.com/youtube/v3"
     DAILY_QUOTA_LIMIT = 10000
+    # Most ids channels.list accepts in one request
+    CHANNELS_BATCH_SIZE = 50
 
     def __init__(self):
         self._quota_used = 0
         self._quota_reset_time = time.time() + 86400
-        self._rate_limiter = RateLimiter(rate=10, capacity=10)
+        self._rate_limiter = RateLimiter("youtube", rate=10, capacity=10)
         self._client: httpx.AsyncClient | None = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=15.0)
+            self._client = collector_client("youtube", timeout=15.0)
         return self._client
 
     def _check_quota(self, cost: int = 1):
@@ -38,6 +41,7 @@ class YouTubeCollector(AbstractCollector):
         if self._quota_used + cost > self.DAILY_QUOTA_LIMIT:
             raise RuntimeError("YouTube API daily quota limit reached")
         self._quota_used += cost
+        YOUTUBE_QUOTA.set(self._quota_used)
 
     async def _api_get(self, endpoint: str, params: dict) -> dict:
         if not settings.YOUTUBE_API_KEY:
@@ -51,15 +55,9 @@ class YouTubeCollector(AbstractCollector):
         return resp.json()
 
     async def collect_channel_info(self, username: str) -> dict:
-        self._check_quota(100)  # search.list costs 100 units
-        search_data = await self._api_get(
-            "search",
-            {"part": "snippet", "q": username, "type": "channel", "maxResults": 1},
-        )
-        items = search_data.get("items", [])
-        if not items:
+        channel_id = await self._search_channel_id(username)
+        if not channel_id:
             return {}
-        channel_id = items[0]["snippet"]["channelId"]
 
         self._check_quota(1)
         channel_data = await self._api_get(
@@ -69,13 +67,50 @@ class YouTubeCollector(AbstractCollector):
         channels = channel_data.get("items", [])
         if not channels:
             return {}
-        ch = channels[0]
+        return self._channel_info(username, channels[0])
+
+    async def collect_channel_infos(self, usernames: list[str]) -> dict[str, dict]:
+        """Resolve each channel by search, then fetch details 50 ids at a time."""
+        ids = {}
+        for username in usernames:
+            try:
+                channel_id = await self._search_channel_id(username)
+            except Exception as e:
+                logger.warning("Channel lookup failed for %s: %s", username, e)
+                continue
+            if channel_id:
+                ids[channel_id] = username
+
+        infos = {}
+        channel_ids = list(ids)
+        for i in range(0, len(channel_ids), self.CHANNELS_BATCH_SIZE):
+            self._check_quota(1)
+            channel_data = await self._api_get(
+                "channels",
+                {"part": "snippet,statistics", "id": ",".join(channel_ids[i:i + self.CHANNELS_BATCH_SIZE])},
+            )
+            for ch in channel_data.get("items", []):
+                username = ids.get(ch.get("id"))
+                if username is not None:
+                    infos[username] = self._channel_info(username, ch)
+        return infos
+
+    async def _search_channel_id(self, username: str) -> str | None:
+        self._check_quota(100)  # search.list costs 100 units
+        search_data = await self._api_get(
+            "search",
+            {"part": "snippet", "q": username, "type": "channel", "maxResults": 1},
+        )
+        items = search_data.get("items", [])
+        return items[0]["snippet"]["channelId"] if items else None
+
+    @staticmethod
+    def _channel_info(username: str, ch: dict) -> dict:
         snippet = ch.get("snippet", {})
         stats = ch.get("statistics", {})
-
         return {
             "platform": "youtube",
-            "platform_id": channel_id,
+            "platform_id": ch["id"],
             "username": username,
             "display_name": snippet.get("title", username),
             "avatar_url": snippet.get("thumbnails", {}).get("default", {}).get("url"),
@@ -14,6 +14,64 @@ class Settings(BaseSettings):
     COLLECT_INTERVAL_MINUTES: int = 5
     ANALYZE_INTERVAL_MINUTES: int = 30
 
+    # Database connections for API request threads, plus dedicated threads
+    # for scheduler/background database work
+    DB_POOL_SIZE: int = 10
+    DB_WORKER_THREADS: int = 4
+
+    # Memoized signal results (leave the path empty to keep them in memory only)
+    SIGNAL_MEMO_SIZE: int = 20000
+    SIGNAL_MEMO_PATH: str = ""
+
+    # Raw viewer_snapshots older than this are pruned daily; hourly/daily
+    # rollups keep the long-range history (0 keeps raw rows forever)
+    SNAPSHOT_RETENTION_DAYS: int = 0
+    # Raw snapshots older than this move to the columnar archive (0 disables)
+    ARCHIVE_AFTER_DAYS: int = 0
+    ARCHIVE_DIR: str = "./data/archive"
+
+    # Collected snapshots and chat metrics are buffered and written in bulk
+    # once INGEST_BATCH_SIZE records or INGEST_FLUSH_SECONDS have accumulated;
+    # collectors wait when INGEST_QUEUE_SIZE records are pending
+    INGEST_BATCH_SIZE: int = 500
+    INGEST_FLUSH_SECONDS: float = 2.0
+    INGEST_QUEUE_SIZE: int = 5000
+
+    # Ingest-time anomaly detectors, run on live snapshots of channels with
+    # at least ANOMALY_MIN_VIEWERS: a jump of ANOMALY_SPIKE_PERCENT over the
+    # previous snapshot, ANOMALY_ZSCORE_THRESHOLD standard deviations from a
+    # rolling baseline spanning ANOMALY_ZSCORE_WINDOW snapshots, or the same
+    # count ANOMALY_FLAT_SNAPSHOTS times in a row
+    ANOMALY_MIN_VIEWERS: int = 100
+    ANOMALY_SPIKE_PERCENT: float = 50.0
+    ANOMALY_ZSCORE_THRESHOLD: float = 4.0
+    ANOMALY_ZSCORE_WINDOW: int = 24
+    ANOMALY_FLAT_SNAPSHOTS: int = 6
+
+    # A new analysis_results row is stored only when the score moves more
+    # than ANALYSIS_SCORE_TOLERANCE points or the confidence more than
+    # ANALYSIS_CONFIDENCE_TOLERANCE from the channel's current row; otherwise
+    # that row's validity interval is extended. Negative values store every run.
+    ANALYSIS_SCORE_TOLERANCE: float = 1.0
+    ANALYSIS_CONFIDENCE_TOLERANCE: float = 0.05
+
+    # Newly tracked channels are collected by TRACK_WORKERS tasks, each
+    # looking up to TRACK_BATCH_SIZE channels at once; track requests are
+    # refused while TRACK_QUEUE_SIZE channels are waiting
+    TRACK_WORKERS: int = 4
+    TRACK_BATCH_SIZE: int = 100
+    TRACK_QUEUE_SIZE: int = 2000
+
+    # Cached API responses, invalidated by writes; the TTL only bounds how
+    # long an entry can outlive a missed invalidation. Leave the URL empty
+    # for an in-process cache or set a redis:// URL to share it.
+    RESPONSE_CACHE_SIZE: int = 1000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_URL: str = ""
+
+    # Pending live-feed messages per subscriber before the oldest is dropped
+    LIVE_QUEUE_SIZE: int = 256
+
     # Twitter/X API credentials (leave empty to disable tweeting)
     TWITTER_API_KEY: str = ""
     TWITTER_API_SECRET: str = ""
@@ -21,6 +79,12 @@ class Settings(BaseSettings):
     TWITTER_ACCESS_TOKEN_SECRET: str = ""
     TWITTER_BEARER_TOKEN: str = ""
     TWEET_INTERVAL_HOURS: int = 4
+    # Queued tweets are retried with exponential backoff starting at
+    # TWEET_RETRY_SECONDS, up to TWEET_MAX_ATTEMPTS times; at most
+    # TWEET_DAILY_LIMIT are posted in any 24 hours
+    TWEET_MAX_ATTEMPTS: int = 5
+    TWEET_RETRY_SECONDS: int = 60
+    TWEET_DAILY_LIMIT: int = 50
     SITE_URL: str = "https://frontend-production-bdacc.up.railway.app"
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
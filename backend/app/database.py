@@ -1,10 +1,17 @@
+import asyncio
+import functools
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.config import settings
+from app.utils.metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
 
 # Ensure SQLite data directory exists
 _db_url = settings.DATABASE_URL
@@ -12,10 +19,16 @@ if _db_url.startswith("sqlite"):
     _db_path = _db_url.replace("sqlite:///", "")
     Path(_db_path).parent.mkdir(parents=True, exist_ok=True)
 
+# API handlers run in Starlette's threadpool (capped at DB_POOL_SIZE in
+# app.main) and background jobs in _db_executor, so the connection pool is
+# sized for both and no caller ever waits on the event loop.
 engine = create_engine(
     _db_url,
     connect_args={"check_same_thread": False} if _db_url.startswith("sqlite") else {},
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_WORKER_THREADS,
 )
+instrument_engine(engine)
 
 
 @event.listens_for(engine, "connect")
@@ -30,9 +43,57 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def _index_names(conn, inspector, table_name: str) -> set[str]:
+    if conn.dialect.name == "sqlite":
+        # SQLite reflection skips expression indexes; read every name directly
+        rows = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table_name},
+        )
+        return {r[0] for r in rows}
+    return {i["name"] for i in inspector.get_indexes(table_name)}
+
+
+def ensure_schema(bind=None):
+    """Create missing tables, then add indexes and nullable columns that
+    models gained after their table was first created (``create_all`` only
+    builds indexes together with a new table)."""
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} in place")
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+            indexes = _index_names(conn, inspector, table.name)
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    logger.info("Created index %s on %s", index.name, table.name)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+_db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_WORKER_THREADS, thread_name_prefix="db"
+)
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run blocking database work from async code on the bounded DB executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(fn, *args, **kwargs))
@@ -1,11 +1,13 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import SessionLocal, ensure_schema
 from app.api.health import router as health_router
 from app.api.search import router as search_router
 from app.api.channels import router as channels_router
@@ -13,7 +15,20 @@ from app.api.analysis import router as analysis_router
 from app.api.leaderboard import router as leaderboard_router
 from app.api.methodology import router as methodology_router
 from app.api.tweets import router as tweets_router
+from app.api.live import router as live_router
+from app.api.export import router as export_router
+from app.api.anomalies import router as anomalies_router
+from app.collectors.registry import close_collectors
 from app.scheduler.jobs import start_scheduler, stop_scheduler
+from app.scheduler.tracking import track_queue
+from app.storage.latest import ensure_latest
+from app.storage.rollups import ensure_rollups
+from app.storage.stats import ensure_stats
+from app.storage.search import ensure_search_index, prefix_index
+from app.storage.writer import ingest_writer
+from app.twitter.outbox import tweet_dispatcher
+from app.utils.live_hub import live_hub
+from app.utils.metrics import MetricsMiddleware
 import app.models.tweet_log  # noqa: F401 — ensure table creation
 
 logging.basicConfig(level=logging.INFO)
@@ -23,13 +38,32 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Sync route handlers run in this threadpool; keep it within the DB pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.DB_POOL_SIZE
     logger.info("Creating database tables")
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        ensure_rollups(db)
+        ensure_latest(db)
+        ensure_stats(db)
+        ensure_search_index(db)
+        prefix_index.load(db)
+    finally:
+        db.close()
+    live_hub.bind(asyncio.get_running_loop())
+    await ingest_writer.start()
+    await track_queue.start()
+    await tweet_dispatcher.start()
     start_scheduler()
     logger.info("StreamOracle API started")
     yield
     # Shutdown
     stop_scheduler()
+    await tweet_dispatcher.stop()
+    await track_queue.stop()
+    await ingest_writer.stop()
+    await close_collectors()
     logger.info("StreamOracle API stopped")
 
 
@@ -39,6 +73,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.get_cors_origins(),
@@ -54,3 +89,6 @@ app.include_router(analysis_router)
 app.include_router(leaderboard_router)
 app.include_router(methodology_router)
 app.include_router(tweets_router)
+app.include_router(live_router)
+app.include_router(export_router)
+app.include_router(anomalies_router)
@@ -2,5 +2,18 @@ from app.models.channel import Channel
 from app.models.snapshot import ViewerSnapshot
 from app.models.chat_metric import ChatMetric
 from app.models.analysis_result import AnalysisResult
+from app.models.snapshot_rollup import SnapshotRollup
+from app.models.latest_analysis import ChannelLatestAnalysis
+from app.models.channel_stats import ChannelStats
+from app.models.anomaly import Anomaly
 
-__all__ = ["Channel", "ViewerSnapshot", "ChatMetric", "AnalysisResult"]
+__all__ = [
+    "Channel",
+    "ViewerSnapshot",
+    "ChatMetric",
+    "AnalysisResult",
+    "SnapshotRollup",
+    "ChannelLatestAnalysis",
+    "ChannelStats",
+    "Anomaly",
+]
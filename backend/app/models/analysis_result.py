@@ -16,7 +16,12 @@ class AnalysisResult(Base):
     signal_details = Column(JSON, nullable=True)
     data_points = Column(Integer, default=0)
     analyzed_at = Column(DateTime, default=datetime.utcnow)
+    # Last run that reproduced this result within tolerance; the row stands
+    # for every run in [analyzed_at, valid_until] (NULL for rows stored
+    # before results were compacted)
+    valid_until = Column(DateTime, nullable=True)
 
     __table_args__ = (
         Index("ix_analysis_overall_score", overall_score.desc()),
+        Index("ix_analysis_channel_analyzed", "channel_id", "analyzed_at"),
     )
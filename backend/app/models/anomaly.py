@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+
+from app.database import Base
+
+
+class Anomaly(Base):
+    """A viewer anomaly flagged by the ingest-time detectors."""
+
+    __tablename__ = "anomalies"
+
+    id = Column(Integer, primary_key=True)
+    channel_id = Column(Integer, ForeignKey("channels.id"), nullable=False)
+    kind = Column(String, nullable=False)  # spike, zscore, flatline
+    severity = Column(String, nullable=False)  # low, medium, high
+    viewer_count = Column(Integer, nullable=False)
+    # What the count was measured against: the previous snapshot (spike),
+    # the rolling mean (zscore) or the repeated count itself (flatline)
+    baseline = Column(Float, nullable=False)
+    # Percent jump, standard deviations, or snapshots in the flat run
+    magnitude = Column(Float, nullable=False)
+    detected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_anomaly_channel_detected", "channel_id", "detected_at"),
+        Index("ix_anomaly_detected", "detected_at"),
+    )
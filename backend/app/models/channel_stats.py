@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
+
+from app.database import Base
+
+
+class ChannelStats(Base):
+    """Running per-channel statistics, maintained by ingest and analysis."""
+
+    __tablename__ = "channel_stats"
+
+    channel_id = Column(Integer, ForeignKey("channels.id"), primary_key=True)
+    snapshot_count = Column(Integer, nullable=False, default=0)
+    viewer_sum = Column(Integer, nullable=False, default=0)
+    peak_viewers = Column(Integer, nullable=False, default=0)
+    last_viewers = Column(Integer, nullable=True)
+    previous_viewers = Column(Integer, nullable=True)
+    last_collected_at = Column(DateTime, nullable=True)
+    last_live_at = Column(DateTime, nullable=True)
+    last_score = Column(Float, nullable=True)
+    previous_score = Column(Float, nullable=True)
+    last_analyzed_at = Column(DateTime, nullable=True)
+    # Anomaly detector state (see app.storage.anomalies)
+    viewer_mean = Column(Float, nullable=True)
+    viewer_variance = Column(Float, nullable=True)
+    baseline_samples = Column(Integer, nullable=True)
+    flat_run = Column(Integer, nullable=True)
+
+    @property
+    def avg_viewers(self) -> float:
+        return self.viewer_sum / self.snapshot_count if self.snapshot_count else 0.0
+
+
+# Ordering the tweet poster selects score changes by; indexed so the best
+# candidate is found without reading every channel's stats
+score_delta = func.abs(ChannelStats.last_score - ChannelStats.previous_score)
+
+Index("ix_stats_score_delta", score_delta.desc())
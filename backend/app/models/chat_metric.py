@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 
 from app.database import Base
 
@@ -15,3 +15,7 @@ class ChatMetric(Base):
     message_entropy = Column(Float, default=0.0)
     unique_message_ratio = Column(Float, default=0.0)
     avg_time_between_msgs = Column(Float, default=0.0)
+
+    __table_args__ = (
+        Index("ix_chat_channel_window_end", "channel_id", "window_end"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+
+from app.database import Base
+
+
+class ChannelLatestAnalysis(Base):
+    """Latest analysis per channel, kept current by AnalysisEngine on write."""
+
+    __tablename__ = "channel_latest_analysis"
+
+    channel_id = Column(Integer, ForeignKey("channels.id"), primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analysis_results.id"), nullable=False)
+    platform = Column(String, nullable=False)
+    # Copied from the channel so the leaderboard filters without a join
+    category = Column(String, nullable=True)
+    overall_score = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    analyzed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_latest_overall_score", overall_score.desc()),
+        Index("ix_latest_platform_score", "platform", overall_score.desc()),
+        Index("ix_latest_category_score", "category", overall_score.desc()),
+    )
@@ -17,4 +17,5 @@ class ViewerSnapshot(Base):
 
     __table_args__ = (
         Index("ix_snapshot_channel_collected", "channel_id", "collected_at"),
+        Index("ix_snapshot_collected", "collected_at"),
     )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+
+from app.database import Base
+
+
+class SnapshotRollup(Base):
+    """Hourly/daily aggregate of viewer_snapshots for one channel."""
+
+    __tablename__ = "viewer_snapshot_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(Integer, ForeignKey("channels.id"), nullable=False)
+    resolution = Column(Integer, nullable=False)  # bucket width in seconds
+    bucket_start = Column(DateTime, nullable=False)
+    sample_count = Column(Integer, nullable=False, default=0)
+    viewer_min = Column(Integer, nullable=False)
+    viewer_max = Column(Integer, nullable=False)
+    viewer_sum = Column(Integer, nullable=False)
+    viewer_last = Column(Integer, nullable=False)
+    chatter_min = Column(Integer, nullable=False)
+    chatter_max = Column(Integer, nullable=False)
+    chatter_sum = Column(Integer, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("channel_id", "resolution", "bucket_start", name="uq_rollup_channel_bucket"),
+    )
+
+    @property
+    def viewer_mean(self) -> float:
+        return self.viewer_sum / self.sample_count if self.sample_count else 0.0
+
+    @property
+    def chatter_mean(self) -> float:
+        return self.chatter_sum / self.sample_count if self.sample_count else 0.0
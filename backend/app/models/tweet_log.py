@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 
 from app.database import Base
 
@@ -14,3 +14,8 @@ class TweetLog(Base):
     tweet_text = Column(String, nullable=False)
     twitter_tweet_id = Column(String, nullable=True)
     tweeted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_tweet_type_tweeted", "tweet_type", "tweeted_at"),
+        Index("ix_tweet_channel_type_tweeted", "channel_id", "tweet_type", "tweeted_at"),
+    )
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+
+from app.database import Base
+
+
+class TweetOutbox(Base):
+    """A tweet waiting for, or done with, the dispatcher (app.twitter.outbox)."""
+
+    __tablename__ = "tweet_outbox"
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String, nullable=False, unique=True)
+    channel_id = Column(Integer, ForeignKey("channels.id"), nullable=True)
+    tweet_type = Column(String, nullable=False)
+    tweet_text = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    twitter_tweet_id = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_outbox_channel_type_status", "channel_id", "tweet_type", "status"),
+    )
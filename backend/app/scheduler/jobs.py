@@ -1,175 +1,154 @@
 import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.config import settings
-from app.database import SessionLocal
+from app.database import SessionLocal, run_db
 from app.models.channel import Channel
-from app.models.snapshot import ViewerSnapshot
-from app.models.chat_metric import ChatMetric
 from app.analysis.engine import AnalysisEngine
+from app.analysis.memo import SignalMemo
+from app.analysis.raids import build_raid_index
+from app.collectors.registry import get_collector
+from app.storage import anomalies, archive, rollups
+from app.storage.writer import Collection, ingest_writer
 from app.twitter.poster import post_interesting_tweet
+from app.utils.metrics import BACKLOG, JOB_CHANNELS, JOB_DURATION
 
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
-engine = AnalysisEngine()
+engine = AnalysisEngine(
+    memo=SignalMemo(settings.SIGNAL_MEMO_SIZE, settings.SIGNAL_MEMO_PATH or None),
+)
 
+# Channels whose analysis inputs are loaded together in one query plan
+ANALYSIS_BATCH_SIZE = 200
 
-def _get_collector(platform: str):
-    if platform == "twitch":
-        from app.collectors.twitch import TwitchCollector
-        return TwitchCollector()
-    elif platform == "youtube":
-        from app.collectors.youtube import YouTubeCollector
-        return YouTubeCollector()
-    elif platform == "kick":
-        from app.collectors.kick import KickCollector
-        return KickCollector()
-    return None
+
+def _load_channels() -> list[tuple[int, str, str, bool]]:
+    db = SessionLocal()
+    try:
+        return [
+            (c.id, c.platform, c.username, bool(c.is_live))
+            for c in db.query(Channel.id, Channel.platform, Channel.username, Channel.is_live)
+        ]
+    finally:
+        db.close()
 
 
 async def collect_all_channels():
     """Collect viewer data from all tracked channels."""
     logger.info("Starting scheduled collection run")
+    with JOB_DURATION.time(job="collect"):
+        channels = await run_db(_load_channels)
+        for i, (channel_id, platform, username, is_live) in enumerate(channels):
+            BACKLOG.set(len(channels) - i, queue="collect")
+            await _collect_channel(channel_id, platform, username, is_live)
+        BACKLOG.set(0, queue="collect")
+    logger.info("Scheduled collection run complete")
+
+
+async def _collect_channel(channel_id: int, platform: str, username: str, is_live: bool):
+    collector = get_collector(platform)
+    if not collector:
+        return
+    try:
+        # Collect viewer snapshot
+        viewers = await collector.collect_viewers(username)
+        if viewers:
+            is_live = viewers.get("is_live", False)
+
+        # Collect chat metrics if live
+        metrics = None
+        if is_live:
+            metrics = await collector.collect_chat_metrics(username, duration_seconds=30)
+
+        await ingest_writer.submit(Collection(channel_id, viewers, metrics))
+        JOB_CHANNELS.inc(job="collect", platform=platform, outcome="ok")
+        logger.info("Collected data for %s/%s", platform, username)
+    except Exception as e:
+        JOB_CHANNELS.inc(job="collect", platform=platform, outcome="error")
+        logger.error("Collection failed for %s/%s: %s", platform, username, e)
+
+
+async def _analyze_channels(db, channels: list, data: dict):
+    for channel in channels:
+        snapshots, chat_metrics = data[channel.id]
+        if len(snapshots) < 3:
+            JOB_CHANNELS.inc(job="analyze", platform=channel.platform, outcome="skipped")
+            continue
+
+        try:
+            await engine.analyze(channel, snapshots, chat_metrics, db)
+            JOB_CHANNELS.inc(job="analyze", platform=channel.platform, outcome="ok")
+            logger.info("Analyzed %s/%s", channel.platform, channel.username)
+        except Exception as e:
+            JOB_CHANNELS.inc(job="analyze", platform=channel.platform, outcome="error")
+            logger.error(
+                "Analysis failed for %s/%s: %s",
+                channel.platform,
+                channel.username,
+                e,
+            )
+            db.rollback()
+
+
+def _run_analysis():
     db = SessionLocal()
     try:
+        # Raid matching covers the same span as the analysis snapshot window
+        since = datetime.utcnow() - timedelta(minutes=settings.COLLECT_INTERVAL_MINUTES * engine.plan.snapshot_limit)
+        engine.set_raid_index(build_raid_index(db, since))
+
         channels = db.query(Channel).all()
-        for channel in channels:
-            collector = _get_collector(channel.platform)
-            if not collector:
-                continue
-            try:
-                # Collect viewer snapshot
-                viewers = await collector.collect_viewers(channel.username)
-                if viewers:
-                    channel.is_live = viewers.get("is_live", False)
-                    snapshot = ViewerSnapshot(
-                        channel_id=channel.id,
-                        viewer_count=viewers.get("viewer_count", 0),
-                        chatter_count=viewers.get("chatter_count", 0),
-                        category=viewers.get("category"),
-                    )
-                    db.add(snapshot)
-
-                # Collect chat metrics if live
-                if channel.is_live:
-                    metrics = await collector.collect_chat_metrics(
-                        channel.username, duration_seconds=30
-                    )
-                    if metrics and metrics.get("message_count", 0) > 0:
-                        chat_metric = ChatMetric(
-                            channel_id=channel.id,
-                            window_start=metrics["window_start"],
-                            window_end=metrics["window_end"],
-                            message_count=metrics["message_count"],
-                            unique_chatters=metrics["unique_chatters"],
-                            message_entropy=metrics["message_entropy"],
-                            unique_message_ratio=metrics["unique_message_ratio"],
-                            avg_time_between_msgs=metrics["avg_time_between_msgs"],
-                        )
-                        db.add(chat_metric)
-
-                channel.last_collected = datetime.utcnow()
-                db.commit()
-                logger.info("Collected data for %s/%s", channel.platform, channel.username)
-            except Exception as e:
-                logger.error(
-                    "Collection failed for %s/%s: %s",
-                    channel.platform,
-                    channel.username,
-                    e,
-                )
-                db.rollback()
+        for i in range(0, len(channels), ANALYSIS_BATCH_SIZE):
+            BACKLOG.set(len(channels) - i, queue="analyze")
+            batch = channels[i:i + ANALYSIS_BATCH_SIZE]
+            data = engine.load_batch(db, [c.id for c in batch])
+            # Signals are CPU-bound coroutines; drive them on this worker thread
+            asyncio.run(_analyze_channels(db, batch, data))
+        engine.memo.save()
     finally:
+        BACKLOG.set(0, queue="analyze")
         db.close()
-    logger.info("Scheduled collection run complete")
 
 
 async def analyze_all_channels():
     """Run analysis on channels with enough data."""
     logger.info("Starting scheduled analysis run")
-    db = SessionLocal()
-    try:
-        channels = db.query(Channel).all()
-        for channel in channels:
-            snapshots = (
-                db.query(ViewerSnapshot)
-                .filter(ViewerSnapshot.channel_id == channel.id)
-                .order_by(ViewerSnapshot.collected_at.desc())
-                .limit(500)
-                .all()
-            )
-            if len(snapshots) < 3:
-                continue
-
-            chat_metrics = (
-                db.query(ChatMetric)
-                .filter(ChatMetric.channel_id == channel.id)
-                .order_by(ChatMetric.window_end.desc())
-                .limit(100)
-                .all()
-            )
-
-            try:
-                await engine.analyze(channel, snapshots, chat_metrics, db)
-                logger.info("Analyzed %s/%s", channel.platform, channel.username)
-            except Exception as e:
-                logger.error(
-                    "Analysis failed for %s/%s: %s",
-                    channel.platform,
-                    channel.username,
-                    e,
-                )
-                db.rollback()
-    finally:
-        db.close()
-    logger.info("Scheduled analysis run complete")
+    with JOB_DURATION.time(job="analyze"):
+        await run_db(_run_analysis)
+    logger.info("Scheduled analysis run complete (signal memo: %s)", engine.memo.stats())
 
 
-async def collect_channel_on_demand(platform: str, username: str):
-    """Trigger immediate collection for a newly tracked channel."""
+def _prune_snapshots():
     db = SessionLocal()
     try:
-        collector = _get_collector(platform)
-        if not collector:
-            return
-        channel = (
-            db.query(Channel)
-            .filter(Channel.platform == platform, Channel.username == username)
-            .first()
-        )
-        if not channel:
-            return
-
-        info = await collector.collect_channel_info(username)
-        if info:
-            for key, value in info.items():
-                if hasattr(channel, key) and value is not None:
-                    setattr(channel, key, value)
-
-        viewers = await collector.collect_viewers(username)
-        if viewers:
-            channel.is_live = viewers.get("is_live", False)
-            snapshot = ViewerSnapshot(
-                channel_id=channel.id,
-                viewer_count=viewers.get("viewer_count", 0),
-                chatter_count=viewers.get("chatter_count", 0),
-                category=viewers.get("category"),
+        if settings.ARCHIVE_AFTER_DAYS > 0:
+            archive.archive_snapshots(
+                db, datetime.utcnow() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
             )
-            db.add(snapshot)
-
-        channel.last_collected = datetime.utcnow()
-        db.commit()
+        rollups.prune_raw_snapshots(db, settings.SNAPSHOT_RETENTION_DAYS)
     except Exception as e:
-        logger.error("On-demand collection failed for %s/%s: %s", platform, username, e)
+        logger.error("Snapshot pruning failed: %s", e)
+        db.rollback()
+    try:
+        anomalies.prune(db)
+    except Exception as e:
+        logger.error("Anomaly pruning failed: %s", e)
         db.rollback()
     finally:
         db.close()
 
 
+async def prune_snapshots():
+    """Apply the archive, raw snapshot and anomaly retention policies."""
+    with JOB_DURATION.time(job="prune"):
+        await run_db(_prune_snapshots)
+
+
 def start_scheduler():
     """Start the APScheduler with configured intervals."""
     scheduler.add_job(
@@ -186,6 +165,14 @@ def start_scheduler():
         id="analyze_all",
         replace_existing=True,
     )
+    # Always scheduled: anomalies are pruned even when snapshots are kept
+    scheduler.add_job(
+        prune_snapshots,
+        "interval",
+        hours=24,
+        id="prune_snapshots",
+        replace_existing=True,
+    )
     scheduler.add_job(
         post_interesting_tweet,
         "interval",
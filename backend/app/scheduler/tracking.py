@@ -0,0 +1,192 @@
+"""On-demand collection for newly tracked channels.
+
+Track requests put ``(platform, username)`` on a bounded queue drained by
+``TRACK_WORKERS`` tasks. A channel that is already queued or being
+collected is not queued again, so concurrent requests to track it share
+one set of platform calls. Each worker takes up to ``TRACK_BATCH_SIZE``
+queued channels at once, looks them up per platform through the shared
+collectors (batched where the platform API allows it) and hands the
+results to the ingest writer.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+
+from app.collectors.registry import get_collector
+from app.config import settings
+from app.database import SessionLocal, run_db
+from app.models.channel import Channel
+from app.schemas.channel import ChannelResponse
+from app.storage.writer import Collection, ingest_writer
+from app.utils.metrics import BACKLOG, registry
+
+logger = logging.getLogger(__name__)
+
+# TrackQueue.submit outcomes
+QUEUED = "queued"
+PENDING = "pending"
+REJECTED = "rejected"
+
+
+def ensure_channels(keys: list[tuple[str, str]]) -> list[ChannelResponse]:
+    """Channel records for ``keys``, creating placeholders for new ones.
+
+    Collection fills in the placeholder's details. Returned in ``keys`` order.
+    """
+    db = SessionLocal()
+    try:
+        for attempt in range(2):
+            existing = {
+                (c.platform, c.username)
+                for c in db.query(Channel.platform, Channel.username)
+                .filter(tuple_(Channel.platform, Channel.username).in_(keys))
+            }
+            db.add_all(
+                Channel(platform=platform, platform_id="", username=username, display_name=username)
+                for platform, username in keys
+                if (platform, username) not in existing
+            )
+            try:
+                db.commit()
+                break
+            except IntegrityError:
+                # Another request created some of them first
+                db.rollback()
+                if attempt:
+                    raise
+
+        channels = {
+            (c.platform, c.username): c
+            for c in db.query(Channel).filter(tuple_(Channel.platform, Channel.username).in_(keys))
+        }
+        return [ChannelResponse.model_validate(channels[key]) for key in keys]
+    finally:
+        db.close()
+
+
+def _channel_ids(platform: str, usernames: list[str]) -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        return {
+            username: id_
+            for id_, username in db.query(Channel.id, Channel.username)
+            .filter(Channel.platform == platform, Channel.username.in_(usernames))
+        }
+    finally:
+        db.close()
+
+
+class TrackQueue:
+
+    def __init__(self, workers: int = 4, batch_size: int = 100, queue_size: int = 2000):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.collected = 0
+        self.failed = 0
+        self._pending: set[tuple[str, str]] = set()
+        self._queue: asyncio.Queue | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._running = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for _ in range(self.workers):
+            self._spawn(self._worker())
+
+    async def stop(self):
+        """Stop the workers. Channels still queued keep their placeholders
+        and are picked up by the next scheduled collection."""
+        self._running = False
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._pending.clear()
+
+    def submit(self, platform: str, username: str) -> str:
+        """Queue a channel for collection unless it is already pending.
+
+        Returns ``QUEUED``, ``PENDING`` (already queued or in flight) or
+        ``REJECTED`` (queue full). Without running workers (CLI tools) the
+        channel is collected in a task of its own.
+        """
+        key = (platform, username)
+        if key in self._pending:
+            return PENDING
+        if not self._running:
+            self._pending.add(key)
+            self._spawn(self._collect_batch([key]))
+            return QUEUED
+        try:
+            self._queue.put_nowait(key)
+        except asyncio.QueueFull:
+            return REJECTED
+        self._pending.add(key)
+        return QUEUED
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._collect_batch(batch)
+
+    async def _collect_batch(self, keys: list[tuple[str, str]]):
+        by_platform = defaultdict(list)
+        for platform, username in keys:
+            by_platform[platform].append(username)
+        try:
+            for platform, usernames in by_platform.items():
+                try:
+                    await self._collect(platform, usernames)
+                except Exception as e:
+                    self.failed += len(usernames)
+                    logger.error("On-demand collection failed for %d %s channels: %s", len(usernames), platform, e)
+        finally:
+            self._pending.difference_update(keys)
+
+    async def _collect(self, platform: str, usernames: list[str]):
+        collector = get_collector(platform)
+        if collector is None:
+            return
+        infos = await collector.collect_channel_infos(usernames)
+        if not infos:
+            return
+        ids = await run_db(_channel_ids, platform, list(infos))
+        for username, info in infos.items():
+            channel_id = ids.get(username)
+            if channel_id is None:
+                continue
+            try:
+                viewers = await collector.collect_viewers(username)
+            except Exception as e:
+                logger.warning("Viewer collection failed for %s/%s: %s", platform, username, e)
+                viewers = None
+            await ingest_writer.submit(Collection(channel_id, viewers, info=info))
+            self.collected += 1
+
+
+track_queue = TrackQueue(
+    workers=settings.TRACK_WORKERS,
+    batch_size=settings.TRACK_BATCH_SIZE,
+    queue_size=settings.TRACK_QUEUE_SIZE,
+)
+registry.register_callback(lambda: BACKLOG.set(track_queue.pending, queue="track"))
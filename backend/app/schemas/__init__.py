@@ -2,30 +2,48 @@ from app.schemas.channel import (
     ChannelBase,
     ChannelResponse,
     ChannelDetail,
+    ChannelStatsSummary,
     SnapshotResponse,
+    SnapshotColumns,
     TrackRequest,
     SearchResponse,
+    AutocompleteEntry,
+    ChannelRef,
+    BulkChannelsRequest,
+    BulkChannelsResponse,
+    BulkTrackResponse,
 )
 from app.schemas.analysis import (
     SignalScore,
     AnalysisResponse,
+    ScoreTimelinePoint,
     LeaderboardEntry,
     MethodologySignal,
     MethodologyResponse,
     get_score_label,
 )
+from app.schemas.anomaly import AnomalyResponse
 
 __all__ = [
     "ChannelBase",
     "ChannelResponse",
     "ChannelDetail",
+    "ChannelStatsSummary",
     "SnapshotResponse",
+    "SnapshotColumns",
     "TrackRequest",
     "SearchResponse",
+    "AutocompleteEntry",
+    "ChannelRef",
+    "BulkChannelsRequest",
+    "BulkChannelsResponse",
+    "BulkTrackResponse",
     "SignalScore",
     "AnalysisResponse",
+    "ScoreTimelinePoint",
     "LeaderboardEntry",
     "MethodologySignal",
     "MethodologyResponse",
     "get_score_label",
+    "AnomalyResponse",
 ]
@@ -36,6 +36,15 @@ class AnalysisResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ScoreTimelinePoint(BaseModel):
+    """A stretch of analysis runs that produced the same result within tolerance."""
+
+    analyzed_at: datetime
+    valid_until: datetime
+    overall_score: float
+    confidence: float
+
+
 class LeaderboardEntry(BaseModel):
     rank: int
     channel_id: int
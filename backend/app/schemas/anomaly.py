@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class AnomalyResponse(BaseModel):
+    """A viewer anomaly flagged at ingest; see ``app.storage.anomalies``."""
+
+    id: int
+    channel_id: int
+    platform: str
+    username: str
+    display_name: str
+    kind: str
+    severity: str
+    viewer_count: int
+    baseline: float
+    magnitude: float
+    detected_at: datetime
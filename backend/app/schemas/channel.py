@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ChannelBase(BaseModel):
@@ -25,6 +25,7 @@ class ChannelResponse(BaseModel):
 
 class ChannelDetail(ChannelResponse):
     latest_analysis: Optional["AnalysisSummary"] = None
+    stats: Optional["ChannelStatsSummary"] = None
 
 
 class AnalysisSummary(BaseModel):
@@ -36,16 +37,47 @@ class AnalysisSummary(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ChannelStatsSummary(BaseModel):
+    snapshot_count: int
+    avg_viewers: float
+    peak_viewers: int
+    last_viewers: Optional[int] = None
+    previous_viewers: Optional[int] = None
+    last_collected_at: Optional[datetime] = None
+    last_live_at: Optional[datetime] = None
+    last_score: Optional[float] = None
+    previous_score: Optional[float] = None
+
+    model_config = {"from_attributes": True}
+
+
 class SnapshotResponse(BaseModel):
     id: int
     viewer_count: int
     chatter_count: int
     category: Optional[str] = None
     collected_at: datetime
+    # Set only for rolled-up points, where the counts are bucket means
+    viewer_min: Optional[int] = None
+    viewer_max: Optional[int] = None
+    sample_count: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
 
+class SnapshotColumns(BaseModel):
+    """Snapshot series as parallel arrays (``format=columns``)."""
+
+    id: list[int]
+    collected_at: list[datetime]
+    viewer_count: list[int]
+    chatter_count: list[int]
+    category: list[Optional[str]]
+    viewer_min: Optional[list[int]] = None
+    viewer_max: Optional[list[int]] = None
+    sample_count: Optional[list[int]] = None
+
+
 class TrackRequest(BaseModel):
     platform: str
     username: str
@@ -56,4 +88,35 @@ class SearchResponse(BaseModel):
     total: int
 
 
+class ChannelRef(BaseModel):
+    platform: str
+    username: str
+
+
+class BulkChannelsRequest(BaseModel):
+    channels: list[ChannelRef] = Field(..., min_length=1, max_length=500)
+
+
+class BulkChannelsResponse(BaseModel):
+    results: list["ChannelDetail"]
+    missing: list[ChannelRef]
+
+
+class BulkTrackResponse(BaseModel):
+    results: list[ChannelResponse]
+    queued: int
+    # Already queued or being collected by an earlier request
+    pending: int
+    # Not queued because the tracking queue is full
+    rejected: list[ChannelRef]
+
+
+class AutocompleteEntry(BaseModel):
+    id: int
+    platform: str
+    username: str
+    display_name: str
+
+
 ChannelDetail.model_rebuild()
+BulkChannelsResponse.model_rebuild()
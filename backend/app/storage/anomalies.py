@@ -0,0 +1,208 @@
+"""Streaming viewer anomaly detection at ingest time.
+
+The ingest writer passes each batch of snapshots to ``detect`` inside its
+transaction, before the batch is folded into ``channel_stats``. Every live
+snapshot of a channel with at least ``ANOMALY_MIN_VIEWERS`` is checked by
+three detectors whose state lives in the channel's stats row, so nothing is
+re-read from ``viewer_snapshots``:
+
+- ``spike``: viewers rose ``ANOMALY_SPIKE_PERCENT`` or more over the
+  previous snapshot
+- ``zscore``: viewers are ``ANOMALY_ZSCORE_THRESHOLD`` or more standard
+  deviations from an exponentially weighted baseline spanning
+  ``ANOMALY_ZSCORE_WINDOW`` snapshots
+- ``flatline``: the same count ``ANOMALY_FLAT_SNAPSHOTS`` times in a row,
+  which organic audiences practically never produce; reported again at two
+  and three times that length
+
+Severity is how far past its threshold a detector fired: ``low`` below
+twice, ``medium`` below three times, ``high`` beyond. Findings are stored
+in the ``anomalies`` table and published to the live feed after commit.
+Offline snapshots reset the flat run and leave the baseline untouched.
+Rows older than ``RETENTION_HOURS``, the longest window the API serves, are
+deleted by the daily prune job.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.anomaly import Anomaly
+from app.models.channel_stats import ChannelStats
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("spike", "zscore", "flatline")
+SEVERITIES = ("low", "medium", "high")
+
+# Longest lookback the anomalies API accepts; older rows are pruned
+RETENTION_HOURS = 720
+
+# Floor on the baseline deviation, relative to its mean, so a channel that
+# has been unusually steady does not flag ordinary noise
+MIN_RELATIVE_STD = 0.02
+
+
+def severity(ratio: float) -> str:
+    """Severity of a detector that fired at ``ratio`` times its threshold."""
+    if ratio >= 3:
+        return "high"
+    if ratio >= 2:
+        return "medium"
+    return "low"
+
+
+@dataclass
+class Baseline:
+    """One channel's detector state, as stored in ``channel_stats``."""
+
+    last_viewers: int | None = None
+    mean: float | None = None
+    variance: float = 0.0
+    samples: int = 0
+    flat_run: int = 0
+
+    def observe(self, viewers: int, live: bool) -> list[tuple[str, str, float, float]]:
+        """Advance the detectors by one snapshot.
+
+        Returns ``(kind, severity, baseline, magnitude)`` for each detector
+        that fired.
+        """
+        found = []
+        previous = self.last_viewers
+        self.last_viewers = viewers
+        if not live:
+            self.flat_run = 0
+            return found
+
+        min_viewers = settings.ANOMALY_MIN_VIEWERS
+        if previous is not None and previous >= min_viewers:
+            threshold = settings.ANOMALY_SPIKE_PERCENT
+            percent = (viewers - previous) / previous * 100
+            if threshold > 0 and percent >= threshold:
+                found.append(("spike", severity(percent / threshold), float(previous), percent))
+
+        if self.mean is not None and self.samples >= settings.ANOMALY_ZSCORE_WINDOW and self.mean >= min_viewers:
+            threshold = settings.ANOMALY_ZSCORE_THRESHOLD
+            std = max(math.sqrt(self.variance), self.mean * MIN_RELATIVE_STD, 1.0)
+            z = (viewers - self.mean) / std
+            if threshold > 0 and abs(z) >= threshold:
+                found.append(("zscore", severity(abs(z) / threshold), self.mean, z))
+        self._update_baseline(viewers)
+
+        if viewers >= min_viewers and viewers == previous:
+            self.flat_run += 1
+        else:
+            self.flat_run = 1
+        run = settings.ANOMALY_FLAT_SNAPSHOTS
+        if run > 1 and self.flat_run % run == 0 and self.flat_run <= 3 * run:
+            found.append(("flatline", severity(self.flat_run / run), float(viewers), float(self.flat_run)))
+        return found
+
+    def _update_baseline(self, viewers: int):
+        self.samples += 1
+        if self.mean is None:
+            self.mean = float(viewers)
+            return
+        alpha = 2 / (max(settings.ANOMALY_ZSCORE_WINDOW, 1) + 1)
+        diff = viewers - self.mean
+        self.mean += alpha * diff
+        self.variance = (1 - alpha) * (self.variance + alpha * diff * diff)
+
+
+def _load_baselines(db: Session, channel_ids: set[int]) -> dict[int, Baseline]:
+    rows = db.query(
+        ChannelStats.channel_id,
+        ChannelStats.last_viewers,
+        ChannelStats.viewer_mean,
+        ChannelStats.viewer_variance,
+        ChannelStats.baseline_samples,
+        ChannelStats.flat_run,
+    ).filter(ChannelStats.channel_id.in_(channel_ids))
+    return {
+        channel_id: Baseline(last_viewers, mean, variance or 0.0, samples or 0, flat_run or 0)
+        for channel_id, last_viewers, mean, variance, samples, flat_run in rows
+    }
+
+
+def detect(db: Session, snapshots, live_channel_ids=frozenset()) -> list[Anomaly]:
+    """Run the detectors over new snapshots and store what they find.
+
+    Must run before ``stats.apply_snapshots`` folds the same snapshots in,
+    since the spike detector compares against the stored last count. Does
+    not commit.
+    """
+    if not snapshots:
+        return []
+    baselines = _load_baselines(db, {s.channel_id for s in snapshots})
+    found = []
+    for snap in sorted(snapshots, key=lambda s: s.collected_at):
+        baseline = baselines.setdefault(snap.channel_id, Baseline())
+        live = snap.channel_id in live_channel_ids
+        for kind, level, value, magnitude in baseline.observe(snap.viewer_count or 0, live):
+            found.append(Anomaly(
+                channel_id=snap.channel_id,
+                kind=kind,
+                severity=level,
+                viewer_count=snap.viewer_count or 0,
+                baseline=value,
+                magnitude=magnitude,
+                detected_at=snap.collected_at or datetime.utcnow(),
+            ))
+
+    table = ChannelStats.__table__
+    stmt = insert(table)
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["channel_id"],
+        set_={
+            "viewer_mean": new.viewer_mean,
+            "viewer_variance": new.viewer_variance,
+            "baseline_samples": new.baseline_samples,
+            "flat_run": new.flat_run,
+        },
+    )
+    db.execute(stmt, [
+        {
+            "channel_id": channel_id,
+            "viewer_mean": b.mean,
+            "viewer_variance": b.variance,
+            "baseline_samples": b.samples,
+            "flat_run": b.flat_run,
+        }
+        for channel_id, b in baselines.items()
+    ])
+    db.add_all(found)
+    return found
+
+
+def prune(db: Session, retention_hours: int = RETENTION_HOURS) -> int:
+    """Delete anomalies detected more than ``retention_hours`` ago and commit."""
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    deleted = db.query(Anomaly).filter(Anomaly.detected_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    if deleted:
+        logger.info("Pruned %d anomalies older than %s", deleted, cutoff)
+    return deleted
+
+
+def anomaly_dict(anomaly: Anomaly, channel) -> dict:
+    """An anomaly in ``AnomalyResponse`` shape."""
+    return {
+        "id": anomaly.id,
+        "channel_id": anomaly.channel_id,
+        "platform": channel.platform,
+        "username": channel.username,
+        "display_name": channel.display_name,
+        "kind": anomaly.kind,
+        "severity": anomaly.severity,
+        "viewer_count": anomaly.viewer_count,
+        "baseline": anomaly.baseline,
+        "magnitude": anomaly.magnitude,
+        "detected_at": anomaly.detected_at,
+    }
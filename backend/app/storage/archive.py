@@ -0,0 +1,272 @@
+"""Append-only columnar archive for cold viewer_snapshots.
+
+Each channel gets a directory under ``ARCHIVE_DIR`` with one fixed-width
+file per column, in native byte order:
+
+    collected_at.i8   int64 epoch seconds (UTC), ascending
+    viewer_count.i4   int32
+    chatter_count.i4  int32
+    index.json        {"rows": n, "first": ts, "last": ts, "last_ids": [...]}
+
+``index.json`` is replaced atomically after the column files are fsynced,
+so its row count is the source of truth and a torn append is discarded on
+the next write. ``last_ids`` holds the snapshot ids archived at the last
+timestamp, so a later row from the same second is not mistaken for one
+already archived. Readers memory-map the files and get ``memoryview`` slices
+over them; the timestamp column is sorted, so range lookups are a bisect.
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.snapshot import ViewerSnapshot
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    ("collected_at", "q", 8),
+    ("viewer_count", "i", 4),
+    ("chatter_count", "i", 4),
+)
+_SUFFIX = {"q": "i8", "i": "i4"}
+
+
+def to_epoch(ts: datetime) -> int:
+    return int(ts.replace(tzinfo=timezone.utc).timestamp())
+
+
+def from_epoch(value: int) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class ArchivedSnapshot:
+    """Row view with the attributes signals read from a ViewerSnapshot."""
+
+    channel_id: int
+    viewer_count: int
+    chatter_count: int
+    collected_at: datetime
+    id: int | None = None
+    category: str | None = None
+
+
+class ArchiveView:
+    """Memory-mapped, read-only view over one channel's archive."""
+
+    def __init__(self, path: str, channel_id: int, rows: int):
+        self.channel_id = channel_id
+        self.rows = rows
+        self._maps: list[mmap.mmap] = []
+        self.columns: dict[str, memoryview] = {}
+        for name, code, width in COLUMNS:
+            if rows == 0:
+                self.columns[name] = memoryview(b"").cast(code)
+                continue
+            with open(os.path.join(path, f"{name}.{_SUFFIX[code]}"), "rb") as f:
+                mm = mmap.mmap(f.fileno(), rows * width, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            self.columns[name] = memoryview(mm).cast(code)
+
+    @property
+    def timestamps(self) -> memoryview:
+        return self.columns["collected_at"]
+
+    def index_range(self, start: datetime | None = None, end: datetime | None = None) -> tuple[int, int]:
+        """Row indexes ``[lo, hi)`` with ``start <= collected_at <= end``."""
+        ts = self.timestamps
+        lo = bisect.bisect_left(ts, to_epoch(start)) if start else 0
+        hi = bisect.bisect_right(ts, to_epoch(end)) if end else self.rows
+        return lo, max(lo, hi)
+
+    def slice(self, lo: int, hi: int) -> dict[str, memoryview]:
+        """Zero-copy column views for rows ``[lo, hi)``."""
+        return {name: view[lo:hi] for name, view in self.columns.items()}
+
+    def snapshots(self, lo: int, hi: int) -> list[ArchivedSnapshot]:
+        cols = self.slice(lo, hi)
+        try:
+            return [
+                ArchivedSnapshot(self.channel_id, v, c, from_epoch(t))
+                for t, v, c in zip(cols["collected_at"], cols["viewer_count"], cols["chatter_count"])
+            ]
+        finally:
+            for view in cols.values():
+                view.release()
+
+    def close(self):
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChannelArchive:
+
+    def __init__(self, channel_id: int, root: str | None = None):
+        self.channel_id = channel_id
+        self.path = os.path.join(root or settings.ARCHIVE_DIR, str(channel_id))
+        self._index_path = os.path.join(self.path, "index.json")
+
+    def index(self) -> dict:
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"rows": 0, "first": None, "last": None}
+
+    def exists(self) -> bool:
+        return os.path.exists(self._index_path)
+
+    def open(self) -> ArchiveView:
+        return ArchiveView(self.path, self.channel_id, self.index()["rows"])
+
+    def append(self, rows: list[tuple[int, int, int, int]]) -> int:
+        """Append ``(snapshot_id, epoch_seconds, viewers, chatters)`` rows newer than the archive.
+
+        Rows must be in timestamp order. Rows before the archive's last
+        timestamp, or at it with an id already archived, are skipped.
+        """
+        index = self.index()
+        last = index["last"]
+        if last is not None:
+            archived_ids = index.get("last_ids")
+            if archived_ids is None:
+                # Written before ids were recorded
+                rows = [r for r in rows if r[1] > last]
+            else:
+                archived_ids = set(archived_ids)
+                rows = [r for r in rows if r[1] > last or (r[1] == last and r[0] not in archived_ids)]
+        if not rows:
+            return 0
+        os.makedirs(self.path, exist_ok=True)
+        count = index["rows"]
+        for col, (name, code, width) in enumerate(COLUMNS, start=1):
+            data = array(code, (r[col] for r in rows))
+            with open(os.path.join(self.path, f"{name}.{_SUFFIX[code]}"), "ab") as f:
+                f.truncate(count * width)  # drop a torn tail from an interrupted append
+                f.write(data.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        new_last = rows[-1][1]
+        last_ids = [r[0] for r in rows if r[1] == new_last]
+        if new_last == last:
+            last_ids += index.get("last_ids") or []
+        index = {
+            "rows": count + len(rows),
+            "first": index["first"] if index["first"] is not None else rows[0][1],
+            "last": new_last,
+            "last_ids": last_ids,
+        }
+        tmp = f"{self._index_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path)
+        return len(rows)
+
+
+def read_snapshots(channel_id: int, start: datetime | None, end: datetime | None, lead_in: int = 0) -> list[ArchivedSnapshot]:
+    """Archived snapshots in ``[start, end]`` plus up to ``lead_in`` rows before ``start``, oldest first."""
+    archive = ChannelArchive(channel_id)
+    if not archive.exists():
+        return []
+    with archive.open() as view:
+        lo, hi = view.index_range(start, end)
+        return view.snapshots(max(0, lo - lead_in), hi)
+
+
+def read_before(channel_id: int, before: datetime | None, since: datetime | None, limit: int = 0) -> list[ArchivedSnapshot]:
+    """Archived snapshots older than ``before``, oldest first.
+
+    Covers everything from ``since`` on and at least the newest ``limit``
+    rows, as far as the archive goes.
+    """
+    archive = ChannelArchive(channel_id)
+    if not archive.exists():
+        return []
+    with archive.open() as view:
+        ts = view.timestamps
+        hi = bisect.bisect_left(ts, to_epoch(before)) if before else view.rows
+        lo = bisect.bisect_left(ts, to_epoch(since)) if since else hi
+        return view.snapshots(max(0, min(lo, hi - limit)), hi)
+
+
+def archive_snapshots(db: Session, older_than: datetime, batch_size: int = 50000) -> int:
+    """Move raw snapshots collected before ``older_than`` into the archive."""
+    channel_ids = [
+        r[0] for r in
+        db.query(ViewerSnapshot.channel_id)
+        .filter(ViewerSnapshot.collected_at < older_than)
+        .distinct()
+    ]
+    moved = 0
+    for channel_id in channel_ids:
+        archive = ChannelArchive(channel_id)
+        while True:
+            rows = (
+                db.query(
+                    ViewerSnapshot.id,
+                    ViewerSnapshot.collected_at,
+                    ViewerSnapshot.viewer_count,
+                    ViewerSnapshot.chatter_count,
+                )
+                .filter(ViewerSnapshot.channel_id == channel_id, ViewerSnapshot.collected_at < older_than)
+                .order_by(ViewerSnapshot.collected_at.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            # Rows archived by an interrupted earlier run are only deleted here
+            moved += archive.append([
+                (r.id, to_epoch(r.collected_at), r.viewer_count or 0, r.chatter_count or 0)
+                for r in rows
+            ])
+            db.query(ViewerSnapshot).filter(
+                ViewerSnapshot.id.in_([r.id for r in rows])
+            ).delete(synchronize_session=False)
+            db.commit()
+    if moved:
+        logger.info("Archived %d snapshots older than %s", moved, older_than)
+    return moved
+
+
+def iter_archived(start: datetime, end: datetime | None = None):
+    """Yield ``(channel_id, collected_at, viewer_count)`` across all archives in range."""
+    root = settings.ARCHIVE_DIR
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        if not name.isdigit():
+            continue
+        archive = ChannelArchive(int(name), root)
+        if not archive.exists():
+            continue
+        with archive.open() as view:
+            lo, hi = view.index_range(start, end)
+            cols = view.slice(lo, hi)
+            try:
+                for ts, viewers in zip(cols["collected_at"], cols["viewer_count"]):
+                    yield archive.channel_id, from_epoch(ts), viewers
+            finally:
+                # Released even if the caller stops early, or closing the map fails
+                for view_slice in cols.values():
+                    view_slice.release()
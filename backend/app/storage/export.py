@@ -0,0 +1,238 @@
+"""Streaming bulk export of snapshots, chat metrics and analyses.
+
+Rows are read channel by channel, oldest first, through ``yield_per``
+cursors and encoded ``chunk_size`` rows at a time, so an export of any size
+runs in constant memory. Each channel is read in its own short transaction,
+which keeps a long export from pinning the WAL. Archived snapshots (see
+``app.storage.archive``) are included ahead of each channel's table rows.
+
+Served by ``GET /api/v1/export/{dataset}`` and available as a CLI:
+
+    python -m app.storage.export snapshots --format csv \\
+        --start 2026-09-01 --end 2026-10-01 --platform twitch --output snapshots.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.analysis_result import AnalysisResult
+from app.models.channel import Channel
+from app.models.chat_metric import ChatMetric
+from app.models.snapshot import ViewerSnapshot
+from app.storage.archive import ChannelArchive, from_epoch
+from app.utils import fastjson
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CHANNEL_COLUMNS = ("channel_id", "platform", "username")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type
+    time_column: str
+    columns: tuple[str, ...]
+    # Nested values, written as JSON text in CSV
+    json_columns: tuple[str, ...] = ()
+
+    @property
+    def header(self) -> tuple[str, ...]:
+        return CHANNEL_COLUMNS + self.columns
+
+
+DATASETS = {
+    "snapshots": Dataset(
+        ViewerSnapshot,
+        "collected_at",
+        ("id", "collected_at", "viewer_count", "chatter_count", "category"),
+    ),
+    "chat_metrics": Dataset(
+        ChatMetric,
+        "window_end",
+        (
+            "id", "window_start", "window_end", "message_count", "unique_chatters",
+            "message_entropy", "unique_message_ratio", "avg_time_between_msgs",
+        ),
+    ),
+    "analyses": Dataset(
+        AnalysisResult,
+        "analyzed_at",
+        (
+            "id", "analyzed_at", "valid_until", "overall_score", "confidence", "data_points",
+            "signal_scores", "signal_details",
+        ),
+        json_columns=("signal_scores", "signal_details"),
+    ),
+}
+
+
+def _select_channels(db: Session, platform: str | None, channels: list[tuple[str, str]] | None) -> list[tuple]:
+    query = db.query(Channel.id, Channel.platform, Channel.username)
+    if platform:
+        query = query.filter(Channel.platform == platform)
+    if channels:
+        query = query.filter(tuple_(Channel.platform, Channel.username).in_(channels))
+    return [tuple(r) for r in query.order_by(Channel.id)]
+
+
+def _archived_rows(channel_id: int, start: datetime | None, end: datetime | None) -> Iterator[tuple]:
+    """Archived snapshots as ``DATASETS["snapshots"]`` column tuples."""
+    archive = ChannelArchive(channel_id)
+    if not archive.exists():
+        return
+    with archive.open() as view:
+        lo, hi = view.index_range(start, end)
+        cols = view.slice(lo, hi)
+        try:
+            for ts, viewers, chatters in zip(cols["collected_at"], cols["viewer_count"], cols["chatter_count"]):
+                yield None, from_epoch(ts), viewers, chatters, None
+        finally:
+            for view_slice in cols.values():
+                view_slice.release()
+
+
+def iter_rows(
+    db: Session,
+    dataset: Dataset,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    platform: str | None = None,
+    channels: list[tuple[str, str]] | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[tuple]:
+    """Yield ``dataset.header`` tuples channel by channel, oldest first."""
+    selected = _select_channels(db, platform, channels)
+    db.commit()
+    time_column = getattr(dataset.model, dataset.time_column)
+    columns = [getattr(dataset.model, name) for name in dataset.columns]
+
+    for channel in selected:
+        if dataset.model is ViewerSnapshot:
+            for row in _archived_rows(channel[0], start, end):
+                yield channel + row
+
+        query = db.query(*columns).filter(dataset.model.channel_id == channel[0])
+        if start is not None:
+            query = query.filter(time_column >= start)
+        if end is not None:
+            query = query.filter(time_column <= end)
+        query = query.order_by(time_column.asc()).execution_options(yield_per=chunk_size)
+        for row in query:
+            yield channel + tuple(row)
+        # End the read transaction between channels so checkpoints can run
+        db.commit()
+
+
+def _ndjson_chunks(dataset: Dataset, rows: Iterator[tuple], chunk_size: int) -> Iterator[bytes]:
+    header = dataset.header
+    chunk = []
+    for row in rows:
+        chunk.append(fastjson.dumps(dict(zip(header, row))))
+        if len(chunk) >= chunk_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def _csv_chunks(dataset: Dataset, rows: Iterator[tuple], chunk_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(dataset.header)
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row])
+        count += 1
+        if count >= chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue().encode()
+
+
+def stream_export(
+    name: str,
+    fmt: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    platform: str | None = None,
+    channels: list[tuple[str, str]] | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[bytes]:
+    """Encoded export of dataset ``name``; owns its session for the whole stream."""
+    dataset = DATASETS[name]
+    encode = _csv_chunks if fmt == "csv" else _ndjson_chunks
+    db = SessionLocal()
+    try:
+        rows = iter_rows(db, dataset, start, end, platform, channels, chunk_size)
+        yield from encode(dataset, rows, chunk_size)
+    finally:
+        db.close()
+
+
+def parse_channel_refs(values: list[str]) -> list[tuple[str, str]]:
+    """``platform/username`` strings as lowercase key tuples."""
+    refs = []
+    for value in values:
+        platform, sep, username = value.strip().partition("/")
+        if not sep or not platform or not username:
+            raise ValueError(f"expected platform/username, got {value!r}")
+        refs.append((platform.lower(), username.lower()))
+    return refs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a bulk export as NDJSON or CSV")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--platform", default=None)
+    parser.add_argument("--channels", nargs="*", default=None, help="platform/username ...")
+    parser.add_argument("--output", default="-", help="file to write (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    try:
+        channels = parse_channel_refs(args.channels) if args.channels else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    chunks = stream_export(
+        args.dataset, args.format, args.start, args.end,
+        args.platform.lower() if args.platform else None, channels, args.chunk_size,
+    )
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
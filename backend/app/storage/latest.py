@@ -0,0 +1,88 @@
+"""Maintenance of the channel_latest_analysis table."""
+
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.analysis_result import AnalysisResult
+from app.models.channel import Channel
+from app.models.latest_analysis import ChannelLatestAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+def record_latest(db: Session, channel, analysis: AnalysisResult):
+    """Point the channel's latest row at ``analysis``. Does not commit."""
+    latest = db.get(ChannelLatestAnalysis, channel.id)
+    if latest is None:
+        latest = ChannelLatestAnalysis(channel_id=channel.id, platform=channel.platform)
+        db.add(latest)
+    latest.category = channel.category
+    latest.analysis_id = analysis.id
+    latest.overall_score = analysis.overall_score
+    latest.confidence = analysis.confidence
+    latest.analyzed_at = analysis.valid_until or analysis.analyzed_at
+
+
+def rebuild_latest(db: Session) -> int:
+    """Recompute the table from analysis_results history."""
+    latest_subq = (
+        db.query(
+            AnalysisResult.channel_id,
+            func.max(AnalysisResult.analyzed_at).label("max_at"),
+        )
+        .group_by(AnalysisResult.channel_id)
+        .subquery()
+    )
+    rows = (
+        db.query(AnalysisResult, Channel.platform, Channel.category)
+        .join(Channel, Channel.id == AnalysisResult.channel_id)
+        .join(
+            latest_subq,
+            (AnalysisResult.channel_id == latest_subq.c.channel_id)
+            & (AnalysisResult.analyzed_at == latest_subq.c.max_at),
+        )
+        .all()
+    )
+    db.query(ChannelLatestAnalysis).delete(synchronize_session=False)
+    db.add_all(
+        ChannelLatestAnalysis(
+            channel_id=analysis.channel_id,
+            analysis_id=analysis.id,
+            platform=platform,
+            category=category,
+            overall_score=analysis.overall_score,
+            confidence=analysis.confidence,
+            analyzed_at=analysis.valid_until or analysis.analyzed_at,
+        )
+        for analysis, platform, category in rows
+    )
+    db.commit()
+    logger.info("Rebuilt latest analysis for %d channels", len(rows))
+    return len(rows)
+
+
+def record_categories(db: Session, categories: dict[int, str | None]):
+    """Copy changed channel categories onto their latest rows. Does not commit."""
+    for channel_id, category in categories.items():
+        db.query(ChannelLatestAnalysis).filter(ChannelLatestAnalysis.channel_id == channel_id).update(
+            {ChannelLatestAnalysis.category: category}, synchronize_session=False
+        )
+
+
+def ensure_latest(db: Session):
+    """Populate the table once for databases that predate it, and fill in
+    categories for rows written before the column existed."""
+    if db.query(ChannelLatestAnalysis.channel_id).first() is None and db.query(AnalysisResult.id).first() is not None:
+        rebuild_latest(db)
+        return
+    category = select(Channel.category).where(Channel.id == ChannelLatestAnalysis.channel_id).scalar_subquery()
+    missing = (
+        db.query(ChannelLatestAnalysis)
+        .filter(ChannelLatestAnalysis.category.is_(None), category.isnot(None))
+        .update({ChannelLatestAnalysis.category: category}, synchronize_session=False)
+    )
+    db.commit()
+    if missing:
+        logger.info("Filled in categories on %d latest analysis rows", missing)
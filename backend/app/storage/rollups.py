@@ -0,0 +1,169 @@
+"""Hourly and daily rollups of viewer_snapshots, plus raw-row retention.
+
+Rollups are maintained incrementally: every snapshot written is folded into
+its hour and day bucket with a single upsert in the same transaction, so
+long-range chart queries read a bounded number of pre-aggregated rows.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import case
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import ViewerSnapshot
+from app.models.snapshot_rollup import SnapshotRollup
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = {"1h": HOUR, "1d": DAY}
+
+PRUNE_BATCH_SIZE = 10000
+
+
+def bucket_start(ts: datetime, resolution: int) -> datetime:
+    if resolution == DAY:
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unsupported rollup resolution: {resolution}")
+
+
+def _aggregate(snapshots) -> dict[tuple, dict]:
+    """Fold snapshots into per-(channel, resolution, bucket) partial aggregates."""
+    buckets: dict[tuple, dict] = {}
+    for snap in snapshots:
+        viewers = snap.viewer_count or 0
+        chatters = snap.chatter_count or 0
+        for resolution in RESOLUTIONS.values():
+            key = (snap.channel_id, resolution, bucket_start(snap.collected_at, resolution))
+            agg = buckets.get(key)
+            if agg is None:
+                buckets[key] = {
+                    "channel_id": key[0],
+                    "resolution": key[1],
+                    "bucket_start": key[2],
+                    "sample_count": 1,
+                    "viewer_min": viewers,
+                    "viewer_max": viewers,
+                    "viewer_sum": viewers,
+                    "viewer_last": viewers,
+                    "chatter_min": chatters,
+                    "chatter_max": chatters,
+                    "chatter_sum": chatters,
+                    "last_at": snap.collected_at,
+                }
+                continue
+            agg["sample_count"] += 1
+            agg["viewer_min"] = min(agg["viewer_min"], viewers)
+            agg["viewer_max"] = max(agg["viewer_max"], viewers)
+            agg["viewer_sum"] += viewers
+            agg["chatter_min"] = min(agg["chatter_min"], chatters)
+            agg["chatter_max"] = max(agg["chatter_max"], chatters)
+            agg["chatter_sum"] += chatters
+            if snap.collected_at >= agg["last_at"]:
+                agg["viewer_last"] = viewers
+                agg["last_at"] = snap.collected_at
+    return buckets
+
+
+def apply_snapshots(db: Session, snapshots):
+    """Merge snapshots into their rollup buckets. Does not commit.
+
+    Each snapshot needs ``channel_id``, ``viewer_count``, ``chatter_count``
+    and an explicit ``collected_at``.
+    """
+    rows = list(_aggregate(snapshots).values())
+    if not rows:
+        return
+    table = SnapshotRollup.__table__
+    stmt = insert(table)
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["channel_id", "resolution", "bucket_start"],
+        set_={
+            "sample_count": table.c.sample_count + new.sample_count,
+            "viewer_min": case((new.viewer_min < table.c.viewer_min, new.viewer_min), else_=table.c.viewer_min),
+            "viewer_max": case((new.viewer_max > table.c.viewer_max, new.viewer_max), else_=table.c.viewer_max),
+            "viewer_sum": table.c.viewer_sum + new.viewer_sum,
+            "viewer_last": case((new.last_at >= table.c.last_at, new.viewer_last), else_=table.c.viewer_last),
+            "chatter_min": case((new.chatter_min < table.c.chatter_min, new.chatter_min), else_=table.c.chatter_min),
+            "chatter_max": case((new.chatter_max > table.c.chatter_max, new.chatter_max), else_=table.c.chatter_max),
+            "chatter_sum": table.c.chatter_sum + new.chatter_sum,
+            "last_at": case((new.last_at >= table.c.last_at, new.last_at), else_=table.c.last_at),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def rebuild(db: Session, chunk_size: int = 50000) -> int:
+    """Recompute every rollup from raw snapshots. Returns rows scanned."""
+    db.query(SnapshotRollup).delete(synchronize_session=False)
+    query = (
+        db.query(
+            ViewerSnapshot.channel_id,
+            ViewerSnapshot.viewer_count,
+            ViewerSnapshot.chatter_count,
+            ViewerSnapshot.collected_at,
+        )
+        .filter(ViewerSnapshot.collected_at.isnot(None))
+        .execution_options(yield_per=chunk_size)
+    )
+    scanned = 0
+    chunk = []
+    for row in query:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            apply_snapshots(db, chunk)
+            scanned += len(chunk)
+            chunk = []
+    apply_snapshots(db, chunk)
+    scanned += len(chunk)
+    db.commit()
+    logger.info("Rebuilt snapshot rollups from %d raw rows", scanned)
+    return scanned
+
+
+def ensure_rollups(db: Session):
+    """Backfill rollups once for databases that predate them."""
+    if db.query(SnapshotRollup.id).first() is None and db.query(ViewerSnapshot.id).first() is not None:
+        rebuild(db)
+
+
+def prune_raw_snapshots(db: Session, retention_days: int) -> int:
+    """Delete raw snapshots older than ``retention_days``; rollups keep their history."""
+    if retention_days <= 0:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        ids = [
+            r.id for r in
+            db.query(ViewerSnapshot.id)
+            .filter(ViewerSnapshot.collected_at < cutoff)
+            .limit(PRUNE_BATCH_SIZE)
+        ]
+        if not ids:
+            break
+        db.query(ViewerSnapshot).filter(ViewerSnapshot.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(ids)
+    if deleted:
+        logger.info("Pruned %d raw snapshots older than %s", deleted, cutoff)
+    return deleted
+
+
+def query_rollups(db: Session, channel_id: int, resolution: int, since: datetime) -> list[SnapshotRollup]:
+    return (
+        db.query(SnapshotRollup)
+        .filter(
+            SnapshotRollup.channel_id == channel_id,
+            SnapshotRollup.resolution == resolution,
+            SnapshotRollup.bucket_start >= bucket_start(since, resolution),
+        )
+        .order_by(SnapshotRollup.bucket_start.asc())
+        .all()
+    )
@@ -0,0 +1,251 @@
+"""Channel search: an FTS5 trigram index for substring search and an
+in-memory prefix index for autocomplete.
+
+``channel_search`` is an external-content FTS5 table over ``channels``
+kept current by SQL triggers, so every writer stays in sync. The prefix
+index is a sorted list of lowercased usernames and display names; a prefix
+lookup is two bisects. It is loaded at startup and updated from ORM
+events once the writing transaction commits.
+"""
+
+import bisect
+import logging
+import threading
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models.channel import Channel
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights: username, display_name, category
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+# FTS5 trigrams need at least this many characters to match
+MIN_TRIGRAM_LENGTH = 3
+# Prefix index entries copied out per lock acquisition during a lookup
+LOOKUP_CHUNK = 256
+
+_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS channel_search USING fts5(
+        username, display_name, category,
+        content='channels', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS channel_search_ai AFTER INSERT ON channels BEGIN
+        INSERT INTO channel_search(rowid, username, display_name, category)
+        VALUES (new.id, new.username, new.display_name, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS channel_search_ad AFTER DELETE ON channels BEGIN
+        INSERT INTO channel_search(channel_search, rowid, username, display_name, category)
+        VALUES ('delete', old.id, old.username, old.display_name, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS channel_search_au
+    AFTER UPDATE OF username, display_name, category ON channels BEGIN
+        INSERT INTO channel_search(channel_search, rowid, username, display_name, category)
+        VALUES ('delete', old.id, old.username, old.display_name, old.category);
+        INSERT INTO channel_search(rowid, username, display_name, category)
+        VALUES (new.id, new.username, new.display_name, new.category);
+    END
+    """,
+]
+
+
+def fts_available(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def ensure_search_index(db: Session):
+    """Create the FTS table and its triggers, populating it on first run."""
+    if not fts_available(db):
+        return
+    exists = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = 'channel_search'")
+    ).first()
+    for statement in _SCHEMA:
+        db.execute(text(statement))
+    if not exists:
+        db.execute(text("INSERT INTO channel_search(channel_search) VALUES ('rebuild')"))
+        logger.info("Built channel search index")
+    db.commit()
+
+
+def _match_expression(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+
+def _substring_ids(db: Session, q: str, platform: str | None, limit: int, exclude: list[int] = ()) -> list[int]:
+    pattern = f"%{q}%"
+    query = db.query(Channel.id).filter(
+        Channel.username.ilike(pattern) | Channel.display_name.ilike(pattern)
+    )
+    if platform:
+        query = query.filter(Channel.platform == platform)
+    if exclude:
+        query = query.filter(Channel.id.notin_(exclude))
+    return [r.id for r in query.limit(limit)]
+
+
+def search_channel_ids(db: Session, q: str, platform: str | None = None, limit: int = 50) -> list[int]:
+    """Channel ids matching ``q`` anywhere in username, display name or
+    category, best match first."""
+    q = q.strip().lower()
+    if len(q) < MIN_TRIGRAM_LENGTH:
+        # Too short for trigrams: prefix matches rank first, then any other
+        # name containing ``q``
+        ids = prefix_index.lookup(q, platform, limit)
+        if len(ids) < limit:
+            ids += _substring_ids(db, q, platform, limit - len(ids), exclude=ids)
+        return ids
+    if not fts_available(db):
+        return _substring_ids(db, q, platform, limit)
+
+    sql = (
+        "SELECT channel_search.rowid FROM channel_search "
+        "JOIN channels ON channels.id = channel_search.rowid "
+        "WHERE channel_search MATCH :match"
+        + (" AND channels.platform = :platform" if platform else "")
+        + " ORDER BY bm25(channel_search, :w_user, :w_display, :w_category) LIMIT :limit"
+    )
+    rows = db.execute(text(sql), {
+        "match": _match_expression(q),
+        "platform": platform,
+        "w_user": RANK_WEIGHTS[0],
+        "w_display": RANK_WEIGHTS[1],
+        "w_category": RANK_WEIGHTS[2],
+        "limit": limit,
+    })
+    return [r[0] for r in rows]
+
+
+class PrefixIndex:
+    """Sorted ``(key, channel_id)`` entries for lowercased names."""
+
+    def __init__(self):
+        self._keys: list[tuple[str, int]] = []
+        self._channels: dict[int, tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._channels
+
+    @staticmethod
+    def _names(username: str, display_name: str) -> set[str]:
+        return {n.lower() for n in (username, display_name) if n}
+
+    def load(self, db: Session):
+        rows = db.query(Channel.id, Channel.platform, Channel.username, Channel.display_name).all()
+        keys = sorted(
+            (name, r.id) for r in rows for name in self._names(r.username, r.display_name)
+        )
+        channels = {r.id: (r.platform, r.username, r.display_name) for r in rows}
+        with self._lock:
+            self._keys = keys
+            self._channels = channels
+        logger.info("Loaded %d channels into the prefix index", len(channels))
+
+    def _remove_locked(self, channel_id: int):
+        entry = self._channels.pop(channel_id, None)
+        if entry is None:
+            return
+        for name in self._names(entry[1], entry[2]):
+            i = bisect.bisect_left(self._keys, (name, channel_id))
+            if i < len(self._keys) and self._keys[i] == (name, channel_id):
+                del self._keys[i]
+
+    def put(self, channel_id: int, platform: str, username: str, display_name: str):
+        with self._lock:
+            self._remove_locked(channel_id)
+            self._channels[channel_id] = (platform, username, display_name)
+            for name in self._names(username, display_name):
+                bisect.insort(self._keys, (name, channel_id))
+
+    def remove(self, channel_id: int):
+        with self._lock:
+            self._remove_locked(channel_id)
+
+    def lookup(self, prefix: str, platform: str | None = None, limit: int = 10) -> list[int]:
+        """Ids of channels with a username or display name starting with ``prefix``."""
+        prefix = prefix.lower()
+        ids: list[int] = []
+        seen = set()
+        after = (prefix, -1)
+        while len(ids) < limit:
+            # put() insorts into the same list, so candidates are copied out
+            # under the lock a chunk at a time and filtered after releasing
+            # it; a broad prefix with a platform filter never holds off writers
+            with self._lock:
+                i = bisect.bisect_right(self._keys, after)
+                chunk = [(key, self._channels.get(key[1])) for key in self._keys[i:i + LOOKUP_CHUNK]]
+            for (name, channel_id), entry in chunk:
+                if not name.startswith(prefix):
+                    return ids
+                if channel_id in seen or entry is None or (platform and entry[0] != platform):
+                    continue
+                seen.add(channel_id)
+                ids.append(channel_id)
+                if len(ids) == limit:
+                    break
+            if len(chunk) < LOOKUP_CHUNK:
+                break
+            after = chunk[-1][0]
+        return ids
+
+    def entry(self, channel_id: int) -> tuple[str, str, str] | None:
+        return self._channels.get(channel_id)
+
+
+prefix_index = PrefixIndex()
+
+_PENDING = "prefix_index_pending"
+
+
+_INDEXED = ("platform", "username", "display_name")
+
+
+def _queue(connection, target: Channel, deleted: bool = False):
+    session = Session.object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(_PENDING, {})
+    pending[target.id] = None if deleted else (target.platform, target.username, target.display_name)
+
+
+@event.listens_for(Channel, "after_insert")
+@event.listens_for(Channel, "after_update")
+def _channel_written(mapper, connection, target):
+    # Collection updates every channel each tick; only renames touch the index
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _INDEXED) or target.id not in prefix_index:
+        _queue(connection, target)
+
+
+@event.listens_for(Channel, "after_delete")
+def _channel_deleted(mapper, connection, target):
+    _queue(connection, target, deleted=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    for channel_id, entry in pending.items():
+        if entry is None:
+            prefix_index.remove(channel_id)
+        else:
+            prefix_index.put(channel_id, *entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,202 @@
+"""Incremental per-channel statistics (the channel_stats table).
+
+Ingest folds each batch of snapshots into the channel's counters with one
+upsert, and every stored analysis shifts its score into ``last_score``, so
+channel pages and the poster read these facts with a primary-key lookup.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.analysis_result import AnalysisResult
+from app.models.channel_stats import ChannelStats
+from app.models.snapshot import ViewerSnapshot
+from app.models.snapshot_rollup import SnapshotRollup
+from app.storage.rollups import HOUR, DAY
+
+logger = logging.getLogger(__name__)
+
+
+def apply_snapshots(db: Session, snapshots, live_channel_ids=frozenset()):
+    """Fold snapshots into their channels' stats. Does not commit.
+
+    Snapshots must be newer than anything already counted for the channel,
+    which holds for collection; ``live_channel_ids`` marks channels that
+    were live when collected.
+    """
+    rows: dict[int, dict] = {}
+    for snap in sorted(snapshots, key=lambda s: s.collected_at):
+        viewers = snap.viewer_count or 0
+        row = rows.get(snap.channel_id)
+        if row is None:
+            row = rows[snap.channel_id] = {
+                "channel_id": snap.channel_id,
+                "snapshot_count": 0,
+                "viewer_sum": 0,
+                "peak_viewers": viewers,
+                "last_viewers": None,
+                "previous_viewers": None,
+                "last_collected_at": None,
+                "last_live_at": None,
+            }
+        row["snapshot_count"] += 1
+        row["viewer_sum"] += viewers
+        row["peak_viewers"] = max(row["peak_viewers"], viewers)
+        row["previous_viewers"] = row["last_viewers"]
+        row["last_viewers"] = viewers
+        row["last_collected_at"] = snap.collected_at
+        if snap.channel_id in live_channel_ids:
+            row["last_live_at"] = snap.collected_at
+    if not rows:
+        return
+
+    table = ChannelStats.__table__
+    stmt = insert(table)
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["channel_id"],
+        set_={
+            "snapshot_count": table.c.snapshot_count + new.snapshot_count,
+            "viewer_sum": table.c.viewer_sum + new.viewer_sum,
+            "peak_viewers": case((new.peak_viewers > table.c.peak_viewers, new.peak_viewers), else_=table.c.peak_viewers),
+            "previous_viewers": func.coalesce(new.previous_viewers, table.c.last_viewers),
+            "last_viewers": new.last_viewers,
+            "last_collected_at": new.last_collected_at,
+            "last_live_at": func.coalesce(new.last_live_at, table.c.last_live_at),
+        },
+    )
+    db.execute(stmt, list(rows.values()))
+
+
+def record_score(db: Session, channel_id: int, score: float, analyzed_at: datetime, extended: bool = False):
+    """Shift a newly stored analysis score into the channel's stats. Does not commit.
+
+    ``extended`` means the run only extended the current analysis row, so
+    the stored scores are unchanged and only the analysis time moves, as
+    ``rebuild`` would compute it.
+    """
+    table = ChannelStats.__table__
+    stmt = insert(table).values(
+        channel_id=channel_id,
+        last_score=score,
+        last_analyzed_at=analyzed_at,
+    )
+    if extended:
+        set_ = {"last_analyzed_at": stmt.excluded.last_analyzed_at}
+    else:
+        set_ = {
+            "previous_score": table.c.last_score,
+            "last_score": stmt.excluded.last_score,
+            "last_analyzed_at": stmt.excluded.last_analyzed_at,
+        }
+    db.execute(stmt.on_conflict_do_update(index_elements=["channel_id"], set_=set_))
+
+
+def set_scores(db: Session, channel_id: int, last_score: float, previous_score: float | None, analyzed_at: datetime):
+    """Overwrite the channel's score stats, as after its analysis history was
+    rewritten. Does not commit."""
+    table = ChannelStats.__table__
+    stmt = insert(table).values(
+        channel_id=channel_id,
+        last_score=last_score,
+        previous_score=previous_score,
+        last_analyzed_at=analyzed_at,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["channel_id"],
+        set_={
+            "last_score": stmt.excluded.last_score,
+            "previous_score": stmt.excluded.previous_score,
+            "last_analyzed_at": stmt.excluded.last_analyzed_at,
+        },
+    ))
+
+
+def _latest_two(db: Session, column, order_by) -> dict[int, list]:
+    """Newest two values of ``column`` per channel, newest first."""
+    model = column.class_
+    rn = func.row_number().over(partition_by=model.channel_id, order_by=order_by.desc()).label("rn")
+    ranked = db.query(model.channel_id, column.label("value"), order_by.label("at"), rn).subquery()
+    latest: dict[int, list] = {}
+    for row in db.query(ranked).filter(ranked.c.rn <= 2).order_by(ranked.c.channel_id, ranked.c.rn):
+        latest.setdefault(row.channel_id, []).append((row.value, row.at))
+    return latest
+
+
+def rebuild(db: Session) -> int:
+    """Recompute every channel's stats from rollups, raw snapshots and analyses.
+
+    Counts and peaks come from the daily rollups so archived or pruned
+    history is included. ``last_live_at`` is approximated by the last hourly
+    bucket with viewers, since liveness is not stored per snapshot.
+    Anomaly detector baselines start over.
+    """
+    stats: dict[int, dict] = {}
+
+    def row(channel_id: int) -> dict:
+        return stats.setdefault(channel_id, {
+            "channel_id": channel_id,
+            "snapshot_count": 0,
+            "viewer_sum": 0,
+            "peak_viewers": 0,
+            "last_viewers": None,
+            "previous_viewers": None,
+            "last_collected_at": None,
+            "last_live_at": None,
+            "last_score": None,
+            "previous_score": None,
+            "last_analyzed_at": None,
+        })
+
+    totals = (
+        db.query(
+            SnapshotRollup.channel_id,
+            func.sum(SnapshotRollup.sample_count),
+            func.sum(SnapshotRollup.viewer_sum),
+            func.max(SnapshotRollup.viewer_max),
+            func.max(SnapshotRollup.last_at),
+        )
+        .filter(SnapshotRollup.resolution == DAY)
+        .group_by(SnapshotRollup.channel_id)
+    )
+    for channel_id, count, total, peak, last_at in totals:
+        r = row(channel_id)
+        r.update(snapshot_count=count, viewer_sum=total, peak_viewers=peak, last_collected_at=last_at)
+
+    live = (
+        db.query(SnapshotRollup.channel_id, func.max(SnapshotRollup.last_at))
+        .filter(SnapshotRollup.resolution == HOUR, SnapshotRollup.viewer_max > 0)
+        .group_by(SnapshotRollup.channel_id)
+    )
+    for channel_id, last_at in live:
+        row(channel_id)["last_live_at"] = last_at
+
+    for channel_id, values in _latest_two(db, ViewerSnapshot.viewer_count, ViewerSnapshot.collected_at).items():
+        r = row(channel_id)
+        r["last_viewers"], r["last_collected_at"] = values[0]
+        if len(values) > 1:
+            r["previous_viewers"] = values[1][0]
+
+    analyzed_at = func.coalesce(AnalysisResult.valid_until, AnalysisResult.analyzed_at)
+    for channel_id, values in _latest_two(db, AnalysisResult.overall_score, analyzed_at).items():
+        r = row(channel_id)
+        r["last_score"], r["last_analyzed_at"] = values[0]
+        if len(values) > 1:
+            r["previous_score"] = values[1][0]
+
+    db.query(ChannelStats).delete(synchronize_session=False)
+    if stats:
+        db.execute(insert(ChannelStats.__table__), list(stats.values()))
+    db.commit()
+    logger.info("Rebuilt channel stats for %d channels", len(stats))
+    return len(stats)
+
+
+def ensure_stats(db: Session):
+    """Populate channel stats once for databases that predate them."""
+    if db.query(ChannelStats.channel_id).first() is None and db.query(ViewerSnapshot.id).first() is not None:
+        rebuild(db)
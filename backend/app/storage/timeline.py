@@ -0,0 +1,170 @@
+"""Compacted analysis history and the score timeline it serves.
+
+Analysis runs every ``ANALYZE_INTERVAL_MINUTES`` but a channel's score
+rarely moves between runs. ``store_analysis`` keeps one ``analysis_results``
+row per stretch of stable results: a run within tolerance of the channel's
+current row only moves that row's ``valid_until`` forward, and a new row
+(with its signal details) is stored when the score or confidence moves
+further. Tolerances are measured against the row's own values, so slow
+drift still starts a new row once it adds up.
+
+History stored before compaction can be compacted in place:
+
+    python -m app.storage.timeline compact
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, or_, update
+from sqlalchemy.orm import Session, defer
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.analysis_result import AnalysisResult
+from app.models.latest_analysis import ChannelLatestAnalysis
+from app.storage import stats
+from app.storage.latest import rebuild_latest
+
+logger = logging.getLogger(__name__)
+
+# Merged rows deleted per statement during compaction
+DELETE_BATCH = 500
+
+
+def within_tolerance(score: float, confidence: float, current_score: float, current_confidence: float) -> bool:
+    score_tolerance = settings.ANALYSIS_SCORE_TOLERANCE
+    confidence_tolerance = settings.ANALYSIS_CONFIDENCE_TOLERANCE
+    if score_tolerance < 0 or confidence_tolerance < 0:
+        return False
+    return (
+        abs(score - current_score) <= score_tolerance
+        and abs(confidence - current_confidence) <= confidence_tolerance
+    )
+
+
+def store_analysis(db: Session, channel_id: int, result: dict, analyzed_at: datetime) -> AnalysisResult:
+    """Extend the channel's current row or add a new one. Does not commit.
+
+    Returns the row now covering ``analyzed_at``.
+    """
+    latest = db.get(ChannelLatestAnalysis, channel_id)
+    if latest is not None and within_tolerance(
+        result["overall_score"], result["confidence"], latest.overall_score, latest.confidence
+    ):
+        current = db.get(
+            AnalysisResult,
+            latest.analysis_id,
+            options=[defer(AnalysisResult.signal_scores), defer(AnalysisResult.signal_details)],
+        )
+        if current is not None:
+            current.valid_until = analyzed_at
+            current.data_points = result["data_points"]
+            return current
+
+    analysis = AnalysisResult(
+        channel_id=channel_id,
+        overall_score=result["overall_score"],
+        confidence=result["confidence"],
+        signal_scores=result["signal_scores"],
+        signal_details=result["signal_details"],
+        data_points=result["data_points"],
+        analyzed_at=analyzed_at,
+        valid_until=analyzed_at,
+    )
+    db.add(analysis)
+    db.flush()
+    return analysis
+
+
+def score_timeline(db: Session, channel_id: int, since: datetime | None = None) -> list[tuple]:
+    """``(analyzed_at, valid_until, overall_score, confidence)`` rows overlapping
+    ``[since, now]``, oldest first."""
+    query = db.query(
+        AnalysisResult.analyzed_at,
+        func.coalesce(AnalysisResult.valid_until, AnalysisResult.analyzed_at),
+        AnalysisResult.overall_score,
+        AnalysisResult.confidence,
+    ).filter(AnalysisResult.channel_id == channel_id)
+    if since is not None:
+        query = query.filter(or_(AnalysisResult.analyzed_at >= since, AnalysisResult.valid_until >= since))
+    return [tuple(r) for r in query.order_by(AnalysisResult.analyzed_at.asc())]
+
+
+def compact_history(db: Session) -> tuple[int, int]:
+    """Merge runs of within-tolerance rows in place, channel by channel.
+
+    Returns ``(rows kept, rows removed)``.
+    """
+    channel_ids = [r[0] for r in db.query(AnalysisResult.channel_id).distinct()]
+    table = AnalysisResult.__table__
+    set_valid_until = update(table).where(table.c.id == bindparam("row_id")).values(valid_until=bindparam("until"))
+    kept = removed = 0
+    for channel_id in channel_ids:
+        rows = (
+            db.query(
+                AnalysisResult.id,
+                AnalysisResult.overall_score,
+                AnalysisResult.confidence,
+                AnalysisResult.analyzed_at,
+                AnalysisResult.valid_until,
+            )
+            .filter(AnalysisResult.channel_id == channel_id)
+            .order_by(AnalysisResult.analyzed_at.asc())
+            .all()
+        )
+        anchors: list[dict] = []
+        merged: list[int] = []
+        for id_, score, confidence, analyzed_at, valid_until in rows:
+            until = valid_until or analyzed_at
+            anchor = anchors[-1] if anchors else None
+            if anchor is not None and within_tolerance(score, confidence, anchor["score"], anchor["confidence"]):
+                anchor["until"] = max(anchor["until"], until)
+                merged.append(id_)
+            else:
+                anchors.append({"row_id": id_, "score": score, "confidence": confidence, "until": until})
+
+        if anchors:
+            db.execute(set_valid_until, [{"row_id": a["row_id"], "until": a["until"]} for a in anchors])
+        for i in range(0, len(merged), DELETE_BATCH):
+            db.query(AnalysisResult).filter(
+                AnalysisResult.id.in_(merged[i:i + DELETE_BATCH])
+            ).delete(synchronize_session=False)
+        if merged:
+            # The newest two rows, which channel_stats scores come from, may have merged
+            latest = sorted(anchors, key=lambda a: a["until"])[-2:]
+            stats.set_scores(
+                db, channel_id,
+                latest[-1]["score"],
+                latest[0]["score"] if len(latest) > 1 else None,
+                latest[-1]["until"],
+            )
+        db.commit()
+        kept += len(anchors)
+        removed += len(merged)
+
+    # Merged rows may have been a channel's latest
+    rebuild_latest(db)
+    logger.info("Compacted analysis history: kept %d rows, removed %d", kept, removed)
+    return kept, removed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compact stored analysis history")
+    parser.add_argument("command", choices=["compact"])
+    parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        kept, removed = compact_history(db)
+    finally:
+        db.close()
+    print(f"kept {kept} analysis rows, removed {removed}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
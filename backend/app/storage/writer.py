@@ -0,0 +1,291 @@
+"""Write-behind ingestion of collection results.
+
+Collectors ``submit`` one ``Collection`` per channel per tick. A single
+writer task drains the queue and writes up to ``INGEST_BATCH_SIZE`` records
+in one transaction (one fsync under WAL), or whatever has arrived after
+``INGEST_FLUSH_SECONDS``. The queue is bounded, so collectors wait when
+the disk falls behind, and ``stop`` flushes everything still pending.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import SessionLocal, run_db
+from app.models.channel import Channel
+from app.models.chat_metric import ChatMetric
+from app.models.snapshot import ViewerSnapshot
+from app.storage import anomalies, rollups, stats
+from app.storage.latest import record_categories
+from app.utils.live_hub import ANOMALIES, channel_topic, live_hub
+from app.utils.metrics import BACKLOG, INGEST_RECORDS, registry
+from app.utils.response_cache import channel_tag, response_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Collection:
+    """One channel's results from a collection pass."""
+
+    channel_id: int
+    viewers: dict | None = None
+    metrics: dict | None = None
+    info: dict | None = None
+    collected_at: datetime | None = None
+
+
+@dataclass
+class WriteResult:
+    """What a committed write must invalidate and publish."""
+
+    tags: set[str] = field(default_factory=set)
+    # (topic, kind, data, key) live feed messages
+    messages: list[tuple] = field(default_factory=list)
+
+
+class _Snapshot(NamedTuple):
+    channel_id: int
+    viewer_count: int
+    chatter_count: int
+    category: str | None
+    collected_at: datetime
+
+
+def write_collections(records: list[Collection]) -> WriteResult:
+    """Persist collection results in a single transaction.
+
+    Everything the caller announces afterwards is read before the commit,
+    so nothing is refreshed from the database once it has been written.
+    """
+    db = SessionLocal()
+    try:
+        channels = {
+            c.id: c for c in
+            db.query(Channel).filter(Channel.id.in_({r.channel_id for r in records}))
+        }
+        snapshots = []
+        chat_rows = []
+        live = set()
+        categories = {}
+        for record in records:
+            channel = channels.get(record.channel_id)
+            if channel is None:
+                continue
+            collected_at = record.collected_at or datetime.utcnow()
+            if record.info:
+                category = channel.category
+                for key, value in record.info.items():
+                    if hasattr(channel, key) and value is not None:
+                        setattr(channel, key, value)
+                if channel.category != category:
+                    categories[channel.id] = channel.category
+
+            if record.viewers:
+                channel.is_live = record.viewers.get("is_live", False)
+                if channel.is_live:
+                    live.add(channel.id)
+                snapshots.append(_Snapshot(
+                    channel_id=channel.id,
+                    viewer_count=record.viewers.get("viewer_count", 0),
+                    chatter_count=record.viewers.get("chatter_count", 0),
+                    category=record.viewers.get("category"),
+                    collected_at=collected_at,
+                ))
+
+            metrics = record.metrics
+            if metrics and metrics.get("message_count", 0) > 0:
+                chat_rows.append({
+                    "channel_id": channel.id,
+                    "window_start": metrics["window_start"],
+                    "window_end": metrics["window_end"],
+                    "message_count": metrics["message_count"],
+                    "unique_chatters": metrics["unique_chatters"],
+                    "message_entropy": metrics["message_entropy"],
+                    "unique_message_ratio": metrics["unique_message_ratio"],
+                    "avg_time_between_msgs": metrics["avg_time_between_msgs"],
+                })
+
+            channel.last_collected = collected_at
+
+        if snapshots:
+            db.execute(insert(ViewerSnapshot.__table__), [s._asdict() for s in snapshots])
+        if chat_rows:
+            db.execute(insert(ChatMetric.__table__), chat_rows)
+        if categories:
+            record_categories(db, categories)
+        found = anomalies.detect(db, snapshots, live)
+        rollups.apply_snapshots(db, snapshots)
+        stats.apply_snapshots(db, snapshots, live)
+        db.flush()
+
+        result = WriteResult(tags={channel_tag(c.platform, c.username) for c in channels.values()})
+        if any(r.info for r in records):
+            # Names and avatars are shown on the leaderboard
+            result.tags.add("leaderboard")
+        if found:
+            result.tags.add("anomalies")
+        for snap in snapshots:
+            channel = channels[snap.channel_id]
+            result.messages.append((channel_topic(channel.platform, channel.username), "viewers", {
+                "channel_id": channel.id,
+                "viewer_count": snap.viewer_count,
+                "chatter_count": snap.chatter_count,
+                "is_live": channel.id in live,
+                "collected_at": snap.collected_at.isoformat(),
+            }, None))
+        for anomaly in found:
+            channel = channels[anomaly.channel_id]
+            data = anomalies.anomaly_dict(anomaly, channel)
+            data["detected_at"] = data["detected_at"].isoformat()
+            result.messages.append((channel_topic(channel.platform, channel.username), "anomaly", data, data["id"]))
+            result.messages.append((ANOMALIES, "anomaly", data, data["id"]))
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def announce(result: WriteResult):
+    """Invalidate cached responses and publish live updates for a committed write."""
+    response_cache.invalidate(*result.tags)
+    for topic, kind, data, key in result.messages:
+        live_hub.publish(topic, kind, data, key=key)
+
+
+class IngestWriter:
+
+    def __init__(self, batch_size: int = 500, flush_seconds: float = 2.0, queue_size: int = 5000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue_size = queue_size
+        self.written = 0
+        self.failed = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything queued so far and stop the writer task."""
+        if self._task is None:
+            return
+        try:
+            await self._put(None)
+        except RuntimeError:
+            pass
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._queue = None
+
+    async def submit(self, record: Collection):
+        """Queue a record, waiting while the queue is full.
+
+        Without a running writer (CLI tools) the record is written immediately.
+        Raises RuntimeError if the writer task has died.
+        """
+        if record.collected_at is None:
+            record.collected_at = datetime.utcnow()
+        if self._task is None:
+            await self._announce(await run_db(write_collections, [record]))
+            return
+        await self._put(record)
+
+    async def _put(self, record: Collection | None):
+        if self._task.done():
+            raise RuntimeError(f"Ingest writer is not running: {self._task_error()}")
+        try:
+            self._queue.put_nowait(record)
+            return
+        except asyncio.QueueFull:
+            pass
+        # Wait for room, unless the writer dies and never makes any
+        put = asyncio.ensure_future(self._queue.put(record))
+        await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            raise RuntimeError(f"Ingest writer is not running: {self._task_error()}")
+
+    def _task_error(self):
+        if self._task.cancelled():
+            return "cancelled"
+        return self._task.exception() or "stopped"
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await self._queue.get()
+            if record is None:
+                break
+            batch = [record]
+            deadline = loop.time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[Collection]):
+        try:
+            result = await run_db(write_collections, batch)
+        except Exception as e:
+            logger.error("Bulk write of %d collection records failed: %s", len(batch), e)
+        else:
+            self.written += len(batch)
+            INGEST_RECORDS.inc(len(batch), outcome="written")
+            await self._announce(result)
+            return
+
+        # Isolate the bad record rather than dropping the whole batch
+        for record in batch:
+            try:
+                result = await run_db(write_collections, [record])
+            except Exception as e:
+                self.failed += 1
+                INGEST_RECORDS.inc(outcome="dropped")
+                logger.error("Dropping collection record for channel %d: %s", record.channel_id, e)
+                continue
+            self.written += 1
+            INGEST_RECORDS.inc(outcome="written")
+            await self._announce(result)
+
+    async def _announce(self, result: WriteResult):
+        # The records are committed by now: a failure here must not retry them
+        try:
+            # Off the event loop, since the response cache may be remote
+            await run_db(announce, result)
+        except Exception as e:
+            logger.error("Announcing written collections failed: %s", e)
+
+
+ingest_writer = IngestWriter(
+    batch_size=settings.INGEST_BATCH_SIZE,
+    flush_seconds=settings.INGEST_FLUSH_SECONDS,
+    queue_size=settings.INGEST_QUEUE_SIZE,
+)
+registry.register_callback(lambda: BACKLOG.set(ingest_writer.pending, queue="ingest"))
@@ -0,0 +1,340 @@
+"""Tweet outbox and the dispatcher that posts it.
+
+Tweet strategies only ``enqueue`` a row in ``tweet_outbox``. The dispatcher
+task posts due rows one at a time, calling Twitter from a thread of its own
+so neither the event loop nor the database workers wait on the network.
+
+- Idempotency: each row carries a unique key (by default the tweet type,
+  channel and hour), so a scheduled cycle and a manual trigger racing each
+  other queue one tweet. A retry that Twitter rejects as duplicate content
+  was already posted and is marked sent.
+- Retries: network and server errors are retried with exponential backoff
+  from ``TWEET_RETRY_SECONDS`` up to ``TWEET_MAX_ATTEMPTS`` times; other
+  client errors fail the row at once. A row is leased (its next attempt
+  pushed back) before each call, so a crash mid-post retries rather than
+  loses it.
+- Rate limits: a 429 pauses dispatch until the reset time Twitter reports,
+  without spending an attempt, and no more than ``TWEET_DAILY_LIMIT``
+  tweets are posted in any 24 hours.
+
+Posted tweets are recorded in ``tweet_logs`` as before.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import tweepy
+from sqlalchemy.dialects.sqlite import insert
+
+from app.config import settings
+from app.database import SessionLocal, run_db
+from app.models.tweet_log import TweetLog
+from app.models.tweet_outbox import TweetOutbox
+from app.utils.metrics import TWEETS
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Longest the dispatcher sleeps before checking for due rows on its own
+POLL_SECONDS = 30
+# Pause after a 429 that carries no reset time
+DEFAULT_RATE_LIMIT_SECONDS = 900
+MAX_TWEET_LENGTH = 280
+
+
+def twitter_configured() -> bool:
+    return all([
+        settings.TWITTER_API_KEY,
+        settings.TWITTER_API_SECRET,
+        settings.TWITTER_ACCESS_TOKEN,
+        settings.TWITTER_ACCESS_TOKEN_SECRET,
+    ])
+
+
+def idempotency_key(tweet_type: str, channel_id: int | None, at: datetime | None = None) -> str:
+    at = at or datetime.utcnow()
+    return f"{tweet_type}:{channel_id if channel_id is not None else '-'}:{at:%Y-%m-%dT%H}"
+
+
+def enqueue(db, text: str, tweet_type: str, channel_id: int | None = None, key: str | None = None) -> bool:
+    """Queue a tweet for the dispatcher and commit.
+
+    Returns False when a tweet with the same idempotency key is already queued.
+    """
+    # Truncate to 280 chars (Twitter limit)
+    if len(text) > MAX_TWEET_LENGTH:
+        text = text[:MAX_TWEET_LENGTH - 3] + "..."
+    now = datetime.utcnow()
+    stmt = insert(TweetOutbox).values(
+        idempotency_key=key or idempotency_key(tweet_type, channel_id, now),
+        channel_id=channel_id,
+        tweet_type=tweet_type,
+        tweet_text=text,
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now,
+    ).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    queued = db.execute(stmt).rowcount == 1
+    db.commit()
+    if queued:
+        logger.info("Tweet queued (type=%s): %s", tweet_type, text[:80])
+        tweet_dispatcher.wake()
+    return queued
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.TWEET_RETRY_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def _rate_limit_reset(e: tweepy.TooManyRequests) -> datetime:
+    headers = getattr(e.response, "headers", None) or {}
+    reset = headers.get("x-rate-limit-reset")
+    if headers.get("x-user-limit-24hour-remaining") == "0":
+        reset = headers.get("x-user-limit-24hour-reset", reset)
+    try:
+        return datetime.utcfromtimestamp(int(reset))
+    except (TypeError, ValueError):
+        return datetime.utcnow() + timedelta(seconds=DEFAULT_RATE_LIMIT_SECONDS)
+
+
+def _lease_next(now: datetime) -> dict | None:
+    """The oldest due pending row, its next attempt pushed back as a lease.
+
+    The lease is a compare-and-set on the row's status and next attempt, so
+    two dispatchers (e.g. in separate processes) never lease the same row.
+    """
+    db = SessionLocal()
+    try:
+        while True:
+            row = (
+                db.query(
+                    TweetOutbox.id,
+                    TweetOutbox.channel_id,
+                    TweetOutbox.tweet_type,
+                    TweetOutbox.tweet_text,
+                    TweetOutbox.attempts,
+                    TweetOutbox.next_attempt_at,
+                )
+                .filter(TweetOutbox.status == PENDING, TweetOutbox.next_attempt_at <= now)
+                .order_by(TweetOutbox.next_attempt_at, TweetOutbox.id)
+                .first()
+            )
+            if row is None:
+                return None
+            attempts = row.attempts + 1
+            leased = (
+                db.query(TweetOutbox)
+                .filter(
+                    TweetOutbox.id == row.id,
+                    TweetOutbox.status == PENDING,
+                    TweetOutbox.next_attempt_at == row.next_attempt_at,
+                )
+                .update(
+                    {"attempts": attempts, "next_attempt_at": now + _retry_delay(attempts)},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if leased == 1:
+                return {
+                    "id": row.id,
+                    "channel_id": row.channel_id,
+                    "tweet_type": row.tweet_type,
+                    "tweet_text": row.tweet_text,
+                    "attempts": attempts,
+                }
+            # Leased elsewhere since it was read; its next attempt has moved on
+    finally:
+        db.close()
+
+
+def _update(outbox_id: int, **values):
+    db = SessionLocal()
+    try:
+        db.query(TweetOutbox).filter(TweetOutbox.id == outbox_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _mark_sent(row: dict, tweet_id: str | None, sent_at: datetime):
+    db = SessionLocal()
+    try:
+        db.query(TweetOutbox).filter(TweetOutbox.id == row["id"]).update(
+            {"status": SENT, "sent_at": sent_at, "twitter_tweet_id": tweet_id, "last_error": None},
+            synchronize_session=False,
+        )
+        db.add(TweetLog(
+            channel_id=row["channel_id"],
+            tweet_type=row["tweet_type"],
+            tweet_text=row["tweet_text"],
+            twitter_tweet_id=tweet_id,
+            tweeted_at=sent_at,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _recent_sends(since: datetime) -> list[datetime]:
+    db = SessionLocal()
+    try:
+        return [
+            r[0] for r in
+            db.query(TweetLog.tweeted_at).filter(TweetLog.tweeted_at >= since).order_by(TweetLog.tweeted_at)
+        ]
+    finally:
+        db.close()
+
+
+class TweetDispatcher:
+
+    def __init__(self, max_attempts: int = 5, daily_limit: int = 50):
+        self.max_attempts = max_attempts
+        self.daily_limit = daily_limit
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.paused_until: datetime | None = None
+        self._client: tweepy.Client | None = None
+        self._sends: deque[datetime] = deque()
+        self._executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tweet")
+        self._sends = deque(await run_db(_recent_sends, datetime.utcnow() - timedelta(hours=24)))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop dispatching. Unsent rows stay pending for the next start."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def wake(self):
+        """Check for due rows now; callable from any thread."""
+        loop = self._loop
+        if self._task is None or loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        while True:
+            try:
+                delay = await self._dispatch_due()
+            except Exception as e:
+                logger.error("Tweet dispatch failed: %s", e)
+                delay = POLL_SECONDS
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _pause_remaining(self, now: datetime) -> float | None:
+        """Seconds until posting is allowed again, or None if it is now."""
+        if self.paused_until is not None and now < self.paused_until:
+            return (self.paused_until - now).total_seconds()
+        while self._sends and self._sends[0] <= now - timedelta(hours=24):
+            self._sends.popleft()
+        if self.daily_limit > 0 and len(self._sends) >= self.daily_limit:
+            return (self._sends[0] + timedelta(hours=24) - now).total_seconds()
+        return None
+
+    async def _dispatch_due(self) -> float:
+        """Post due rows until none are left; returns seconds to sleep."""
+        while True:
+            now = datetime.utcnow()
+            remaining = self._pause_remaining(now)
+            if remaining is not None:
+                return min(max(remaining, 1.0), POLL_SECONDS)
+            row = await run_db(_lease_next, now)
+            if row is None:
+                return POLL_SECONDS
+            await self._send(row)
+
+    def _create_tweet(self, text: str) -> str | None:
+        if self._client is None:
+            self._client = tweepy.Client(
+                consumer_key=settings.TWITTER_API_KEY,
+                consumer_secret=settings.TWITTER_API_SECRET,
+                access_token=settings.TWITTER_ACCESS_TOKEN,
+                access_token_secret=settings.TWITTER_ACCESS_TOKEN_SECRET,
+            )
+        response = self._client.create_tweet(text=text)
+        return str(response.data["id"]) if response.data else None
+
+    async def _send(self, row: dict):
+        if not twitter_configured():
+            await run_db(_update, row["id"], status=FAILED, last_error="Twitter credentials not configured")
+            self.failed += 1
+            return
+        try:
+            tweet_id = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._create_tweet, row["tweet_text"]
+            )
+        except tweepy.TooManyRequests as e:
+            self.paused_until = _rate_limit_reset(e)
+            TWEETS.inc(outcome="rate_limited")
+            logger.warning("Twitter rate limit reached; pausing tweets until %s", self.paused_until)
+            # Waiting out a rate limit does not count as an attempt
+            await run_db(
+                _update, row["id"],
+                attempts=row["attempts"] - 1, next_attempt_at=self.paused_until, last_error=str(e),
+            )
+            return
+        except (tweepy.BadRequest, tweepy.Unauthorized, tweepy.Forbidden, tweepy.NotFound) as e:
+            if "duplicate" in str(e).lower():
+                # An earlier attempt got through before its response was lost
+                await self._sent(row, None)
+                return
+            self.failed += 1
+            TWEETS.inc(outcome="failed")
+            logger.error("Tweet %d rejected: %s", row["id"], e)
+            await run_db(_update, row["id"], status=FAILED, last_error=str(e))
+            return
+        except Exception as e:
+            if row["attempts"] >= self.max_attempts:
+                self.failed += 1
+                TWEETS.inc(outcome="failed")
+                logger.error("Tweet %d failed after %d attempts: %s", row["id"], row["attempts"], e)
+                await run_db(_update, row["id"], status=FAILED, last_error=str(e))
+            else:
+                self.retried += 1
+                TWEETS.inc(outcome="retried")
+                logger.warning("Tweet %d attempt %d failed, will retry: %s", row["id"], row["attempts"], e)
+                await run_db(_update, row["id"], last_error=str(e))
+            return
+        await self._sent(row, tweet_id)
+
+    async def _sent(self, row: dict, tweet_id: str | None):
+        sent_at = datetime.utcnow()
+        await run_db(_mark_sent, row, tweet_id, sent_at)
+        self._sends.append(sent_at)
+        self.sent += 1
+        TWEETS.inc(outcome="sent")
+        logger.info("Tweet posted (type=%s): %s", row["tweet_type"], row["tweet_text"][:80])
+
+
+tweet_dispatcher = TweetDispatcher(
+    max_attempts=settings.TWEET_MAX_ATTEMPTS,
+    daily_limit=settings.TWEET_DAILY_LIMIT,
+)
@@ -5,23 +5,27 @@ Tweet types:
   high_score   — Channel with a high suspicion score (>50)
   score_change — Significant score change between analyses
   milestone    — Platform tracking milestones (every 25 channels)
-  anomaly      — Live channel with a sudden viewer spike
+  anomaly      — Live channel with a viewer spike flagged at ingest
 """
 
 import logging
 import random
 from datetime import datetime, timedelta
 
-import tweepy
-from sqlalchemy import func
+from sqlalchemy import Float, and_, cast, exists, func
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import SessionLocal
+from app.database import SessionLocal, run_db
 from app.models.channel import Channel
 from app.models.analysis_result import AnalysisResult
-from app.models.snapshot import ViewerSnapshot
+from app.models.anomaly import Anomaly
+from app.models.channel_stats import ChannelStats, score_delta
+from app.models.latest_analysis import ChannelLatestAnalysis
 from app.models.tweet_log import TweetLog
+from app.models.tweet_outbox import TweetOutbox
+from app.twitter.outbox import PENDING, enqueue, twitter_configured
+from app.utils.metrics import JOB_DURATION
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,11 @@ SCORE_LABELS = {
     (80, 101): "High",
 }
 
+# An anomaly tweet needs a jump of at least this much over a previous
+# snapshot above ANOMALY_TWEET_MIN_VIEWERS, whatever the ingest thresholds
+ANOMALY_TWEET_MIN_PERCENT = 50
+ANOMALY_TWEET_MIN_VIEWERS = 100
+
 # --- Tweet templates ---
 
 HIGH_SCORE_TEMPLATES = [
@@ -69,112 +78,89 @@ def _get_label(score: float) -> str:
     return "Unknown"
 
 
-def _get_client() -> tweepy.Client | None:
-    """Create a Tweepy v2 client if credentials are configured."""
-    if not all([
-        settings.TWITTER_API_KEY,
-        settings.TWITTER_API_SECRET,
-        settings.TWITTER_ACCESS_TOKEN,
-        settings.TWITTER_ACCESS_TOKEN_SECRET,
-    ]):
-        logger.info("Twitter credentials not configured — skipping tweet")
-        return None
-
-    return tweepy.Client(
-        consumer_key=settings.TWITTER_API_KEY,
-        consumer_secret=settings.TWITTER_API_SECRET,
-        access_token=settings.TWITTER_ACCESS_TOKEN,
-        access_token_secret=settings.TWITTER_ACCESS_TOKEN_SECRET,
-    )
-
-
 def _channel_url(platform: str, username: str) -> str:
     return f"{settings.SITE_URL}/channel/{platform}/{username}"
 
 
 def _was_recently_tweeted(db: Session, channel_id: int | None, tweet_type: str, hours: int = 24) -> bool:
-    """Check if we already tweeted about this channel/type recently."""
+    """Check if we already tweeted (or queued a tweet) about this channel/type recently."""
     cutoff = datetime.utcnow() - timedelta(hours=hours)
-    q = db.query(TweetLog).filter(
+    q = db.query(TweetLog.id).filter(
         TweetLog.tweet_type == tweet_type,
         TweetLog.tweeted_at >= cutoff,
     )
+    queued = db.query(TweetOutbox.id).filter(
+        TweetOutbox.tweet_type == tweet_type,
+        TweetOutbox.status == PENDING,
+    )
     if channel_id is not None:
         q = q.filter(TweetLog.channel_id == channel_id)
-    return q.first() is not None
+        queued = queued.filter(TweetOutbox.channel_id == channel_id)
+    return q.first() is not None or queued.first() is not None
 
 
-def _post_tweet(db: Session, text: str, tweet_type: str, channel_id: int | None = None) -> bool:
-    """Post a tweet and log it. Returns True on success."""
-    client = _get_client()
-    if not client:
+def _queue_tweet(db: Session, text: str, tweet_type: str, channel_id: int | None = None) -> bool:
+    """Queue a tweet for the dispatcher. Returns True if it was queued."""
+    if not twitter_configured():
+        logger.info("Twitter credentials not configured — skipping tweet")
         return False
+    return enqueue(db, text, tweet_type, channel_id)
 
-    # Truncate to 280 chars (Twitter limit)
-    if len(text) > 280:
-        text = text[:277] + "..."
 
-    try:
-        response = client.create_tweet(text=text)
-        tweet_id = str(response.data["id"]) if response.data else None
-
-        log = TweetLog(
-            channel_id=channel_id,
-            tweet_type=tweet_type,
-            tweet_text=text,
-            twitter_tweet_id=tweet_id,
-        )
-        db.add(log)
-        db.commit()
-        logger.info("Tweet posted (type=%s): %s", tweet_type, text[:80])
-        return True
-    except tweepy.TweepyException as e:
-        logger.error("Failed to post tweet: %s", e)
-        return False
+def _not_recently_tweeted(tweet_type: str, hours: int):
+    """Filter out channels tweeted about as ``tweet_type`` within ``hours``,
+    or with such a tweet still queued."""
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    return and_(
+        ~exists().where(
+            TweetLog.channel_id == Channel.id,
+            TweetLog.tweet_type == tweet_type,
+            TweetLog.tweeted_at >= cutoff,
+        ),
+        ~exists().where(
+            TweetOutbox.channel_id == Channel.id,
+            TweetOutbox.tweet_type == tweet_type,
+            TweetOutbox.status == PENDING,
+        ),
+    )
 
 
-def _try_high_score_tweet(db: Session) -> bool:
-    """Tweet about a channel with a high suspicion score."""
-    # Find channels with score > 50 that haven't been tweeted about recently
-    cutoff = datetime.utcnow() - timedelta(hours=48)
-    recently_tweeted_ids = (
-        db.query(TweetLog.channel_id)
-        .filter(TweetLog.tweet_type == "high_score", TweetLog.tweeted_at >= cutoff)
-        .all()
-    )
-    exclude_ids = {r[0] for r in recently_tweeted_ids if r[0]}
+def _candidates(db: Session, tweet_type: str, hours: int):
+    """Channels with their running stats, minus recent tweets of ``tweet_type``.
 
-    # Get latest analysis for each channel, score > 50
-    subq = (
-        db.query(
-            AnalysisResult.channel_id,
-            func.max(AnalysisResult.analyzed_at).label("latest"),
-        )
-        .group_by(AnalysisResult.channel_id)
-        .subquery()
+    ``channel_stats`` already holds each channel's last two scores, so a
+    strategy is a single query over it, filtered, ordered and limited in SQL.
+    """
+    return (
+        db.query(Channel, ChannelStats)
+        .join(ChannelStats, ChannelStats.channel_id == Channel.id)
+        .filter(_not_recently_tweeted(tweet_type, hours))
     )
 
-    results = (
-        db.query(AnalysisResult, Channel)
-        .join(subq, (AnalysisResult.channel_id == subq.c.channel_id) & (AnalysisResult.analyzed_at == subq.c.latest))
-        .join(Channel, AnalysisResult.channel_id == Channel.id)
-        .filter(AnalysisResult.overall_score > 50)
-        .order_by(AnalysisResult.overall_score.desc())
+
+def _try_high_score_tweet(db: Session) -> bool:
+    """Tweet about a channel with a high suspicion score."""
+    # Top 5 latest scores > 50 not tweeted about in 48h, read down the score index
+    candidates = (
+        db.query(ChannelLatestAnalysis, Channel)
+        .join(Channel, ChannelLatestAnalysis.channel_id == Channel.id)
+        .filter(ChannelLatestAnalysis.overall_score > 50, _not_recently_tweeted("high_score", 48))
+        .order_by(ChannelLatestAnalysis.overall_score.desc())
+        .limit(5)
         .all()
     )
-
-    candidates = [(ar, ch) for ar, ch in results if ch.id not in exclude_ids]
     if not candidates:
         return False
 
     # Pick a random one from top 5 for variety
-    ar, channel = random.choice(candidates[:5])
+    latest, channel = random.choice(candidates)
+    signal_scores = db.query(AnalysisResult.signal_scores).filter(AnalysisResult.id == latest.analysis_id).scalar()
 
     # Find top signal
     top_signal_name = "Unknown"
     top_signal_score = 0
-    if ar.signal_scores:
-        for s in ar.signal_scores:
+    if signal_scores:
+        for s in signal_scores:
             if s.get("score", 0) > top_signal_score:
                 top_signal_score = s["score"]
                 top_signal_name = s["name"]
@@ -182,54 +168,31 @@ def _try_high_score_tweet(db: Session) -> bool:
     text = random.choice(HIGH_SCORE_TEMPLATES).format(
         display_name=channel.display_name,
         platform=channel.platform.capitalize(),
-        score=round(ar.overall_score),
-        label=_get_label(ar.overall_score),
+        score=round(latest.overall_score),
+        label=_get_label(latest.overall_score),
         top_signal=top_signal_name.replace("_", " ").title(),
         top_score=round(top_signal_score),
         url=_channel_url(channel.platform, channel.username),
     )
-    return _post_tweet(db, text, "high_score", channel.id)
+    return _queue_tweet(db, text, "high_score", channel.id)
 
 
 def _try_score_change_tweet(db: Session) -> bool:
     """Tweet about a significant score change (>15 points)."""
-    # Find channels with 2+ analyses
-    channels_with_analyses = (
-        db.query(AnalysisResult.channel_id)
-        .group_by(AnalysisResult.channel_id)
-        .having(func.count(AnalysisResult.id) >= 2)
-        .all()
+    # Biggest change between a channel's last two analyses, if 15+ points
+    best = (
+        _candidates(db, "score_change", 48)
+        .filter(score_delta >= 15)
+        .order_by(score_delta.desc())
+        .first()
     )
-
-    candidates = []
-    for (channel_id,) in channels_with_analyses:
-        if _was_recently_tweeted(db, channel_id, "score_change", hours=48):
-            continue
-
-        recent = (
-            db.query(AnalysisResult)
-            .filter(AnalysisResult.channel_id == channel_id)
-            .order_by(AnalysisResult.analyzed_at.desc())
-            .limit(2)
-            .all()
-        )
-        if len(recent) < 2:
-            continue
-
-        new_score = recent[0].overall_score
-        old_score = recent[1].overall_score
-        delta = abs(new_score - old_score)
-        if delta >= 15:
-            channel = db.query(Channel).get(channel_id)
-            if channel:
-                candidates.append((channel, old_score, new_score, delta))
-
-    if not candidates:
+    if best is None:
         return False
 
-    # Pick the biggest change
-    candidates.sort(key=lambda x: x[3], reverse=True)
-    channel, old_score, new_score, delta = candidates[0]
+    channel, stats = best
+    new_score = stats.last_score
+    old_score = stats.previous_score
+    delta = abs(new_score - old_score)
 
     direction = "Increase" if new_score > old_score else "Decrease"
     verb = "jumped" if new_score > old_score else "dropped"
@@ -244,7 +207,7 @@ def _try_score_change_tweet(db: Session) -> bool:
         verb=verb,
         url=_channel_url(channel.platform, channel.username),
     )
-    return _post_tweet(db, text, "score_change", channel.id)
+    return _queue_tweet(db, text, "score_change", channel.id)
 
 
 def _try_milestone_tweet(db: Session) -> bool:
@@ -261,48 +224,38 @@ def _try_milestone_tweet(db: Session) -> bool:
         count=count,
         site_url=settings.SITE_URL,
     )
-    return _post_tweet(db, text, "milestone")
+    return _queue_tweet(db, text, "milestone")
 
 
 def _try_anomaly_tweet(db: Session) -> bool:
     """Tweet about a live channel with a sudden viewer spike."""
-    live_channels = db.query(Channel).filter(Channel.is_live == True).all()
-    candidates = []
-
-    for channel in live_channels:
-        if _was_recently_tweeted(db, channel.id, "anomaly", hours=24):
-            continue
-
-        snapshots = (
-            db.query(ViewerSnapshot)
-            .filter(ViewerSnapshot.channel_id == channel.id)
-            .order_by(ViewerSnapshot.collected_at.desc())
-            .limit(3)
-            .all()
+    # Biggest jump flagged at ingest since the last cycle. Only spikes: their
+    # baseline is the previous snapshot, which the templates quote, while a
+    # zscore baseline is a rolling mean.
+    cutoff = datetime.utcnow() - timedelta(hours=settings.TWEET_INTERVAL_HOURS)
+    rise = cast(Anomaly.viewer_count, Float) / Anomaly.baseline
+    best = (
+        db.query(Anomaly, Channel, ChannelStats.last_score)
+        .join(Channel, Anomaly.channel_id == Channel.id)
+        .outerjoin(ChannelStats, ChannelStats.channel_id == Channel.id)
+        .filter(
+            Anomaly.detected_at >= cutoff,
+            Anomaly.kind == "spike",
+            Anomaly.baseline > ANOMALY_TWEET_MIN_VIEWERS,
+            rise >= 1 + ANOMALY_TWEET_MIN_PERCENT / 100,
+            Channel.is_live == True,
+            _not_recently_tweeted("anomaly", 24),
         )
-        if len(snapshots) < 2:
-            continue
-
-        new_v = snapshots[0].viewer_count
-        old_v = snapshots[1].viewer_count
-        if old_v > 100 and new_v > old_v:
-            percent = ((new_v - old_v) / old_v) * 100
-            if percent >= 50:
-                # Get latest score
-                latest = (
-                    db.query(AnalysisResult)
-                    .filter(AnalysisResult.channel_id == channel.id)
-                    .order_by(AnalysisResult.analyzed_at.desc())
-                    .first()
-                )
-                score = latest.overall_score if latest else 0
-                candidates.append((channel, old_v, new_v, percent, score))
-
-    if not candidates:
+        .order_by(rise.desc())
+        .first()
+    )
+    if best is None:
         return False
 
-    candidates.sort(key=lambda x: x[3], reverse=True)
-    channel, old_v, new_v, percent, score = candidates[0]
+    anomaly, channel, score = best
+    new_v = anomaly.viewer_count
+    old_v = round(anomaly.baseline)
+    percent = ((new_v - old_v) / old_v) * 100
 
     text = random.choice(ANOMALY_TEMPLATES).format(
         display_name=channel.display_name,
@@ -310,10 +263,10 @@ def _try_anomaly_tweet(db: Session) -> bool:
         old_viewers=old_v,
         new_viewers=new_v,
         percent=round(percent),
-        score=round(score),
+        score=round(score or 0),
         url=_channel_url(channel.platform, channel.username),
     )
-    return _post_tweet(db, text, "anomaly", channel.id)
+    return _queue_tweet(db, text, "anomaly", channel.id)
 
 
 def _try_daily_recap_tweet(db: Session) -> bool:
@@ -325,45 +278,28 @@ def _try_daily_recap_tweet(db: Session) -> bool:
     if count == 0:
         return False
 
-    # Get latest score per channel
-    subq = (
-        db.query(
-            AnalysisResult.channel_id,
-            func.max(AnalysisResult.analyzed_at).label("latest"),
-        )
-        .group_by(AnalysisResult.channel_id)
-        .subquery()
-    )
-    results = (
-        db.query(AnalysisResult, Channel)
-        .join(subq, (AnalysisResult.channel_id == subq.c.channel_id) & (AnalysisResult.analyzed_at == subq.c.latest))
-        .join(Channel, AnalysisResult.channel_id == Channel.id)
-        .order_by(AnalysisResult.overall_score.desc())
-        .all()
+    # Highest latest score, and the average across channels
+    top = (
+        db.query(ChannelLatestAnalysis.overall_score, Channel.display_name)
+        .join(Channel, ChannelLatestAnalysis.channel_id == Channel.id)
+        .order_by(ChannelLatestAnalysis.overall_score.desc())
+        .first()
     )
-
-    if not results:
+    if top is None:
         return False
-
-    top_ar, top_ch = results[0]
-    avg = sum(ar.overall_score for ar, _ in results) / len(results)
+    avg = db.query(func.avg(ChannelLatestAnalysis.overall_score)).scalar()
 
     text = random.choice(DAILY_RECAP_TEMPLATES).format(
         count=count,
-        top_channel=top_ch.display_name,
-        top_score=round(top_ar.overall_score),
+        top_channel=top.display_name,
+        top_score=round(top.overall_score),
         avg_score=round(avg),
         site_url=settings.SITE_URL,
     )
-    return _post_tweet(db, text, "daily_recap")
+    return _queue_tweet(db, text, "daily_recap")
 
 
-async def post_interesting_tweet():
-    """
-    Main entry point — called by the scheduler.
-    Tries different tweet types in priority order.
-    Posts at most ONE tweet per invocation.
-    """
+def _run_tweet_cycle():
     db = SessionLocal()
     try:
         # Priority order: anomaly > score_change > high_score > daily_recap > milestone
@@ -378,7 +314,7 @@ async def post_interesting_tweet():
         for name, strategy in strategies:
             try:
                 if strategy(db):
-                    logger.info("Posted tweet type: %s", name)
+                    logger.info("Queued tweet type: %s", name)
                     return
             except Exception as e:
                 logger.error("Tweet strategy %s failed: %s", name, e)
@@ -387,3 +323,13 @@ async def post_interesting_tweet():
         logger.info("No interesting stats to tweet right now")
     finally:
         db.close()
+
+
+async def post_interesting_tweet():
+    """
+    Main entry point — called by the scheduler.
+    Tries different tweet types in priority order.
+    Queues at most ONE tweet per invocation; the outbox dispatcher posts it.
+    """
+    with JOB_DURATION.time(job="tweet"):
+        await run_db(_run_tweet_cycle)
@@ -0,0 +1,41 @@
+"""JSON encoding for high-volume responses.
+
+Uses orjson when it is installed and falls back to the standard library,
+producing the same output for the types our routes return (naive datetimes
+are ISO 8601 without an offset, as pydantic emits them).
+"""
+
+import json
+from datetime import date, datetime
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    """Response for plain dicts/lists that are already in response_model shape.
+
+    Returning it from a route skips FastAPI's response_model validation while
+    the declared response_model still documents the route in OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
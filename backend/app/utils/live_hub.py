@@ -0,0 +1,125 @@
+"""In-process pub/sub hub for live viewer counts and score changes.
+
+The ingest writer and the analysis engine publish after they commit, so
+live subscribers never cause database reads. Topics are
+``channel:<platform>/<username>``, ``leaderboard`` and ``anomalies``.
+
+Each subscriber has a bounded, coalescing buffer: a newer message with the
+same key (topic, type and channel) replaces the pending one, and when the
+buffer is full the oldest pending message is dropped. A slow client
+therefore only ever sees the latest state instead of growing a backlog.
+
+Publishing is thread-safe; messages are handed to the event loop the hub
+was bound to at startup. Before that, ``publish`` is a no-op.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+
+from app.config import settings
+from app.utils.metrics import LIVE_SUBSCRIBERS, registry
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD = "leaderboard"
+ANOMALIES = "anomalies"
+
+
+def channel_topic(platform: str, username: str) -> str:
+    return f"channel:{platform.lower()}/{username.lower()}"
+
+
+class Subscription:
+
+    def __init__(self, topics: set[str], maxsize: int):
+        self.topics = topics
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._pending: OrderedDict[tuple, dict] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def offer(self, key: tuple, message: dict):
+        if key in self._pending:
+            del self._pending[key]
+        elif len(self._pending) >= self.maxsize:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = message
+        self._ready.set()
+
+    async def get(self) -> dict:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pending.popitem(last=False)[1]
+
+
+class LiveHub:
+
+    def __init__(self, queue_size: int = 256, max_topics: int = 100):
+        self.queue_size = queue_size
+        self.max_topics = max_topics
+        self.published = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topics: dict[str, set[Subscription]] = {}
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    @property
+    def subscribers(self) -> int:
+        return len({s for subs in self._topics.values() for s in subs})
+
+    def check_topics(self, topics: set[str]):
+        """Raise ValueError if ``subscribe`` would refuse ``topics``."""
+        if not topics:
+            raise ValueError("At least one topic is required")
+        if len(topics) > self.max_topics:
+            raise ValueError(f"At most {self.max_topics} topics per subscription")
+
+    def subscribe(self, topics: set[str]) -> Subscription:
+        self.check_topics(topics)
+        sub = Subscription(topics, self.queue_size)
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        for topic in sub.topics:
+            subs = self._topics.get(topic)
+            if subs is None:
+                continue
+            subs.discard(sub)
+            if not subs:
+                del self._topics[topic]
+
+    def publish(self, topic: str, kind: str, data: dict, key=None):
+        """Fan ``data`` out to ``topic``'s subscribers from any thread.
+
+        ``key`` distinguishes messages that must not coalesce with each
+        other within one topic and type (e.g. the channel on the
+        leaderboard topic).
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        message = {"topic": topic, "type": kind, "data": data}
+        coalesce_key = (topic, kind, key)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(topic, coalesce_key, message)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, topic, coalesce_key, message)
+
+    def _dispatch(self, topic: str, key: tuple, message: dict):
+        self.published += 1
+        for sub in self._topics.get(topic, ()):
+            sub.offer(key, message)
+
+
+live_hub = LiveHub(settings.LIVE_QUEUE_SIZE)
+registry.register_callback(lambda: LIVE_SUBSCRIBERS.set(live_hub.subscribers))
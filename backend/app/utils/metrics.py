@@ -0,0 +1,268 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values and
+updated under one lock, so recording a sample costs a dict lookup and an
+add. Values owned by other components (queue depths, live subscribers)
+are read only when ``/api/v1/metrics`` is scraped, through collector
+callbacks registered with ``registry.register_callback``.
+
+What is measured, and where:
+
+- collector HTTP requests by platform and outcome, with latency
+  (``app.collectors.base.collector_client``)
+- rate limiter waits (``app.utils.rate_limiter``) and YouTube quota use
+- scheduled job durations and per-channel collection/analysis outcomes
+  (``app.scheduler.jobs``)
+- database statement timings by operation (``instrument_engine``)
+- API route latencies by route template (``MetricsMiddleware``)
+- live feed connections and subscribers
+- collection, analysis, ingest and track backlogs; ingest and tweet outcomes
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds; covers sub-millisecond queries up to slow platform calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "Registry", name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = registry.lock
+        self._values: dict[tuple, object] = {}
+        registry.add(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[n] for n in self.label_names)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in items]
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = 'le="' + _number(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class _Timer:
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: list[_Metric] = []
+        self._callbacks: list[Callable[[], None]] = []
+
+    def add(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return Counter(self, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return Gauge(self, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return Histogram(self, name, help, labels, buckets)
+
+    def register_callback(self, callback: Callable[[], None]):
+        """Run ``callback`` before each render, to set gauges read on demand."""
+        self._callbacks.append(callback)
+
+    def render(self) -> str:
+        for callback in self._callbacks:
+            callback()
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "streamoracle_collector_requests_total", "Platform API requests by outcome", ("platform", "outcome"))
+HTTP_LATENCY = registry.histogram(
+    "streamoracle_collector_request_seconds", "Platform API request latency", ("platform",))
+RATE_LIMIT_WAIT = registry.histogram(
+    "streamoracle_rate_limiter_wait_seconds", "Time spent waiting for a rate limiter token", ("limiter",))
+YOUTUBE_QUOTA = registry.gauge(
+    "streamoracle_youtube_quota_used", "YouTube Data API quota units used in the current day")
+JOB_DURATION = registry.histogram(
+    "streamoracle_job_duration_seconds", "Scheduled job run duration", ("job",), JOB_BUCKETS)
+JOB_CHANNELS = registry.counter(
+    "streamoracle_job_channels_total", "Channels processed by scheduled jobs", ("job", "platform", "outcome"))
+BACKLOG = registry.gauge(
+    "streamoracle_backlog", "Items waiting in background queues", ("queue",))
+DB_QUERY = registry.histogram(
+    "streamoracle_db_query_seconds", "Database statement execution time", ("operation",))
+API_LATENCY = registry.histogram(
+    "streamoracle_api_request_seconds", "API request latency by route", ("method", "route", "status"))
+LIVE_CONNECTIONS = registry.gauge(
+    "streamoracle_live_connections", "Open live feed connections", ("transport",))
+LIVE_SUBSCRIBERS = registry.gauge(
+    "streamoracle_live_subscribers", "Live feed subscriptions across all topics")
+INGEST_RECORDS = registry.counter(
+    "streamoracle_ingest_records_total", "Collection records written or dropped by the ingest writer", ("outcome",))
+TWEETS = registry.counter(
+    "streamoracle_tweets_total", "Outbox tweet delivery attempts by outcome", ("outcome",))
+
+
+def instrument_engine(engine):
+    """Time every statement executed on ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_start"].pop()
+        operation = statement.lstrip()[:6].upper()
+        if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            operation = "OTHER"
+        DB_QUERY.observe(time.perf_counter() - started, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        # after_cursor_execute does not run for a failed statement
+        conn = context.connection
+        if conn is not None and conn.info.get("metrics_start"):
+            conn.info["metrics_start"].pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording API latency by route template.
+
+    Streaming responses are timed until their last body chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            API_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=f"{status[0] // 100}xx",
+            )
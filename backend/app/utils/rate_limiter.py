@@ -1,11 +1,14 @@
 import asyncio
 import time
 
+from app.utils.metrics import RATE_LIMIT_WAIT
+
 
 class RateLimiter:
     """Token-bucket rate limiter for API calls."""
 
-    def __init__(self, rate: float, capacity: int):
+    def __init__(self, name: str, rate: float, capacity: int):
+        self.name = name  # label for wait-time metrics
         self.rate = rate  # tokens per second
         self.capacity = capacity
         self.tokens = capacity
@@ -13,6 +16,7 @@ class RateLimiter:
         self._lock = asyncio.Lock()
 
     async def acquire(self):
+        start = time.monotonic()
         async with self._lock:
             now = time.monotonic()
             elapsed = now - self.last_refill
@@ -26,3 +30,4 @@ class RateLimiter:
                 self.last_refill = time.monotonic()
             else:
                 self.tokens -= 1
+        RATE_LIMIT_WAIT.observe(time.monotonic() - start, limiter=self.name)
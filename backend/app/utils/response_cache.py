@@ -0,0 +1,223 @@
+"""Cache of serialized API responses with tag-based invalidation.
+
+Entries are keyed by path and query string and record the version of
+every tag they were built under (e.g. ``leaderboard`` or
+``channel:twitch/foo``). Writers bump a tag's version after committing,
+which makes every entry built under an older version stale; versions are
+read before the response is built, so a write that races a rebuild is
+never cached as current. Responses carry ETag and Last-Modified headers
+and conditional requests are answered with 304.
+
+The default backend is in-process. Set ``RESPONSE_CACHE_URL`` to a
+``redis://`` URL to share entries and tag versions between workers
+(requires the ``redis`` package).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.utils import fastjson
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: float
+    versions: dict[str, int]
+    expires_at: float
+
+
+class MemoryBackend:
+    """Bounded in-process LRU."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def versions(self, tags: list[str]) -> dict[str, int]:
+        return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    def bump(self, tags: list[str]):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class RedisBackend:
+    """Entries and tag versions shared through Redis."""
+
+    PREFIX = "streamoracle:cache:"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_URL needs the 'redis' package installed") from e
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> CachedResponse | None:
+        raw = self._redis.get(self.PREFIX + "entry:" + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        data["body"] = data["body"].encode()
+        return CachedResponse(**data)
+
+    def set(self, key: str, entry: CachedResponse):
+        data = asdict(entry)
+        data["body"] = entry.body.decode()
+        ttl = max(1, int(entry.expires_at - time.time()))
+        self._redis.set(self.PREFIX + "entry:" + key, json.dumps(data), ex=ttl)
+
+    def versions(self, tags: list[str]) -> dict[str, int]:
+        if not tags:
+            return {}
+        values = self._redis.mget([self.PREFIX + "tag:" + t for t in tags])
+        return {tag: int(v or 0) for tag, v in zip(tags, values)}
+
+    def bump(self, tags: list[str]):
+        pipe = self._redis.pipeline()
+        for tag in tags:
+            pipe.incr(self.PREFIX + "tag:" + tag)
+        pipe.execute()
+
+
+def channel_tag(platform: str, username: str) -> str:
+    return f"channel:{platform.lower()}/{username.lower()}"
+
+
+class ResponseCache:
+
+    def __init__(self, backend, ttl_seconds: int = 300):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._adapters: dict[Any, TypeAdapter] = {}
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        return f"{request.url.path}?{query}"
+
+    def _serialize(self, value, model) -> bytes:
+        if model is None:
+            return fastjson.dumps(value)
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter.dump_json(value)
+
+    def invalidate(self, *tags: str):
+        """Mark every response built under ``tags`` stale. Call after commit."""
+        if not tags:
+            return
+        try:
+            self.backend.bump(list(tags))
+        except Exception as e:
+            logger.error("Response cache invalidation failed for %s: %s", tags, e)
+
+    def respond(self, request: Request, tags: list[str], build: Callable[[], Any], model=None) -> Response:
+        """Serve ``request`` from the cache, building and storing it on a miss.
+
+        ``build`` returns the value the route would have returned. Without
+        ``model`` it must be plain JSON data (dicts, lists, datetimes) already
+        in the route's response shape, and is encoded directly; otherwise it
+        is serialized through ``model``. Exceptions raised by ``build``
+        (e.g. a 404) are not cached.
+        """
+        key = self.key(request)
+        now = time.time()
+        try:
+            versions = self.backend.versions(tags)
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.error("Response cache read failed: %s", e)
+            versions, entry = None, None
+
+        if entry is not None and entry.versions == versions and entry.expires_at > now:
+            self.hits += 1
+        else:
+            self.misses += 1
+            body = self._serialize(build(), model)
+            entry = CachedResponse(
+                body=body,
+                etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+                last_modified=float(int(now)),
+                versions=versions or {},
+                expires_at=now + self.ttl_seconds,
+            )
+            if versions is not None:
+                try:
+                    self.backend.set(key, entry)
+                except Exception as e:
+                    logger.error("Response cache write failed: %s", e)
+
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if self._not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _not_modified(request: Request, entry: CachedResponse) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return entry.etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return entry.last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _make_backend():
+    if settings.RESPONSE_CACHE_URL:
+        return RedisBackend(settings.RESPONSE_CACHE_URL)
+    return MemoryBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+response_cache = ResponseCache(_make_backend(), settings.RESPONSE_CACHE_TTL_SECONDS)
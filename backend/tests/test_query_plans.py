@@ -0,0 +1,184 @@
+"""Query-plan regression test.
+
+Seeds a scratch SQLite database with ``app.bench.synthetic``, drives every
+GET endpoint under ``/api``, the scheduler jobs and the tweet strategies
+against it, and runs ``EXPLAIN QUERY PLAN`` on each distinct statement
+they issue. A plain table scan of a table with at least ``MIN_ROWS`` rows
+fails, so a query that loses its index fails the run, and so does any
+driven call that raises or answers with a server error.
+"""
+
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, text
+
+from app.bench.synthetic import prepare
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models.tweet_log import TweetLog
+from app.scheduler import jobs, tracking
+from app.storage.export import DATASETS, stream_export
+from app.storage.writer import Collection, write_collections
+from app.twitter import poster
+
+CHANNELS = 60
+SNAPSHOTS = 300
+# Tables this large must not be scanned
+MIN_ROWS = 5000
+
+# Query strings exercised per route path; routes not listed get one bare call
+ROUTE_QUERIES = {
+    "/api/v1/search": ["q=user1", "q=user1&platform=twitch", "q=us"],
+    "/api/v1/channels/{platform}/{username}/snapshots": ["hours=24", "hours=720", "resolution=1h"],
+    "/api/v1/leaderboard": ["", "platform=twitch", "category=chat"],
+    "/api/v1/export/{dataset}": ["platform=twitch", "channels=twitch/user3,kick/user2&start=2020-01-01T00:00"],
+}
+
+_SCAN = re.compile(r"^SCAN (\w+)(.*)$")
+_PLANNED = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+class PlanRecorder:
+    """Collects distinct statements issued on an engine, tagged by caller."""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.source = None
+        self.statements: dict[str, tuple[str, object]] = {}
+        self.errors: list[str] = []
+        event.listen(bind, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_PLANNED) or statement in self.statements:
+            return
+        if executemany:
+            parameters = parameters[0]
+        self.statements[statement] = (self.source, parameters)
+
+    def run(self, source: str, fn, *args):
+        self.source = source
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self.errors.append(f"{source} raised {type(e).__name__}: {e}")
+            return
+        status = getattr(result, "status_code", None)
+        if status is not None and status >= 500:
+            self.errors.append(f"{source} answered {status}")
+
+    def explain(self) -> list[tuple[str, str, list[str]]]:
+        event.remove(self.bind, "before_cursor_execute", self._record)
+        raw = self.bind.raw_connection()
+        try:
+            cursor = raw.cursor()
+            plans = []
+            for statement, (source, parameters) in self.statements.items():
+                cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+                plans.append((source, statement, [row[3] for row in cursor.fetchall()]))
+            return plans
+        finally:
+            raw.close()
+
+
+def _table_sizes(bind) -> dict[str, int]:
+    with bind.connect() as conn:
+        names = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+        return {name: conn.execute(text(f'SELECT count(*) FROM "{name}"')).scalar() for name in names}
+
+
+def _seed_tweets(bind, channels: int):
+    """Tweet history, which the synthetic seeder does not write."""
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    with bind.begin() as conn:
+        conn.execute(insert(TweetLog), [
+            {
+                "channel_id": rng.randint(1, channels),
+                "tweet_type": rng.choice(("high_score", "score_change", "anomaly")),
+                "tweet_text": "seed",
+                "tweeted_at": now - timedelta(minutes=rng.randint(0, 5 * SNAPSHOTS)),
+            }
+            for _ in range(channels * 2)
+        ])
+
+
+def _drive_api(recorder: PlanRecorder, client: TestClient):
+    params = {"platform": "twitch", "username": "user3", "dataset": "snapshots"}
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if not path.startswith("/api") or "GET" not in getattr(route, "methods", ()):
+            continue
+        url = path.format(**params)
+        for query in ROUTE_QUERIES.get(path, [""]):
+            target = f"{url}?{query}" if query else url
+            recorder.run(f"GET {target}", client.get, target)
+
+
+def _drive_jobs(recorder: PlanRecorder, archive_dir: str):
+    recorder.run("jobs._load_channels", jobs._load_channels)
+    recorder.run("tracking.ensure_channels", tracking.ensure_channels, [("twitch", "user3"), ("kick", "newuser")])
+    recorder.run("tracking._channel_ids", tracking._channel_ids, "twitch", ["user3", "user6"])
+    recorder.run("writer.write_collections", write_collections, [Collection(
+        3,
+        {"is_live": True, "viewer_count": 100, "chatter_count": 10},
+        {
+            "window_start": datetime.utcnow() - timedelta(seconds=30),
+            "window_end": datetime.utcnow(),
+            "message_count": 5,
+            "unique_chatters": 3,
+            "message_entropy": 1.0,
+            "unique_message_ratio": 0.5,
+            "avg_time_between_msgs": 2.0,
+        },
+    )])
+    recorder.run("jobs._run_analysis", jobs._run_analysis)
+    for name in DATASETS:
+        recorder.run(f"export.stream_export {name}", lambda n: list(stream_export(n, "csv", datetime.utcnow() - timedelta(days=1))), name)
+    recorder.run("poster._run_tweet_cycle", poster._run_tweet_cycle)
+
+    # Retention deletes seeded rows, so it runs last
+    saved = settings.ARCHIVE_AFTER_DAYS, settings.SNAPSHOT_RETENTION_DAYS, settings.ARCHIVE_DIR
+    settings.ARCHIVE_AFTER_DAYS, settings.SNAPSHOT_RETENTION_DAYS, settings.ARCHIVE_DIR = 1, 1, archive_dir
+    try:
+        recorder.run("jobs._prune_snapshots", jobs._prune_snapshots)
+    finally:
+        settings.ARCHIVE_AFTER_DAYS, settings.SNAPSHOT_RETENTION_DAYS, settings.ARCHIVE_DIR = saved
+
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("plans")
+    prepare(str(workdir / "plans.db"), CHANNELS, SNAPSHOTS)
+    bind = SessionLocal.kw["bind"]
+    _seed_tweets(bind, CHANNELS)
+    large = {name for name, rows in _table_sizes(bind).items() if rows >= MIN_ROWS}
+
+    recorder = PlanRecorder(bind)
+    _drive_api(recorder, TestClient(app))
+    _drive_jobs(recorder, str(workdir / "archive"))
+    yield recorder, recorder.explain(), large
+    bind.dispose()
+
+
+def test_driven_calls_succeed(recorded):
+    recorder, _, _ = recorded
+    assert not recorder.errors, "\n".join(recorder.errors)
+
+
+def test_no_full_scans_of_large_tables(recorded):
+    _, plans, large = recorded
+    assert {"viewer_snapshots", "chat_metrics"} <= large
+    failures = []
+    for source, statement, details in plans:
+        scans = [
+            d for d in details
+            if (m := _SCAN.match(d)) and m.group(1) in large and not m.group(2).strip()
+        ]
+        if scans:
+            failures.append(f"{source}\n    {' '.join(statement.split())[:300]}\n    " + "\n    ".join(details))
+    assert not failures, f"{len(failures)} of {len(plans)} statements scan large tables:\n" + "\n".join(failures)
@@ -2,9 +2,16 @@ import type {
   HealthCheck,
   SearchResult,
   ChannelDetail,
+  ChannelRef,
+  BulkChannelsResult,
+  BulkTrackResult,
   Snapshot,
   AnalysisResult,
+  ScoreTimelinePoint,
   LeaderboardEntry,
+  Anomaly,
+  AnomalyKind,
+  AnomalySeverity,
   MethodologyResponse,
 } from './types';
 
@@ -67,6 +74,15 @@ export async function getSnapshots(
   );
 }
 
+export async function getChannelsBulk(
+  channels: ChannelRef[]
+): Promise<BulkChannelsResult> {
+  return request<BulkChannelsResult>('/api/v1/channels/bulk', {
+    method: 'POST',
+    body: JSON.stringify({ channels }),
+  });
+}
+
 export async function trackChannel(
   platform: string,
   username: string
@@ -76,6 +92,15 @@ export async function trackChannel(
   });
 }
 
+export async function trackChannels(
+  channels: ChannelRef[]
+): Promise<BulkTrackResult> {
+  return request<BulkTrackResult>('/api/v1/channels/track', {
+    method: 'POST',
+    body: JSON.stringify({ channels }),
+  });
+}
+
 export async function getAnalysis(
   platform: string,
   username: string
@@ -85,6 +110,21 @@ export async function getAnalysis(
   );
 }
 
+export async function getScoreTimeline(
+  platform: string,
+  username: string,
+  days?: number,
+  points?: number
+): Promise<ScoreTimelinePoint[]> {
+  const params = new URLSearchParams();
+  if (days) params.set('days', days.toString());
+  if (points) params.set('points', points.toString());
+  const qs = params.toString();
+  return request<ScoreTimelinePoint[]>(
+    `/api/v1/analysis/${platform}/${username}/timeline${qs ? `?${qs}` : ''}`
+  );
+}
+
 export async function getLeaderboard(
   platform?: string,
   category?: string,
@@ -100,6 +140,32 @@ export async function getLeaderboard(
   );
 }
 
+export async function getAnomalies(options: {
+  hours?: number;
+  platform?: string;
+  kind?: AnomalyKind;
+  severity?: AnomalySeverity;
+  limit?: number;
+} = {}): Promise<Anomaly[]> {
+  const params = new URLSearchParams();
+  if (options.hours) params.set('hours', options.hours.toString());
+  if (options.platform) params.set('platform', options.platform);
+  if (options.kind) params.set('kind', options.kind);
+  if (options.severity) params.set('severity', options.severity);
+  if (options.limit) params.set('limit', options.limit.toString());
+  const qs = params.toString();
+  return request<Anomaly[]>(`/api/v1/anomalies${qs ? `?${qs}` : ''}`);
+}
+
+export async function getChannelAnomalies(
+  platform: string,
+  username: string,
+  hours?: number
+): Promise<Anomaly[]> {
+  const qs = hours ? `?hours=${hours}` : '';
+  return request<Anomaly[]>(`/api/v1/anomalies/${platform}/${username}${qs}`);
+}
+
 export async function getMethodology(): Promise<MethodologyResponse> {
   return request<MethodologyResponse>('/api/v1/methodology');
 }
@@ -36,8 +36,62 @@ export interface AnalysisResult {
   analyzed_at: string;
 }
 
+export interface ScoreTimelinePoint {
+  analyzed_at: string;
+  valid_until: string;
+  overall_score: number;
+  confidence: number;
+}
+
+export type AnomalyKind = 'spike' | 'zscore' | 'flatline';
+export type AnomalySeverity = 'low' | 'medium' | 'high';
+
+export interface Anomaly {
+  id: number;
+  channel_id: number;
+  platform: string;
+  username: string;
+  display_name: string;
+  kind: AnomalyKind;
+  severity: AnomalySeverity;
+  viewer_count: number;
+  baseline: number;
+  magnitude: number;
+  detected_at: string;
+}
+
+export interface ChannelStats {
+  snapshot_count: number;
+  avg_viewers: number;
+  peak_viewers: number;
+  last_viewers: number | null;
+  previous_viewers: number | null;
+  last_collected_at: string | null;
+  last_live_at: string | null;
+  last_score: number | null;
+  previous_score: number | null;
+}
+
 export interface ChannelDetail extends Channel {
   latest_analysis?: AnalysisResult;
+  stats?: ChannelStats;
+}
+
+export interface ChannelRef {
+  platform: string;
+  username: string;
+}
+
+export interface BulkChannelsResult {
+  results: ChannelDetail[];
+  missing: ChannelRef[];
+}
+
+export interface BulkTrackResult {
+  results: Channel[];
+  queued: number;
+  pending: number;
+  rejected: ChannelRef[];
 }
 
 export interface LeaderboardEntry {